@@ -1,11 +1,21 @@
 from django.contrib import admin
 
+from api.models.inventory_summary import InventorySummary
 from api.models.product import Product
 from api.models.stock import Stock
+from api.models.stock_checkpoint import StockCheckpoint
+from api.models.stock_consumption import StockConsumption
+from api.models.stock_forecast import StockForecast
 from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_rollup import StockTimelineRollup
 from api.models.vending_machine import VendingMachine
 
 admin.site.register(VendingMachine)
 admin.site.register(Product)
 admin.site.register(Stock)
 admin.site.register(StockTimeline)
+admin.site.register(InventorySummary)
+admin.site.register(StockCheckpoint)
+admin.site.register(StockTimelineRollup)
+admin.site.register(StockConsumption)
+admin.site.register(StockForecast)
@@ -6,3 +6,7 @@ class ApiConfig(AppConfig):
 
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "api"
+
+    def ready(self) -> None:
+        """Connect the signal receivers."""
+        from api import signals  # noqa: F401
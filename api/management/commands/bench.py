@@ -0,0 +1,144 @@
+import json
+import platform
+import subprocess
+from typing import Any, Optional
+
+import django
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from api.models.vending_machine import VendingMachine
+from api.services.benchmark_service import compare, get_endpoints, run_benchmark
+from api.services.seed_service import seed
+
+
+class Command(BaseCommand):
+    """Benchmark the API endpoints."""
+
+    help: str = (
+        "Seed a fleet into a test database and measure the latency percentiles and queries per request of every "
+        "endpoint. Results are written as JSON, to be compared between commits with --compare."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument("--vending-machines", type=int, default=100, dest="vending_machines")
+        parser.add_argument("--products", type=int, default=50)
+        parser.add_argument("--stocks-per-vending-machine", type=int, default=10, dest="stocks_per_vending_machine")
+        parser.add_argument("--stock-timelines", type=int, default=10000, dest="stock_timelines")
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--endpoint", action="append", dest="endpoints", help="Only benchmark the given names.")
+        parser.add_argument("--output", help="File the JSON results are written to, instead of stdout.")
+        parser.add_argument("--compare", help="JSON results of a previous run to compare with.")
+        parser.add_argument("--no-cache", action="store_true", dest="no_cache", help="Disable the API cache.")
+        parser.add_argument(
+            "--keepdb", action="store_true", help="Keep the test database, and its seeded fleet, for the next run."
+        )
+        parser.add_argument(
+            "--no-test-db",
+            action="store_true",
+            dest="no_test_db",
+            help="Run against the configured database, seeding it only when it has no vending machine.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Seed the fleet, benchmark the endpoints and write the results."""
+        old_name: Optional[str] = None
+        if not options["no_test_db"]:
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+        try:
+            with override_settings(API_CACHE_ENABLED=not options["no_cache"]):
+                report: dict[str, Any] = self.benchmark(options)
+        finally:
+            if old_name is not None and not options["keepdb"]:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        output: str = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                self.write_comparison(json.load(file), report)
+
+    def benchmark(self, options: dict[str, Any]) -> dict[str, Any]:
+        """
+        Seed the fleet if the database has none, then benchmark the endpoints.
+
+        Params:
+            options (dict[str, Any]): Options of the command
+        Returns:
+            dict[str, Any]: Environment, fleet and results of the run.
+        """
+        fleet: dict[str, int] = {}
+        if not VendingMachine.objects.exists():
+            fleet = seed(
+                options["vending_machines"],
+                options["products"],
+                options["stocks_per_vending_machine"],
+                options["stock_timelines"],
+            )
+            self.stderr.write(f"Seeded {fleet}.")
+        endpoints: list[dict[str, Any]] = [
+            endpoint
+            for endpoint in get_endpoints()
+            if not options["endpoints"] or endpoint["name"] in options["endpoints"]
+        ]
+        if not endpoints:
+            raise CommandError(f"No endpoint is named {', '.join(options['endpoints'])}.")
+        try:
+            results: list[dict[str, Any]] = run_benchmark(endpoints, options["requests"], options["warmup"])
+        except ValueError as error:
+            raise CommandError(error)
+        return {
+            "created_at": timezone.now().isoformat(),
+            "commit": self.get_commit(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "cache": not options["no_cache"],
+            "fleet": fleet,
+            "results": results,
+        }
+
+    def get_commit(self) -> Optional[str]:
+        """
+        Return the current git commit, if any.
+
+        Returns:
+            Optional[str]: Hash of the checked out commit.
+        """
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def write_comparison(self, baseline: dict[str, Any], report: dict[str, Any]) -> None:
+        """
+        Write the p50 and p95 latencies and the queries of both runs per endpoint.
+
+        Params:
+            baseline (dict[str, Any]): Results of the previous run
+            report (dict[str, Any]): Results of this run
+        """
+        self.stderr.write(f"{'endpoint':<36}{'p50 ms':>20}{'p95 ms':>20}{'queries':>14}{'p50 ratio':>11}")
+        for row in compare(baseline, report):
+            self.stderr.write(
+                f"{row['name']:<36}"
+                f"{row['p50_ms'][0]:>9.2f} -> {row['p50_ms'][1]:>7.2f}"
+                f"{row['p95_ms'][0]:>9.2f} -> {row['p95_ms'][1]:>7.2f}"
+                f"{row['queries'][0]:>6.1f} -> {row['queries'][1]:>4.1f}"
+                f"{row['ratio']:>10.2f}x"
+            )
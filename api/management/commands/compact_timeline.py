@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from api.models.stock_timeline_rollup import StockTimelineRollup
+from api.services.stock_timeline_compaction_service import compact_stock_timelines
+
+
+class Command(BaseCommand):
+    """Compact stock timelines."""
+
+    help: str = (
+        "Archive and delete the stock timelines which repeat the previous quantity, and downsample the old ones to "
+        "the last one per bucket."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=1,
+            dest="keep_days",
+            help="Number of days of stock timelines left untouched, 1 by default.",
+        )
+        parser.add_argument(
+            "--downsample-days",
+            type=int,
+            dest="downsample_days",
+            help="Age in days after which stock timelines are downsampled, none by default.",
+        )
+        parser.add_argument("--interval", choices=StockTimelineRollup.INTERVALS, default=StockTimelineRollup.DAY)
+        parser.add_argument(
+            "--archive-dir",
+            default=settings.STOCK_TIMELINE_ARCHIVE_DIR,
+            dest="archive_dir",
+            help="Directory of the gzip NDJSON archives, STOCK_TIMELINE_ARCHIVE_DIR by default.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Compact the stock timelines and report what was reclaimed."""
+        if options["keep_days"] < 0:
+            raise CommandError("--keep-days must be at least 0.")
+        if options["downsample_days"] is not None and options["downsample_days"] < options["keep_days"]:
+            raise CommandError("--downsample-days must be at least --keep-days.")
+        now: datetime = timezone.now()
+        downsample_before: Optional[datetime] = (
+            now - timedelta(days=options["downsample_days"]) if options["downsample_days"] is not None else None
+        )
+        result: dict[str, Any] = compact_stock_timelines(
+            now - timedelta(days=options["keep_days"]), options["archive_dir"], downsample_before, options["interval"]
+        )
+        size: str = f", about {result['bytes']} bytes" if result["bytes"] is not None else ""
+        self.stdout.write(
+            f"Deleted {result['noop'] + result['downsampled']} stock timelines{size}: {result['noop']} no-op and "
+            f"{result['downsampled']} downsampled."
+        )
+        if result["archive"] is not None:
+            self.stdout.write(f"Archived them to {result['archive']} ({result['archive_bytes']} bytes).")
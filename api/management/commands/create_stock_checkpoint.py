@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from api.services.stock_history_service import create_stock_checkpoint
+
+
+class Command(BaseCommand):
+    """Create a stock checkpoint."""
+
+    help: str = (
+        "Save the quantity of every product in every vending machine, as of STOCK_TIMELINE_COMMIT_GRACE seconds ago "
+        "so that late stock timelines are not missed, to speed up as_of queries."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument("--keep", type=int, help="Number of latest checkpoints to be kept, all by default.")
+
+    def handle(self, *args, **options) -> None:
+        """Create the stock checkpoint and delete the old ones."""
+        if options["keep"] is not None and options["keep"] < 1:
+            raise CommandError("--keep must be at least 1.")
+        count: int = create_stock_checkpoint(keep=options["keep"])
+        self.stdout.write(f"Saved {count} stock checkpoints.")
@@ -0,0 +1,51 @@
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework.exceptions import ValidationError
+
+from api.models.stock_timeline import StockTimeline
+from api.services.stock_timeline_service import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    NDJSON,
+    export_stock_timelines,
+    filter_stock_timelines,
+)
+
+
+class Command(BaseCommand):
+    """Export stock timelines as NDJSON or CSV."""
+
+    help: str = "Stream stock timelines as NDJSON or CSV to a file or stdout, with constant memory use."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default=NDJSON, dest="export_format")
+        parser.add_argument("--output", help="Path of the output file, stdout by default.")
+        parser.add_argument("--vending-machine", type=int, dest="vending_machine")
+        parser.add_argument("--product", type=int)
+        parser.add_argument("--since", help="Only stock timelines at or after this ISO 8601 timestamp.")
+        parser.add_argument("--until", help="Only stock timelines before this ISO 8601 timestamp.")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, dest="chunk_size")
+
+    def handle(self, *args, **options) -> None:
+        """Stream the filtered stock timelines to the output."""
+        filters: dict[str, Any] = {
+            key: options[key] for key in ("vending_machine", "product", "since", "until") if options[key] is not None
+        }
+        try:
+            queryset: Any = filter_stock_timelines(StockTimeline.objects.all(), filters)
+        except ValidationError as error:
+            raise CommandError(error.detail)
+        chunks: Iterator[str] = export_stock_timelines(queryset, options["export_format"], options["chunk_size"])
+        if options["output"] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="") as output:
+            output.writelines(chunks)
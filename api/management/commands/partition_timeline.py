@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from api.services.stock_timeline_partition_service import create_partitions, detach_partitions
+
+
+class Command(BaseCommand):
+    """Maintain the monthly partitions of stock timelines."""
+
+    help: str = (
+        "Create the monthly partitions of stock timelines ahead of time, and detach the partitions of old months "
+        "before the latest stock checkpoint."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            dest="months_ahead",
+            help="Number of months after the current one to be created, 3 by default.",
+        )
+        parser.add_argument(
+            "--keep-months",
+            type=int,
+            dest="keep_months",
+            help="Number of months before the current one to be kept, the older ones are detached. None by default.",
+        )
+        parser.add_argument(
+            "--drop", action="store_true", help="Drop the detached partitions instead of keeping them as tables."
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Create the future partitions and detach the old ones."""
+        for option in ("months_ahead", "keep_months"):
+            if options[option] is not None and options[option] < 0:
+                raise CommandError(f"--{option.replace('_', '-')} must be at least 0.")
+        created: list[str] = create_partitions(options["months_ahead"])
+        self.stdout.write(f"Created {len(created)} stock timeline partitions.")
+        if options["keep_months"] is not None:
+            detached: list[str] = detach_partitions(options["keep_months"], drop=options["drop"])
+            self.stdout.write(
+                f"{'Dropped' if options['drop'] else 'Detached'} {len(detached)} stock timeline partitions."
+            )
+            for name in detached:
+                self.stdout.write(name)
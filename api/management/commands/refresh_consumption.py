@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.services.stock_consumption_service import refresh_stock_consumptions
+
+
+class Command(BaseCommand):
+    """Refresh stock consumptions."""
+
+    help: str = (
+        "Aggregate the units sold and restocked per day of the new stock timelines for /stock-timeline/consumption/."
+    )
+
+    def handle(self, *args, **options) -> None:
+        """Refresh the stock consumptions of the days with new stock timelines."""
+        count: int = refresh_stock_consumptions()
+        self.stdout.write(f"Refreshed {count} daily stock consumptions.")
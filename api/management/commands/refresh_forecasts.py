@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from api.services.stock_forecast_service import FORECAST_SMOOTHING, FORECAST_WINDOW_DAYS, refresh_stock_forecasts
+
+
+class Command(BaseCommand):
+    """Refresh stock forecasts."""
+
+    help: str = "Forecast the consumption rate of every stock from the daily stock consumptions for /stock/forecast/."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument(
+            "--window-days",
+            type=int,
+            default=FORECAST_WINDOW_DAYS,
+            dest="window_days",
+            help=f"Number of full days the rates are fitted on, {FORECAST_WINDOW_DAYS} by default.",
+        )
+        parser.add_argument(
+            "--smoothing",
+            type=float,
+            default=FORECAST_SMOOTHING,
+            help=f"Smoothing factor, the weight of the latest day, {FORECAST_SMOOTHING} by default.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Refresh the forecast of every stock."""
+        if options["window_days"] < 1:
+            raise CommandError("--window-days must be at least 1.")
+        if not 0 < options["smoothing"] <= 1:
+            raise CommandError("--smoothing must be greater than 0 and at most 1.")
+        count: int = refresh_stock_forecasts(options["window_days"], options["smoothing"])
+        self.stdout.write(f"Refreshed {count} stock forecasts.")
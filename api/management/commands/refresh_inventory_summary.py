@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from api.models.inventory_summary import InventorySummary
+from api.models.vending_machine import VendingMachine
+
+
+class Command(BaseCommand):
+    """Refresh the inventory summaries of all vending machines."""
+
+    help: str = (
+        "Recompute the inventory summary of every vending machine, e.g. after enabling INVENTORY_SUMMARY_ENABLED."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument("--batch-size", type=int, default=1000, dest="batch_size")
+
+    def handle(self, *args, **options) -> None:
+        """Refresh the inventory summaries in batches of vending machines."""
+        vending_machine_ids: list[int] = list(VendingMachine.objects.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(vending_machine_ids), options["batch_size"]):
+            InventorySummary.refresh(vending_machine_ids[start : start + options["batch_size"]])
+        self.stdout.write(f"Refreshed {len(vending_machine_ids)} inventory summaries.")
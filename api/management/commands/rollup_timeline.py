@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from api.models.stock_timeline_rollup import StockTimelineRollup
+from api.services.stock_timeline_series_service import rollup_stock_timelines
+
+
+class Command(BaseCommand):
+    """Roll up stock timelines."""
+
+    help: str = "Aggregate the new stock timelines into hourly and daily buckets for /stock-timeline/series/."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the arguments of the command.
+
+        Params:
+            parser (CommandParser): Parser of the command
+        """
+        parser.add_argument("--interval", choices=StockTimelineRollup.INTERVALS, action="append", dest="intervals")
+
+    def handle(self, *args, **options) -> None:
+        """Roll up the stock timelines of every interval."""
+        for interval in options["intervals"] or StockTimelineRollup.INTERVALS:
+            count: int = rollup_stock_timelines(interval)
+            self.stdout.write(f"Rolled up {count} {interval} buckets.")
@@ -0,0 +1,219 @@
+import random
+import time
+from contextlib import ExitStack
+from typing import Any, Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from api.services.metrics_service import request_metrics
+
+
+class RequestTimings:
+    """Queries and timings of one request, counted by wrapping the execution of every SQL query."""
+
+    def __init__(self) -> None:
+        """Start the timings of the request."""
+        self.start: float = time.perf_counter()
+        self.view_start: Optional[float] = None
+        self.view_end: Optional[float] = None
+        self.queries: int = 0
+        self.db_duration: float = 0
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+        """
+        Execute the given query and count it.
+
+        Params:
+            execute (Callable): Next wrapper or the database cursor
+            sql (str): SQL of the query
+            params (Any): Parameters of the query
+            many (bool): Whether the query is an executemany
+            context (dict[str, Any]): Connection and cursor of the query
+        Returns:
+            Any: Result of the query.
+        """
+        start: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_duration += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Record the queries, database time, view time and serialization time of a sample of requests, per route.
+
+    The histograms are exported by `/metrics`. When `API_METRICS_HEADER_ENABLED` is set, the timings of the request
+    are also returned in a `Server-Timing` header, with the number of queries in `X-Query-Count`.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """
+        Keep the next middleware, and run asynchronously if it does.
+
+        The hooks are then coroutines too, as Django would otherwise run each of them in a thread.
+
+        Params:
+            get_response (Callable[[HttpRequest], Any]): Next middleware or the view
+        """
+        self.get_response: Callable[[HttpRequest], Any] = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request: HttpRequest) -> Any:
+        """
+        Handle the request, measuring it if it is sampled.
+
+        Params:
+            request (HttpRequest): Request to be handled
+        Returns:
+            Any: Response of the request, or a coroutine returning it.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+        timings: RequestTimings = RequestTimings()
+        request.timings = timings
+        with self.wrap_connections(timings):
+            response: HttpResponse = self.get_response(request)
+        return self.record(request, response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Handle the request asynchronously, measuring it if it is sampled.
+
+        The connections are wrapped in the thread the sync views and the async ORM of the request run in.
+
+        Params:
+            request (HttpRequest): Request to be handled
+        Returns:
+            HttpResponse: Response of the request.
+        """
+        if not self.is_sampled():
+            return await self.get_response(request)
+        timings: RequestTimings = RequestTimings()
+        request.timings = timings
+        # The queries run in the thread of sync_to_async, whose connections are not those of the event loop.
+        stack: ExitStack = await sync_to_async(self.wrap_connections)(timings)
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.record(request, response, timings)
+
+    def is_sampled(self) -> bool:
+        """
+        Return whether the request is sampled.
+
+        Returns:
+            bool: True to measure the request.
+        """
+        return settings.API_METRICS_ENABLED and random.random() < settings.API_METRICS_SAMPLE_RATE
+
+    def wrap_connections(self, timings: RequestTimings) -> ExitStack:
+        """
+        Count the queries of every database connection with the given timings.
+
+        Params:
+            timings (RequestTimings): Timings of the request
+        Returns:
+            ExitStack: Context removing the wrappers on exit.
+        """
+        stack: ExitStack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(timings))
+        return stack
+
+    def record(self, request: HttpRequest, response: HttpResponse, timings: RequestTimings) -> HttpResponse:
+        """
+        Record the timings of the handled request, and return them in headers if enabled.
+
+        Params:
+            request (HttpRequest): Handled request
+            response (HttpResponse): Response of the request
+            timings (RequestTimings): Timings of the request
+        Returns:
+            HttpResponse: Same response.
+        """
+        end: float = time.perf_counter()
+        view_start: float = timings.view_start or timings.start
+        view_end: float = timings.view_end or end
+        values: dict[str, float] = {
+            "api_request_duration_seconds": end - timings.start,
+            "api_view_duration_seconds": view_end - view_start,
+            "api_serialize_duration_seconds": end - view_end,
+            "api_db_duration_seconds": timings.db_duration,
+            "api_db_queries": timings.queries,
+        }
+        match: Any = request.resolver_match
+        request_metrics.record(match.view_name if match else "unmatched", request.method, values)
+        if settings.API_METRICS_HEADER_ENABLED:
+            response["Server-Timing"] = (
+                f'db;dur={timings.db_duration * 1000:.2f};desc="{timings.queries} queries", '
+                f"view;dur={values['api_view_duration_seconds'] * 1000:.2f}, "
+                f"serialize;dur={values['api_serialize_duration_seconds'] * 1000:.2f}, "
+                f"total;dur={values['api_request_duration_seconds'] * 1000:.2f}"
+            )
+            response["X-Query-Count"] = str(timings.queries)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        """
+        Start the view timing of a sampled request.
+
+        Params:
+            request (HttpRequest): Request to be handled
+            view_func (Callable): View of the request
+            view_args (Any): Positional arguments of the view
+            view_kwargs (Any): Keyword arguments of the view
+        """
+        if hasattr(request, "timings"):
+            request.timings.view_start = time.perf_counter()
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """
+        End the view timing of a sampled request, before its response is rendered.
+
+        Params:
+            request (HttpRequest): Handled request
+            response (HttpResponse): Response to be rendered
+        Returns:
+            HttpResponse: Same response.
+        """
+        if hasattr(request, "timings"):
+            request.timings.view_end = time.perf_counter()
+        return response
+
+    async def aprocess_view(self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        """
+        Start the view timing of a sampled request handled asynchronously.
+
+        Params:
+            request (HttpRequest): Request to be handled
+            view_func (Callable): View of the request
+            view_args (Any): Positional arguments of the view
+            view_kwargs (Any): Keyword arguments of the view
+        """
+        MetricsMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """
+        End the view timing of a sampled request handled asynchronously, before its response is rendered.
+
+        Params:
+            request (HttpRequest): Handled request
+            response (HttpResponse): Response to be rendered
+        Returns:
+            HttpResponse: Same response.
+        """
+        return MetricsMiddleware.process_template_response(self, request, response)
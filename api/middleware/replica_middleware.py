@@ -0,0 +1,76 @@
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from api.routers.replica_router import ReplicaState, replica_scope
+
+STICKY_COOKIE: str = "primary_reads"
+
+
+class ReplicaMiddleware:
+    """
+    Track the writes of every request, so that its reads and those of the same client right after go to default.
+
+    A request which writes sets a cookie for `DATABASE_REPLICA_STICKY_SECONDS`, during which every read of that client
+    goes to default instead of a replica which may not have replayed the write yet.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """
+        Keep the next middleware, and run asynchronously if it does.
+
+        Params:
+            get_response (Callable[[HttpRequest], Any]): Next middleware or the view
+        """
+        self.get_response: Callable[[HttpRequest], Any] = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        """
+        Handle the request in a replica scope of its own.
+
+        Params:
+            request (HttpRequest): Request to be handled
+        Returns:
+            Any: Response of the request, or a coroutine returning it.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_scope(STICKY_COOKIE in request.COOKIES) as state:
+            response: HttpResponse = self.get_response(request)
+        return self.stick(response, state)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Handle the request asynchronously in a replica scope of its own.
+
+        Params:
+            request (HttpRequest): Request to be handled
+        Returns:
+            HttpResponse: Response of the request.
+        """
+        with replica_scope(STICKY_COOKIE in request.COOKIES) as state:
+            response: HttpResponse = await self.get_response(request)
+        return self.stick(response, state)
+
+    def stick(self, response: HttpResponse, state: ReplicaState) -> HttpResponse:
+        """
+        Send the reads of the client to default for the sticky window, if the request wrote.
+
+        Params:
+            response (HttpResponse): Response of the request
+            state (ReplicaState): State of the reads of the request
+        Returns:
+            HttpResponse: Same response.
+        """
+        if state.written and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                STICKY_COOKIE, "1", max_age=settings.DATABASE_REPLICA_STICKY_SECONDS, httponly=True, samesite="Lax"
+            )
+        return response
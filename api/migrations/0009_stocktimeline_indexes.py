@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_rename_quantity_change_stocktimeline_quantity"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="stocktimeline",
+            index=models.Index(fields=["vending_machine", "product", "timestamp"], name="stock_timeline_vm_product_ts"),
+        ),
+        migrations.AddIndex(
+            model_name="stocktimeline",
+            index=models.Index(fields=["timestamp", "id"], name="stock_timeline_timestamp_id"),
+        ),
+    ]
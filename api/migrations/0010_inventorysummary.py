@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_stocktimeline_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventorySummary",
+            fields=[
+                (
+                    "vending_machine",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to="api.vendingmachine",
+                    ),
+                ),
+                ("product_count", models.PositiveIntegerField(default=0)),
+                ("total_quantity", models.PositiveIntegerField(default=0)),
+                ("total_value", models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
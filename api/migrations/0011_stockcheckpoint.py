@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_inventorysummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockCheckpoint",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("quantity", models.PositiveIntegerField()),
+                ("timestamp", models.DateTimeField()),
+                ("product", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.product")),
+                (
+                    "vending_machine",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.vendingmachine"),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["timestamp", "vending_machine"], name="stock_checkpoint_ts_vm")],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_stockcheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockTimelineRollup",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("interval", models.CharField(choices=[("hour", "hour"), ("day", "day")], max_length=10)),
+                ("bucket", models.DateTimeField()),
+                ("last", models.PositiveIntegerField()),
+                ("min", models.PositiveIntegerField()),
+                ("max", models.PositiveIntegerField()),
+                ("changes", models.PositiveIntegerField()),
+                ("product", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.product")),
+                (
+                    "vending_machine",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.vendingmachine"),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="stocktimelinerollup",
+            constraint=models.UniqueConstraint(
+                fields=("interval", "vending_machine", "product", "bucket"), name="stock_timeline_rollup_bucket"
+            ),
+        ),
+    ]
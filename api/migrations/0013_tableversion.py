@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_table_versions(apps, schema_editor):
+    TableVersion = apps.get_model("api", "TableVersion")
+    TableVersion.objects.bulk_create(
+        [
+            TableVersion(name=name)
+            for name in ("api_vendingmachine", "api_product", "api_stock", "api_stocktimeline")
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_stocktimelinerollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableVersion",
+            fields=[
+                ("name", models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(create_table_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_tableversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockThreshold",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("reorder_level", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="stock",
+            name="reorder_level",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="stock",
+            index=models.Index(
+                condition=models.Q(("quantity__lt", models.F("reorder_level"))),
+                fields=["vending_machine", "product"],
+                name="stock_low",
+            ),
+        ),
+        migrations.AddField(
+            model_name="stockthreshold",
+            name="product",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.product"),
+        ),
+        migrations.AddField(
+            model_name="stockthreshold",
+            name="vending_machine",
+            field=models.ForeignKey(
+                blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to="api.vendingmachine"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="stockthreshold",
+            constraint=models.UniqueConstraint(
+                fields=("vending_machine", "product"), name="stock_threshold_vending_machine_product"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="stockthreshold",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("vending_machine__isnull", True)),
+                fields=("product",),
+                name="stock_threshold_product",
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:43
+
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+TABLE = "api_stocktimeline"
+MONTHS_AHEAD = 3
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def rebuild_stock_timeline_table(schema_editor, partitioned):
+    # Only PostgreSQL has declarative partitioning, other databases keep a single table.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    new = f"{TABLE}_new"
+    with schema_editor.connection.cursor() as cursor:
+        # Writes during the copy would be lost with the old table, so they wait until the migration commits.
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype <> 'p'",
+            [TABLE],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index WHERE indrelid = %s::regclass AND NOT indisprimary",
+            [TABLE],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+
+        # The primary key of a partitioned table must include the partition key.
+        cursor.execute(f"CREATE SEQUENCE {new}_id_seq AS integer")
+        cursor.execute(
+            f'CREATE TABLE {new} (LIKE {TABLE}, PRIMARY KEY (id, "timestamp")) PARTITION BY RANGE ("timestamp")'
+            if partitioned
+            else f"CREATE TABLE {new} (LIKE {TABLE}, PRIMARY KEY (id))"
+        )
+        cursor.execute(f"ALTER TABLE {new} ALTER COLUMN id SET DEFAULT nextval('{new}_id_seq')")
+        cursor.execute(f"ALTER SEQUENCE {new}_id_seq OWNED BY {new}.id")
+        if partitioned:
+            cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {new} DEFAULT")
+            cursor.execute(f'SELECT min("timestamp") FROM {TABLE}')
+            now = datetime.now(timezone.utc)
+            first = min(cursor.fetchone()[0] or now, now).astimezone(timezone.utc)
+            month = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            last = add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+            while month <= last:
+                cursor.execute(
+                    f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {new} FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)],
+                )
+                month = add_months(month, 1)
+
+        cursor.execute(f"INSERT INTO {new} SELECT * FROM {TABLE}")
+        cursor.execute(f"SELECT setval('{new}_id_seq', COALESCE(max(id), 0) + 1, false) FROM {new}")
+        cursor.execute(f"DROP TABLE {TABLE}")
+        cursor.execute(f"ALTER TABLE {new} RENAME TO {TABLE}")
+        cursor.execute(f"ALTER SEQUENCE {new}_id_seq RENAME TO {TABLE}_id_seq")
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {new}_pkey TO {TABLE}_pkey")
+        for name, definition in constraints:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+        for index in indexes:
+            cursor.execute(index)
+
+
+def partition_stock_timeline_table(apps, schema_editor):
+    rebuild_stock_timeline_table(schema_editor, partitioned=True)
+
+
+def unpartition_stock_timeline_table(apps, schema_editor):
+    rebuild_stock_timeline_table(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_stockthreshold_stock_reorder_level"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_stock_timeline_table, unpartition_stock_timeline_table),
+    ]
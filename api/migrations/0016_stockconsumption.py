@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_partition_stocktimeline"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockConsumption",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("day", models.DateField()),
+                ("sold", models.PositiveIntegerField()),
+                ("restocked", models.PositiveIntegerField()),
+                ("product", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.product")),
+                (
+                    "vending_machine",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.vendingmachine"),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["day"], name="stock_consumption_day_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="stockconsumption",
+            constraint=models.UniqueConstraint(
+                fields=("vending_machine", "product", "day"), name="stock_consumption_day"
+            ),
+        ),
+    ]
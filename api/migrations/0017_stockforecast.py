@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_stockconsumption"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockForecast",
+            fields=[
+                (
+                    "stock",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="forecast",
+                        serialize=False,
+                        to="api.stock",
+                    ),
+                ),
+                ("rate", models.FloatField()),
+                ("updated_at", models.DateTimeField()),
+            ],
+        ),
+    ]
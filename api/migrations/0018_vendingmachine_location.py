@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0017_stockforecast"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vendingmachine",
+            index=models.Index(fields=["location"], name="vending_machine_location"),
+        ),
+    ]
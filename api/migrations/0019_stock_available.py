@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0018_vendingmachine_location"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="stock",
+            index=models.Index(
+                condition=models.Q(("quantity__gt", 0)), fields=["product", "vending_machine"], name="stock_available"
+            ),
+        ),
+    ]
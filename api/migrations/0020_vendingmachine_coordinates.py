@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:01
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0019_stock_available"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendingmachine",
+            name="geohash",
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name="vendingmachine",
+            name="latitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="vendingmachine",
+            name="longitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vendingmachine",
+            index=models.Index(fields=["geohash"], name="vending_machine_geohash"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:13
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0020_vendingmachine_coordinates"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="tableversion",
+            name="updated_at",
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0021_remove_tableversion_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockTimelineWatermark",
+            fields=[
+                ("name", models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ("stock_timeline_id", models.PositiveBigIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,81 @@
+from typing import Iterable
+
+from django.db import connection, models, transaction
+from django.db.models import Count, DateTimeField, DecimalField, F, PositiveIntegerField, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.models.vending_machine import VendingMachine
+
+
+class InventorySummary(models.Model):
+    """
+    Inventory Summary model, the denormalized stock totals of a vending machine.
+
+    Only kept up to date by stock and product writes when `INVENTORY_SUMMARY_ENABLED` is set.
+    """
+
+    vending_machine: VendingMachine = models.OneToOneField(VendingMachine, on_delete=models.CASCADE, primary_key=True)
+    product_count: PositiveIntegerField = models.PositiveIntegerField(default=0)
+    total_quantity: PositiveIntegerField = models.PositiveIntegerField(default=0)
+    total_value: DecimalField = models.DecimalField(decimal_places=2, max_digits=20, default=0)
+    updated_at: DateTimeField = models.DateTimeField(auto_now=True)
+
+    @staticmethod
+    def aggregate(vending_machines: QuerySet) -> QuerySet:
+        """
+        Compute the stock totals of the given vending machines with one aggregate query.
+
+        Params:
+            vending_machines (QuerySet): Vending machines to be summarized
+        Returns:
+            QuerySet: Vending machines annotated with product count, total quantity and total value.
+        """
+        decimal_field: DecimalField = models.DecimalField(decimal_places=2, max_digits=20)
+        return vending_machines.annotate(
+            product_count=Count("stock"),
+            total_quantity=Coalesce(Sum("stock__quantity"), 0),
+            total_value=Coalesce(
+                Sum(F("stock__quantity") * F("stock__product__cost"), output_field=decimal_field),
+                Value(0),
+                output_field=decimal_field,
+            ),
+        )
+
+    @classmethod
+    def refresh(cls, vending_machine_ids: Iterable[int]) -> None:
+        """
+        Recompute the inventory summaries of the given vending machines with one upsert from their aggregate query.
+
+        The vending machines are locked first, in id order, until the end of the transaction. A refresh then waits
+        for the concurrent one of the same vending machine, and its upsert reads every stock committed before, so
+        it never overwrites newer totals with stale ones. `FOR NO KEY UPDATE` still lets stocks of those vending
+        machines be inserted meanwhile.
+
+        Params:
+            vending_machine_ids (Iterable[int]): Ids of the vending machines to be refreshed
+        """
+        ids: set[int] = set(vending_machine_ids)
+        if not ids:
+            return
+        totals: QuerySet = (
+            cls.aggregate(VendingMachine.objects.filter(id__in=ids))
+            .annotate(updated_at=Value(timezone.now(), output_field=DateTimeField()))
+            .values("id", "product_count", "total_quantity", "total_value", "updated_at")
+        )
+        sql, params = totals.query.sql_with_params()
+        with transaction.atomic(), connection.cursor() as cursor:
+            list(
+                VendingMachine.objects.filter(id__in=ids)
+                .order_by("id")
+                .select_for_update(no_key=True)
+                .values_list("id", flat=True)
+            )
+            cursor.execute(
+                f"INSERT INTO {cls._meta.db_table} "
+                "(vending_machine_id, product_count, total_quantity, total_value, updated_at) "
+                f"{sql} ON CONFLICT (vending_machine_id) DO UPDATE SET product_count = EXCLUDED.product_count, "
+                "total_quantity = EXCLUDED.total_quantity, total_value = EXCLUDED.total_value, "
+                "updated_at = EXCLUDED.updated_at",
+                params,
+            )
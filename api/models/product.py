@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import AutoField, CharField, DecimalField
 
+from api.models.inventory_summary import InventorySummary
+
 
 class Product(models.Model):
     """Product model."""
@@ -9,3 +12,19 @@ class Product(models.Model):
     id: AutoField = models.AutoField(primary_key=True)
     name: CharField = models.CharField(max_length=100, unique=True)
     cost: DecimalField = models.DecimalField(decimal_places=2, max_digits=10, validators=[MinValueValidator(0)])
+
+    def save(self, *args, **kwargs):
+        """When product is updated, refresh the inventory summaries of the vending machines stocking it."""
+        super().save(*args, **kwargs)
+        if settings.INVENTORY_SUMMARY_ENABLED:
+            InventorySummary.refresh(self.stock_set.values_list("vending_machine_id", flat=True))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """When product is deleted with its stocks, refresh the inventory summaries of the vending machines."""
+        vending_machine_ids: list[int] = []
+        if settings.INVENTORY_SUMMARY_ENABLED:
+            vending_machine_ids = list(self.stock_set.values_list("vending_machine_id", flat=True))
+        result: tuple[int, dict[str, int]] = super().delete(*args, **kwargs)
+        if vending_machine_ids:
+            InventorySummary.refresh(vending_machine_ids)
+        return result
@@ -1,29 +1,64 @@
+from django.conf import settings
 from django.db import models
-from django.db.models import AutoField, PositiveIntegerField, UniqueConstraint
+from django.db.models import AutoField, F, Index, PositiveIntegerField, Q, UniqueConstraint
 
+from api.models.inventory_summary import InventorySummary
 from api.models.product import Product
-from api.models.stock_timeline import StockTimeline
+from api.models.stock_threshold import StockThreshold
+from api.models.table_version import TableVersion
 from api.models.vending_machine import VendingMachine
+from api.services.stock_timeline_writer import write_stock_timeline
 
 
 class Stock(models.Model):
     """Stock model, related to VendingMachine and Product."""
 
+    # Largest quantity the positive integer column holds on every database.
+    MAX_QUANTITY: int = 2147483647
+
     id: AutoField = models.AutoField(primary_key=True)
     vending_machine: VendingMachine = models.ForeignKey(VendingMachine, on_delete=models.CASCADE)
     product: Product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity: PositiveIntegerField = models.PositiveIntegerField()
+    reorder_level: PositiveIntegerField = models.PositiveIntegerField(null=True, blank=True, editable=False)
 
     class Meta:
         constraints: list[UniqueConstraint] = [
             models.UniqueConstraint(fields=["vending_machine", "product"], name="vending_machine_product")
         ]
+        indexes: list[Index] = [
+            # Only holds the stocks below their reorder level, kept up to date by the database on every write.
+            models.Index(
+                fields=["vending_machine", "product"], condition=Q(quantity__lt=F("reorder_level")), name="stock_low"
+            ),
+            # Only holds the stocks in stock, read by product to find the vending machines which have it.
+            models.Index(fields=["product", "vending_machine"], condition=Q(quantity__gt=0), name="stock_available"),
+        ]
 
     def save(self, *args, **kwargs):
-        """When stock is created or updated, save to stock-timeline."""
-        super().save(*args, **kwargs)
-        StockTimeline.objects.create(
-            product=self.product,
-            vending_machine=self.vending_machine,
-            quantity=self.quantity,
+        """
+        When stock is created or updated, save to stock-timeline, bump the table version and refresh the summary.
+
+        The reorder level of the stock is first copied from its thresholds.
+        """
+        self.reorder_level = StockThreshold.get_reorder_levels([(self.vending_machine_id, self.product_id)]).get(
+            (self.vending_machine_id, self.product_id)
         )
+        previous_vending_machine_ids: list[int] = []
+        if settings.INVENTORY_SUMMARY_ENABLED and self.pk is not None:
+            previous_vending_machine_ids = list(
+                Stock.objects.filter(pk=self.pk).values_list("vending_machine_id", flat=True)
+            )
+        super().save(*args, **kwargs)
+        TableVersion.bump(Stock)
+        write_stock_timeline(self.vending_machine_id, self.product_id, self.quantity)
+        if settings.INVENTORY_SUMMARY_ENABLED:
+            InventorySummary.refresh([self.vending_machine_id, *previous_vending_machine_ids])
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """When stock is deleted, bump the table version and refresh the inventory summary."""
+        result: tuple[int, dict[str, int]] = super().delete(*args, **kwargs)
+        TableVersion.bump(Stock)
+        if settings.INVENTORY_SUMMARY_ENABLED:
+            InventorySummary.refresh([self.vending_machine_id])
+        return result
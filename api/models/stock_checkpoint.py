@@ -0,0 +1,24 @@
+from django.db import models
+from django.db.models import AutoField, DateTimeField, Index, PositiveIntegerField
+
+from api.models.product import Product
+from api.models.vending_machine import VendingMachine
+
+
+class StockCheckpoint(models.Model):
+    """
+    Stock Checkpoint model, the quantity of every product in every vending machine at a point in time.
+
+    Point-in-time stock queries start from the latest checkpoint and only replay the stock timelines after it.
+    """
+
+    id: AutoField = models.AutoField(primary_key=True)
+    vending_machine: VendingMachine = models.ForeignKey(VendingMachine, on_delete=models.CASCADE)
+    product: Product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity: PositiveIntegerField = models.PositiveIntegerField()
+    timestamp: DateTimeField = models.DateTimeField()
+
+    class Meta:
+        indexes: list[Index] = [
+            models.Index(fields=["timestamp", "vending_machine"], name="stock_checkpoint_ts_vm"),
+        ]
@@ -0,0 +1,27 @@
+from django.db import models
+from django.db.models import AutoField, DateField, Index, PositiveIntegerField, UniqueConstraint
+
+from api.models.product import Product
+from api.models.vending_machine import VendingMachine
+
+
+class StockConsumption(models.Model):
+    """
+    Stock Consumption model, the units of a product sold and restocked in a vending machine in a day.
+
+    Units are the decreases and increases between consecutive stock timelines, precomputed so that consumption
+    over a window sums a few rows per stock instead of pairing every stock timeline.
+    """
+
+    id: AutoField = models.AutoField(primary_key=True)
+    vending_machine: VendingMachine = models.ForeignKey(VendingMachine, on_delete=models.CASCADE)
+    product: Product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    day: DateField = models.DateField()
+    sold: PositiveIntegerField = models.PositiveIntegerField()
+    restocked: PositiveIntegerField = models.PositiveIntegerField()
+
+    class Meta:
+        constraints: list[UniqueConstraint] = [
+            models.UniqueConstraint(fields=["vending_machine", "product", "day"], name="stock_consumption_day")
+        ]
+        indexes: list[Index] = [models.Index(fields=["day"], name="stock_consumption_day_idx")]
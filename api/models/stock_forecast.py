@@ -0,0 +1,17 @@
+from django.db import models
+from django.db.models import DateTimeField, FloatField
+
+from api.models.stock import Stock
+
+
+class StockForecast(models.Model):
+    """
+    Stock Forecast model, the predicted consumption rate of a stock in units per day.
+
+    Rates are exponentially smoothed over the daily stock consumptions and refreshed in bulk, and the time until a
+    stock is empty is its current quantity over its rate.
+    """
+
+    stock: Stock = models.OneToOneField(Stock, on_delete=models.CASCADE, primary_key=True, related_name="forecast")
+    rate: FloatField = models.FloatField()
+    updated_at: DateTimeField = models.DateTimeField()
@@ -0,0 +1,112 @@
+from typing import Iterable, Optional
+
+from django.db import models
+from django.db.models import AutoField, Func, OuterRef, PositiveIntegerField, Q, QuerySet, Subquery, UniqueConstraint
+from django.db.models.functions import Coalesce
+
+from api.models.product import Product
+from api.models.vending_machine import VendingMachine
+
+
+class StockThreshold(models.Model):
+    """
+    Stock Threshold model, the reorder level of a product in every vending machine, or in one of them.
+
+    The threshold of a vending machine and product overrides the threshold of the product. Thresholds are copied to the
+    reorder level of the stocks they apply to whenever either is written, so that low stocks are read from an index.
+    """
+
+    id: AutoField = models.AutoField(primary_key=True)
+    vending_machine: Optional[VendingMachine] = models.ForeignKey(
+        VendingMachine, on_delete=models.CASCADE, null=True, blank=True
+    )
+    product: Product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    reorder_level: PositiveIntegerField = models.PositiveIntegerField()
+
+    class Meta:
+        constraints: list[UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["vending_machine", "product"], name="stock_threshold_vending_machine_product"
+            ),
+            models.UniqueConstraint(
+                fields=["product"], condition=Q(vending_machine__isnull=True), name="stock_threshold_product"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """When a threshold is created or updated, update the reorder level of the stocks it applies to."""
+        previous: list[tuple[Optional[int], int]] = (
+            list(StockThreshold.objects.filter(pk=self.pk).values_list("vending_machine_id", "product_id"))
+            if self.pk is not None
+            else []
+        )
+        super().save(*args, **kwargs)
+        for vending_machine_id, product_id in {(self.vending_machine_id, self.product_id), *previous}:
+            self.apply(product_id, vending_machine_id)
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """When a threshold is deleted, fall back to the threshold of the product for the stocks it applied to."""
+        result: tuple[int, dict[str, int]] = super().delete(*args, **kwargs)
+        self.apply(self.product_id, self.vending_machine_id)
+        return result
+
+    @classmethod
+    def apply(cls, product_id: int, vending_machine_id: Optional[int] = None) -> None:
+        """
+        Update the reorder level of the stocks of the given product, in the given vending machine or in all of them.
+
+        Params:
+            product_id (int): Id of the product
+            vending_machine_id (Optional[int]): Id of the vending machine, all of them by default
+        """
+        stocks: QuerySet = Product(id=product_id).stock_set.all()
+        if vending_machine_id is not None:
+            stocks = stocks.filter(vending_machine_id=vending_machine_id)
+        stocks.update(reorder_level=cls.get_reorder_level())
+
+    @classmethod
+    def get_reorder_level(cls) -> Func:
+        """
+        Return the reorder level of the stock of the outer query, from its vending machine and product thresholds.
+
+        Returns:
+            Func: Reorder level, or null without threshold.
+        """
+        return Coalesce(
+            Subquery(
+                cls.objects.filter(
+                    vending_machine_id=OuterRef("vending_machine_id"), product_id=OuterRef("product_id")
+                ).values("reorder_level")[:1]
+            ),
+            Subquery(
+                cls.objects.filter(vending_machine__isnull=True, product_id=OuterRef("product_id")).values(
+                    "reorder_level"
+                )[:1]
+            ),
+        )
+
+    @classmethod
+    def get_reorder_levels(cls, keys: Iterable[tuple[int, int]]) -> dict[tuple[int, int], int]:
+        """
+        Return the reorder level of the given stocks with one query.
+
+        Params:
+            keys (Iterable[tuple[int, int]]): Vending machine and product ids of the stocks
+        Returns:
+            dict[tuple[int, int], int]: Reorder levels of the stocks with a threshold.
+        """
+        keys = set(keys)
+        thresholds: dict[tuple[Optional[int], int], int] = {
+            (vending_machine_id, product_id): reorder_level
+            for vending_machine_id, product_id, reorder_level in cls.objects.filter(
+                product_id__in={product_id for _, product_id in keys}
+            ).values_list("vending_machine_id", "product_id", "reorder_level")
+        }
+        reorder_levels: dict[tuple[int, int], int] = {}
+        for vending_machine_id, product_id in keys:
+            reorder_level: Optional[int] = thresholds.get(
+                (vending_machine_id, product_id), thresholds.get((None, product_id))
+            )
+            if reorder_level is not None:
+                reorder_levels[(vending_machine_id, product_id)] = reorder_level
+        return reorder_levels
@@ -1,16 +1,38 @@
 from django.db import models
-from django.db.models import AutoField, DateTimeField, PositiveIntegerField
+from django.db.models import AutoField, DateTimeField, Index, PositiveIntegerField
 from django.utils import timezone
 
 from api.models.product import Product
+from api.models.table_version import TableVersion
 from api.models.vending_machine import VendingMachine
 
 
 class StockTimeline(models.Model):
-    """Stock Timeline model, related to Stock."""
+    """
+    Stock Timeline model, related to Stock.
+
+    On PostgreSQL, the table is partitioned by month of timestamp, with (id, timestamp) as primary key.
+    """
 
     id: AutoField = models.AutoField(primary_key=True)
     vending_machine: VendingMachine = models.ForeignKey(VendingMachine, on_delete=models.DO_NOTHING)
     product: Product = models.ForeignKey(Product, on_delete=models.DO_NOTHING)
     quantity: PositiveIntegerField = models.PositiveIntegerField()
     timestamp: DateTimeField = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes: list[Index] = [
+            models.Index(fields=["vending_machine", "product", "timestamp"], name="stock_timeline_vm_product_ts"),
+            models.Index(fields=["timestamp", "id"], name="stock_timeline_timestamp_id"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """When stock timeline is created or updated, bump the stock timeline table version."""
+        super().save(*args, **kwargs)
+        TableVersion.bump(StockTimeline)
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """When stock timeline is deleted, bump the stock timeline table version."""
+        result: tuple[int, dict[str, int]] = super().delete(*args, **kwargs)
+        TableVersion.bump(StockTimeline)
+        return result
@@ -0,0 +1,30 @@
+from django.db import models
+from django.db.models import AutoField, CharField, DateTimeField, PositiveIntegerField, UniqueConstraint
+
+from api.models.product import Product
+from api.models.vending_machine import VendingMachine
+
+
+class StockTimelineRollup(models.Model):
+    """Stock Timeline Rollup model, the aggregated stock timelines of a product in a vending machine per bucket."""
+
+    HOUR: str = "hour"
+    DAY: str = "day"
+    INTERVALS: tuple[str, str] = (HOUR, DAY)
+
+    id: AutoField = models.AutoField(primary_key=True)
+    vending_machine: VendingMachine = models.ForeignKey(VendingMachine, on_delete=models.CASCADE)
+    product: Product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    interval: CharField = models.CharField(max_length=10, choices=[(interval, interval) for interval in INTERVALS])
+    bucket: DateTimeField = models.DateTimeField()
+    last: PositiveIntegerField = models.PositiveIntegerField()
+    min: PositiveIntegerField = models.PositiveIntegerField()
+    max: PositiveIntegerField = models.PositiveIntegerField()
+    changes: PositiveIntegerField = models.PositiveIntegerField()
+
+    class Meta:
+        constraints: list[UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["interval", "vending_machine", "product", "bucket"], name="stock_timeline_rollup_bucket"
+            )
+        ]
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import models
+from django.db.models import CharField, DateTimeField, PositiveBigIntegerField, Q, QuerySet
+
+from api.models.stock_timeline import StockTimeline
+
+
+class StockTimelineWatermark(models.Model):
+    """
+    Stock Timeline Watermark model, how far a refresh of a table derived from the stock timelines has read them.
+
+    Stock timelines may be inserted with earlier timestamps than those already read, e.g. by the async writer or a
+    backfill, so refreshes track the ids they read rather than a time. Ids may also commit out of order, so the
+    stock timelines of the last `STOCK_TIMELINE_COMMIT_GRACE` seconds before the previous refresh are read again.
+    The `detached` watermark records instead the time before which stock timelines were detached.
+    """
+
+    DETACHED: str = "detached"
+
+    name: CharField = models.CharField(max_length=100, primary_key=True)
+    stock_timeline_id: PositiveBigIntegerField = models.PositiveBigIntegerField(default=0)
+    refreshed_at: DateTimeField = models.DateTimeField(null=True)
+
+    @classmethod
+    def lock(cls, name: str) -> "StockTimelineWatermark":
+        """
+        Return the watermark of the given name, locked until the end of the current transaction.
+
+        Params:
+            name (str): Name of the refresh
+        Returns:
+            StockTimelineWatermark: Watermark, at the first id if the refresh never ran.
+        """
+        cls.objects.get_or_create(name=name)
+        return cls.objects.select_for_update().get(name=name)
+
+    @classmethod
+    def get_read_by_all(cls) -> Optional[tuple[datetime, int]]:
+        """
+        Return how far every refresh which ran has read the stock timelines.
+
+        Returns:
+            Optional[tuple[datetime, int]]: Time before which stock timelines up to the id were read by all the
+                refreshes, or None if none ran.
+        """
+        watermarks: list[StockTimelineWatermark] = list(
+            cls.objects.exclude(name=cls.DETACHED).filter(refreshed_at__isnull=False)
+        )
+        if not watermarks:
+            return None
+        grace: timedelta = timedelta(seconds=settings.STOCK_TIMELINE_COMMIT_GRACE)
+        return (
+            min(watermark.refreshed_at for watermark in watermarks) - grace,
+            min(watermark.stock_timeline_id for watermark in watermarks),
+        )
+
+    def get_new_stock_timelines(self) -> QuerySet:
+        """
+        Return the stock timelines the previous refresh may not have read.
+
+        Returns:
+            QuerySet: Stock timelines after the watermark id, or within the grace period of the previous refresh.
+        """
+        if self.refreshed_at is None:
+            return StockTimeline.objects.all()
+        since: datetime = self.refreshed_at - timedelta(seconds=settings.STOCK_TIMELINE_COMMIT_GRACE)
+        return StockTimeline.objects.filter(Q(id__gt=self.stock_timeline_id) | Q(timestamp__gte=since))
+
+    def advance(self, stock_timeline_id: Optional[int], refreshed_at: datetime) -> None:
+        """
+        Record a refresh which read the stock timelines up to the given id.
+
+        Params:
+            stock_timeline_id (Optional[int]): Highest id read, None if nothing was read
+            refreshed_at (datetime): Time the refresh started reading
+        """
+        self.stock_timeline_id = max(self.stock_timeline_id, stock_timeline_id or 0)
+        self.refreshed_at = refreshed_at
+        self.save(update_fields=["stock_timeline_id", "refreshed_at"])
@@ -0,0 +1,48 @@
+import threading
+
+from django.db import models, transaction
+from django.db.models import CharField, F, Model, PositiveBigIntegerField
+
+
+class TableVersion(models.Model):
+    """
+    Table Version model, a change counter of a table.
+
+    The versions of the tables behind an endpoint validate its conditional requests,
+    without querying the tables themselves.
+    """
+
+    name: CharField = models.CharField(max_length=100, primary_key=True)
+    version: PositiveBigIntegerField = models.PositiveBigIntegerField(default=0)
+
+    pending: threading.local = threading.local()
+
+    @classmethod
+    def bump(cls, *tables: type[Model]) -> None:
+        """
+        Increment the versions of the tables of the given models once the current transaction commits.
+
+        The tables changed by a transaction are bumped together by one update after it commits, so that writes never
+        hold a version row locked while their transaction runs.
+
+        Params:
+            tables (type[Model]): Models whose table changed
+        """
+        if not hasattr(cls.pending, "names"):
+            cls.pending.names = set()
+        cls.pending.names.update(table._meta.db_table for table in tables)
+        transaction.on_commit(cls.flush)
+
+    @classmethod
+    def flush(cls) -> None:
+        """Increment the versions of the tables changed by the transactions committed by this thread."""
+        names: set[str] = getattr(cls.pending, "names", set())
+        if not names:
+            return
+        cls.pending.names = set()
+        if cls.objects.filter(name__in=names).update(version=F("version") + 1) == len(names):
+            return
+        for name in names - set(cls.objects.filter(name__in=names).values_list("name", flat=True)):
+            _, created = cls.objects.get_or_create(name=name, defaults={"version": 1})
+            if not created:
+                cls.objects.filter(name=name).update(version=F("version") + 1)
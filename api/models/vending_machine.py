@@ -1,11 +1,41 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import AutoField, BooleanField, CharField
+from django.db.models import AutoField, BooleanField, CharField, FloatField, Index
+
+from api.services.geohash_service import encode
 
 
 class VendingMachine(models.Model):
-    """Vending Machine model."""
+    """
+    Vending Machine model.
+
+    The geohash of its coordinates is kept with them, so that nearby vending machines are read as ranges of an index.
+    """
 
     id: AutoField = models.AutoField(primary_key=True)
     name: CharField = models.CharField(max_length=100, unique=True)
     location: CharField = models.CharField(max_length=100)
     is_active: BooleanField = models.BooleanField(default=True)
+    latitude: FloatField = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude: FloatField = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    geohash: CharField = models.CharField(max_length=12, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes: list[Index] = [
+            # Pick lists are planned per location.
+            models.Index(fields=["location"], name="vending_machine_location"),
+            models.Index(fields=["geohash"], name="vending_machine_geohash"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """When vending machine is created or updated, encode its coordinates to its geohash."""
+        self.geohash = (
+            encode(self.latitude, self.longitude) if self.latitude is not None and self.longitude is not None else None
+        )
+        if kwargs.get("update_fields") is not None and {"latitude", "longitude"} & set(kwargs["update_fields"]):
+            kwargs["update_fields"] = {*kwargs["update_fields"], "geohash"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,173 @@
+import base64
+import binascii
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StockTimelinePagination(BasePagination):
+    """
+    Keyset pagination of stock timelines ordered by (timestamp, id).
+
+    The cursor is the (timestamp, id) of the last row of the previous page, so every page is a range scan
+    on the index no matter how deep it is, unlike offset pagination.
+    """
+
+    page_size: int = 100
+    max_page_size: int = 1000
+    cursor_query_param: str = "cursor"
+    page_size_query_param: str = "page_size"
+    invalid_cursor_message: str = "Invalid cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list[Any]:
+        """
+        Return a page of the given queryset after the cursor of the request.
+
+        Params:
+            queryset (QuerySet): Queryset to be paginated
+            request (Request): Request with optional cursor and page size
+            view (Any): View which paginates the queryset
+        Returns:
+            list[Any]: Rows of the page.
+        """
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request: Request) -> list[Any]:
+        """
+        Return a page of the given queryset after the cursor of the request, read with the async ORM.
+
+        Params:
+            queryset (QuerySet): Queryset to be paginated
+            request (Request): Request with optional cursor and page size
+        Returns:
+            list[Any]: Rows of the page.
+        """
+        return self.set_page([row async for row in self.get_page_queryset(queryset, request)])
+
+    def get_page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        """
+        Return the rows of the page after the cursor of the request, and the first row of the next page.
+
+        Params:
+            queryset (QuerySet): Queryset to be paginated
+            request (Request): Request with optional cursor and page size
+        Returns:
+            QuerySet: Rows to be read.
+        """
+        self.request: Request = request
+        self.limit: int = self.get_page_size(request)
+        cursor: Optional[tuple[datetime, int]] = self.decode_cursor(request)
+        queryset = queryset.order_by("timestamp", "id")
+        if cursor is not None:
+            timestamp, last_id = cursor
+            queryset = queryset.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=last_id))
+        return queryset[: self.limit + 1]
+
+    def set_page(self, rows: list[Any]) -> list[Any]:
+        """
+        Keep the page of the given rows.
+
+        Params:
+            rows (list[Any]): Rows read by `get_page_queryset`
+        Returns:
+            list[Any]: Rows of the page.
+        """
+        self.has_next: bool = len(rows) > self.limit
+        self.page: list[Any] = rows[: self.limit]
+        return self.page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """
+        Return the response of the page with the link to the next page.
+
+        Params:
+            data (Any): Serialized rows of the page
+        Returns:
+            Response: Paginated response.
+        """
+        return Response(OrderedDict([("next", self.get_next_link()), ("results", data)]))
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return the schema of the paginated response.
+
+        Params:
+            schema (dict[str, Any]): Schema of the results
+        Returns:
+            dict[str, Any]: Schema of the paginated response.
+        """
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request: Request) -> int:
+        """
+        Return the page size of the request, capped at the max page size.
+
+        Params:
+            request (Request): Request with optional page size
+        Returns:
+            int: Page size.
+        """
+        try:
+            page_size: int = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_next_link(self) -> Optional[str]:
+        """
+        Return the link to the next page, or None if this is the last page.
+
+        Returns:
+            Optional[str]: Link to the next page.
+        """
+        if not self.has_next:
+            return None
+        last: Any = self.page[-1]
+        timestamp, last_id = (last["timestamp"], last["id"]) if isinstance(last, dict) else (last.timestamp, last.id)
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(timestamp, last_id)
+        )
+
+    @staticmethod
+    def encode_cursor(timestamp: datetime, last_id: int) -> str:
+        """
+        Encode the given position into a cursor.
+
+        Params:
+            timestamp (datetime): Timestamp of the last row
+            last_id (int): Id of the last row
+        Returns:
+            str: Cursor.
+        """
+        return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{last_id}".encode()).decode()
+
+    def decode_cursor(self, request: Request) -> Optional[tuple[datetime, int]]:
+        """
+        Decode the cursor of the request into a position.
+
+        Params:
+            request (Request): Request with optional cursor
+        Returns:
+            Optional[tuple[datetime, int]]: Timestamp and id of the last row of the previous page.
+        """
+        encoded: Optional[str] = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            timestamp, last_id = base64.urlsafe_b64decode(encoded.encode()).decode().split("|")
+            return datetime.fromisoformat(timestamp), int(last_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
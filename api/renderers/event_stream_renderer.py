@@ -0,0 +1,27 @@
+import json
+from typing import Any, Optional
+
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Renderer of server-sent events, accepting `text/event-stream` requests and rendering their errors as events."""
+
+    media_type: str = "text/event-stream"
+    format: str = "event-stream"
+    charset: str = "utf-8"
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Any = None) -> bytes:
+        """
+        Render the given data as a single `error` event.
+
+        Params:
+            data (Any): Data to be rendered
+            accepted_media_type (Optional[str]): Accepted media type of the request
+            renderer_context (Any): Context of the renderer
+        Returns:
+            bytes: Server-sent event.
+        """
+        if data is None:
+            return b""
+        return f"event: error\ndata: {json.dumps(data)}\n\n".encode()
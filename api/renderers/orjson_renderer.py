@@ -0,0 +1,45 @@
+from typing import Any, Optional
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer which uses orjson when it is installed, with the same output as the JSON renderer.
+
+    Indented output, and data orjson cannot encode natively, fall back to the JSON renderer.
+    """
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Any = None) -> bytes:
+        """
+        Render the given data into compact JSON.
+
+        Params:
+            data (Any): Data to be rendered
+            accepted_media_type (Optional[str]): Accepted media type of the request
+            renderer_context (Any): Context of the renderer
+        Returns:
+            bytes: JSON.
+        """
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        encoder: Any = self.encoder_class()
+        try:
+            rendered: bytes = orjson.dumps(
+                data, default=encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape the line and paragraph separators like the JSON renderer, since they are not valid in JavaScript.
+        return rendered.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
@@ -0,0 +1,199 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Model
+
+DEFAULT: str = "default"
+LAG_QUERY: str = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class ReplicaState:
+    """Whether the reads of a request, or of a thread outside requests, may be sent to a replica."""
+
+    def __init__(self, primary: bool = False) -> None:
+        """
+        Start the state of a request.
+
+        Params:
+            primary (bool): Whether every read must go to default, within the sticky window of a write
+        """
+        self.primary: bool = primary
+        self.read_from_replica: bool = False
+        self.written: bool = False
+        self.replica: Optional[str] = None
+
+
+_state: ContextVar[Optional[ReplicaState]] = ContextVar("replica_state", default=None)
+
+
+def get_state() -> ReplicaState:
+    """
+    Return the state of the current request, or of the current thread outside requests.
+
+    Returns:
+        ReplicaState: State of the reads.
+    """
+    state: Optional[ReplicaState] = _state.get()
+    if state is None:
+        state = ReplicaState()
+        _state.set(state)
+    return state
+
+
+@contextmanager
+def replica_scope(primary: bool = False) -> Iterator[ReplicaState]:
+    """
+    Track the writes of a request in a state of its own.
+
+    Params:
+        primary (bool): Whether every read must go to default, within the sticky window of a write
+    Returns:
+        Iterator[ReplicaState]: State of the reads of the request.
+    """
+    state: ReplicaState = ReplicaState(primary)
+    token: Any = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def read_from_replica() -> Iterator[None]:
+    """Send the reads of every model to a replica, when one is configured and nothing was written before."""
+    state: ReplicaState = get_state()
+    previous: bool = state.read_from_replica
+    state.read_from_replica = True
+    try:
+        yield
+    finally:
+        state.read_from_replica = previous
+
+
+@contextmanager
+def read_from_primary() -> Iterator[None]:
+    """Send the reads of every model to default, for results shared with requests which must see the latest writes."""
+    state: ReplicaState = get_state()
+    previous: bool = state.primary
+    state.primary = True
+    try:
+        yield
+    finally:
+        state.primary = previous
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads to a replica of `DATABASE_REPLICAS`, and everything else to default.
+
+    Reads of the models of `DATABASE_REPLICA_MODELS`, and every read inside `read_from_replica`, go to a replica lagging
+    at most `DATABASE_REPLICA_MAX_LAG` seconds behind default. Once the request or thread writes, inside a transaction,
+    or within the sticky window of a write by the same client, reads go to default so they see the writes.
+    """
+
+    lags: dict[str, tuple[float, float]] = {}
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        """
+        Return a replica if the read may be stale, or default.
+
+        Params:
+            model (type[Model]): Model being read
+            hints (Any): Hints of the query
+        Returns:
+            Optional[str]: Alias of the database.
+        """
+        if not settings.DATABASE_REPLICAS:
+            return DEFAULT
+        state: ReplicaState = get_state()
+        if state.primary or state.written or connections[DEFAULT].in_atomic_block:
+            return DEFAULT
+        if not state.read_from_replica and model._meta.label not in settings.DATABASE_REPLICA_MODELS:
+            return DEFAULT
+        # The replica is kept for the whole request, so that its reads see the same point in time.
+        if state.replica is None or self.get_lag(state.replica) > settings.DATABASE_REPLICA_MAX_LAG:
+            replicas: list[str] = [
+                alias
+                for alias in settings.DATABASE_REPLICAS
+                if self.get_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+            ]
+            state.replica = random.choice(replicas) if replicas else None
+        return state.replica or DEFAULT
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> Optional[str]:
+        """
+        Return default, the only writable database, and send the next reads of the request there.
+
+        Params:
+            model (type[Model]): Model being written
+            hints (Any): Hints of the query
+        Returns:
+            Optional[str]: Alias of the database.
+        """
+        get_state().written = True
+        return DEFAULT
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        """
+        Allow relations between objects of any database, since they all hold the same rows.
+
+        Params:
+            obj1 (Model): First object
+            obj2 (Model): Second object
+            hints (Any): Hints of the relation
+        Returns:
+            Optional[bool]: True.
+        """
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> Optional[bool]:
+        """
+        Do not migrate the replicas, since they are copies of default.
+
+        Params:
+            db (str): Alias of the database
+            app_label (str): Label of the app of the migration
+            model_name (Optional[str]): Name of the migrated model
+            hints (Any): Hints of the migration
+        Returns:
+            Optional[bool]: False for replicas.
+        """
+        return db not in settings.DATABASE_REPLICAS
+
+    def get_lag(self, alias: str) -> float:
+        """
+        Return the replication lag of the given replica, measured at most every `DATABASE_REPLICA_LAG_CHECK_INTERVAL`.
+
+        The lag is only measured on PostgreSQL, and is infinite while the replica cannot be reached.
+
+        Params:
+            alias (str): Alias of the replica
+        Returns:
+            float: Seconds of writes of default not replayed by the replica yet.
+        """
+        now: float = time.monotonic()
+        checked: Optional[tuple[float, float]] = self.lags.get(alias)
+        if checked is not None and now - checked[0] < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+            return checked[1]
+        lag: float = 0
+        if connections[alias].vendor == "postgresql":
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute(LAG_QUERY)
+                    lag = float(cursor.fetchone()[0])
+            except DatabaseError:
+                logger.exception("Could not measure the replication lag of %s.", alias)
+                lag = float("inf")
+        self.lags[alias] = (now, lag)
+        return lag
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+
+class AsOfSerializer(serializers.Serializer):
+    """As of serializer, validating the point in time of point-in-time queries."""
+
+    as_of: serializers.DateTimeField = serializers.DateTimeField(required=False)
+
+
+class StockAsOfSerializer(serializers.Serializer):
+    """Stock as of serializer, the quantity of a product in a vending machine at a point in time."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField()
+    product: serializers.IntegerField = serializers.IntegerField()
+    quantity: serializers.IntegerField = serializers.IntegerField()
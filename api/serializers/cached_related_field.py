@@ -0,0 +1,35 @@
+from typing import Any
+
+from django.db.models import Model
+from rest_framework import serializers
+
+from api.services.cache_service import get_cached_instance
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key related field which reads the related instance through the API cache.
+
+    The cached instances are invalidated through the versioned namespace of their model, on every save or delete.
+    """
+
+    def to_internal_value(self, data: Any) -> Model:
+        """
+        Return the related instance of the given primary key.
+
+        Params:
+            data (Any): Primary key of the related instance
+        Returns:
+            Model: Related instance.
+        """
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        model: type[Model] = self.get_queryset().model
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            return get_cached_instance(model, data)
+        except model.DoesNotExist:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
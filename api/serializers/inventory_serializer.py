@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+
+class InventoryProductSerializer(serializers.Serializer):
+    """Inventory product serializer, a product stocked in a vending machine."""
+
+    product: serializers.IntegerField = serializers.IntegerField()
+    name: serializers.CharField = serializers.CharField()
+    cost: serializers.DecimalField = serializers.DecimalField(decimal_places=2, max_digits=10)
+    quantity: serializers.IntegerField = serializers.IntegerField()
+    value: serializers.DecimalField = serializers.DecimalField(decimal_places=2, max_digits=20)
+
+
+class InventorySerializer(serializers.Serializer):
+    """Inventory serializer, the stocked products of a vending machine."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField()
+    total_quantity: serializers.IntegerField = serializers.IntegerField()
+    total_value: serializers.DecimalField = serializers.DecimalField(decimal_places=2, max_digits=20)
+    products: InventoryProductSerializer = InventoryProductSerializer(many=True)
+
+
+class InventorySummarySerializer(serializers.Serializer):
+    """Inventory summary serializer, the stock totals of a vending machine."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField()
+    product_count: serializers.IntegerField = serializers.IntegerField()
+    total_quantity: serializers.IntegerField = serializers.IntegerField()
+    total_value: serializers.DecimalField = serializers.DecimalField(decimal_places=2, max_digits=20)
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from api.models.stock import Stock
+
+
+class LowStockSerializer(serializers.ModelSerializer):
+    """Low Stock serializer, a stock below its reorder level."""
+
+    class Meta:
+        model = Stock
+        fields: tuple[str, str, str, str, str] = ("id", "vending_machine", "product", "quantity", "reorder_level")
+
+
+class LowStockFilterSerializer(serializers.Serializer):
+    """Low Stock filter serializer, validating the query parameters of low stock queries."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField(required=False)
+    product: serializers.IntegerField = serializers.IntegerField(required=False)
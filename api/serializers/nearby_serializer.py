@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+
+class NearbyFilterSerializer(serializers.Serializer):
+    """Nearby filter serializer, validating the query parameters of nearby vending machine queries."""
+
+    lat: serializers.FloatField = serializers.FloatField(min_value=-90, max_value=90)
+    lon: serializers.FloatField = serializers.FloatField(min_value=-180, max_value=180)
+    product: serializers.IntegerField = serializers.IntegerField(required=False)
+    limit: serializers.IntegerField = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class NearbySerializer(serializers.Serializer):
+    """Nearby serializer, a vending machine with its distance in meters."""
+
+    id: serializers.IntegerField = serializers.IntegerField()
+    name: serializers.CharField = serializers.CharField()
+    location: serializers.CharField = serializers.CharField()
+    latitude: serializers.FloatField = serializers.FloatField()
+    longitude: serializers.FloatField = serializers.FloatField()
+    distance: serializers.FloatField = serializers.FloatField()
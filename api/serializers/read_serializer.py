@@ -0,0 +1,111 @@
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+IDENTITY_FIELDS: tuple[type[serializers.Field], ...] = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+ZERO: timedelta = timedelta(0)
+
+
+class ReadSerializer:
+    """
+    Read-only serializer of `.values()` rows, with the same output as the given model serializer.
+
+    Fields whose database value is already their representation are copied as is. Decimals and UTC datetimes
+    in the default formats are formatted directly, and everything else goes through the `to_representation`
+    of the model serializer field, so the rendered bytes stay the same.
+    """
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer]) -> None:
+        """
+        Keep the fields of the given model serializer.
+
+        Params:
+            serializer_class (type[serializers.ModelSerializer]): Model serializer to be matched
+        """
+        self.fields: dict[str, serializers.Field] = serializer_class().fields
+        self.sources: tuple[str, ...] = tuple(field.source for field in self.fields.values())
+
+    def serialize(self, rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Serialize the given rows.
+
+        Params:
+            rows (Iterable[dict[str, Any]]): Rows of `.values(*self.sources)`
+        Returns:
+            list[dict[str, Any]]: Representations of the rows.
+        """
+        converters: list[tuple[str, str, Optional[Callable[[Any], Any]]]] = [
+            (name, field.source, get_converter(field)) for name, field in self.fields.items()
+        ]
+        return [
+            {
+                name: row[source] if convert is None or row[source] is None else convert(row[source])
+                for name, source, convert in converters
+            }
+            for row in rows
+        ]
+
+
+def get_converter(field: serializers.Field) -> Optional[Callable[[Any], Any]]:
+    """
+    Return the function converting a database value of the given field into its representation.
+
+    It is built for every serialization, since datetimes depend on the current time zone.
+
+    Params:
+        field (serializers.Field): Field of the model serializer
+    Returns:
+        Optional[Callable[[Any], Any]]: Converter, or None if the value is its own representation.
+    """
+    if isinstance(field, IDENTITY_FIELDS):
+        return None
+    to_representation: Callable[[Any], Any] = field.to_representation
+    if (
+        isinstance(field, serializers.DecimalField)
+        and getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        and not field.localize
+        and not field.normalize_output
+    ):
+        exponent: int = -field.decimal_places
+
+        def convert_decimal(value: Any) -> Any:
+            if isinstance(value, Decimal) and value.as_tuple().exponent == exponent:
+                return f"{value:f}"
+            return to_representation(value)
+
+        return convert_decimal
+    if (
+        isinstance(field, serializers.DateTimeField)
+        and str(getattr(field, "format", api_settings.DATETIME_FORMAT)).lower() == ISO_8601
+        and str(getattr(field, "timezone", None) or field.default_timezone()) == "UTC"
+    ):
+
+        def convert_datetime(value: Any) -> Any:
+            if value.utcoffset() == ZERO:
+                return value.isoformat()[:-6] + "Z"
+            return to_representation(value)
+
+        return convert_datetime
+    return to_representation
+
+
+@lru_cache(maxsize=None)
+def get_read_serializer(serializer_class: type[serializers.ModelSerializer]) -> ReadSerializer:
+    """
+    Return the read serializer of the given model serializer, built once.
+
+    Params:
+        serializer_class (type[serializers.ModelSerializer]): Model serializer to be matched
+    Returns:
+        ReadSerializer: Read serializer.
+    """
+    return ReadSerializer(serializer_class)
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class ReplenishmentFilterSerializer(serializers.Serializer):
+    """Replenishment filter serializer, validating the query parameters of pick lists."""
+
+    target: serializers.IntegerField = serializers.IntegerField(min_value=1)
+    location: serializers.CharField = serializers.CharField(max_length=100, required=False)
@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+from api.models.stock import Stock
+
+
+class StockAdjustSerializer(serializers.Serializer):
+    """Stock adjust serializer, the number of items vended from or restocked into a stock."""
+
+    quantity: serializers.IntegerField = serializers.IntegerField(min_value=1, max_value=Stock.MAX_QUANTITY, default=1)
+
+
+class StockAdjustItemSerializer(serializers.Serializer):
+    """Stock adjust item serializer, a signed change of a stock quantity: negative to vend, positive to restock."""
+
+    id: serializers.IntegerField = serializers.IntegerField()
+    delta: serializers.IntegerField = serializers.IntegerField(
+        min_value=-Stock.MAX_QUANTITY, max_value=Stock.MAX_QUANTITY
+    )
+
+    def validate_delta(self, value: int) -> int:
+        """
+        Validate the delta is not zero.
+
+        Params:
+            value (int): Change of the quantity
+        Returns:
+            int: Validated change.
+        Raises:
+            serializers.ValidationError: If the change is zero.
+        """
+        if value == 0:
+            raise serializers.ValidationError("Ensure this value is not zero.")
+        return value
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from api.models.stock import Stock
+
+
+class StockBulkItemSerializer(serializers.Serializer):
+    """
+    Stock bulk item serializer.
+
+    Foreign keys are plain integers here, so validating an item never touches the database.
+    Their existence is checked for the whole batch at once by the bulk service.
+    """
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField()
+    product: serializers.IntegerField = serializers.IntegerField()
+    quantity: serializers.IntegerField = serializers.IntegerField(min_value=0, max_value=Stock.MAX_QUANTITY)
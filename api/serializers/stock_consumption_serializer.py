@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from api.services.stock_consumption_service import GROUPS, ORDERINGS, STOCK
+
+
+class StockConsumptionFilterSerializer(serializers.Serializer):
+    """Stock Consumption filter serializer, validating the query parameters of stock consumption queries."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField(required=False)
+    product: serializers.IntegerField = serializers.IntegerField(required=False)
+    since: serializers.DateField = serializers.DateField(required=False)
+    until: serializers.DateField = serializers.DateField(required=False)
+    group: serializers.ChoiceField = serializers.ChoiceField(choices=GROUPS, default=STOCK)
+    ordering: serializers.ChoiceField = serializers.ChoiceField(choices=list(ORDERINGS), default="-sold")
+    limit: serializers.IntegerField = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+
+
+class StockConsumptionSerializer(serializers.Serializer):
+    """Stock Consumption serializer, the units sold and restocked of a product in a vending machine or the fleet."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField(allow_null=True)
+    product: serializers.IntegerField = serializers.IntegerField()
+    quantity: serializers.IntegerField = serializers.IntegerField()
+    sold: serializers.IntegerField = serializers.IntegerField()
+    restocked: serializers.IntegerField = serializers.IntegerField()
+    sell_through: serializers.FloatField = serializers.FloatField()
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class StockFeedFilterSerializer(serializers.Serializer):
+    """Stock feed filter serializer, validating the query parameters of the stock feed."""
+
+    vending_machine: serializers.ListField = serializers.ListField(child=serializers.IntegerField(), required=False)
+    last_id: serializers.IntegerField = serializers.IntegerField(min_value=0, required=False)
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+
+class StockForecastFilterSerializer(serializers.Serializer):
+    """Stock Forecast filter serializer, validating the query parameters of stock forecast queries."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField(required=False)
+    product: serializers.IntegerField = serializers.IntegerField(required=False)
+    within_days: serializers.FloatField = serializers.FloatField(min_value=0, required=False)
+    limit: serializers.IntegerField = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+
+
+class StockForecastSerializer(serializers.Serializer):
+    """Stock Forecast serializer, a stock with its consumption rate and the time until it is empty."""
+
+    id: serializers.IntegerField = serializers.IntegerField()
+    vending_machine: serializers.IntegerField = serializers.IntegerField()
+    product: serializers.IntegerField = serializers.IntegerField()
+    quantity: serializers.IntegerField = serializers.IntegerField()
+    rate: serializers.FloatField = serializers.FloatField()
+    days_until_empty: serializers.FloatField = serializers.FloatField()
+    empty_at: serializers.DateTimeField = serializers.DateTimeField()
@@ -1,11 +1,17 @@
 from rest_framework import serializers
 
+from api.models.product import Product
 from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.serializers.cached_related_field import CachedPrimaryKeyRelatedField
 
 
 class StockSerializer(serializers.ModelSerializer):
     """Stock serializer."""
 
+    vending_machine: CachedPrimaryKeyRelatedField = CachedPrimaryKeyRelatedField(queryset=VendingMachine.objects.all())
+    product: CachedPrimaryKeyRelatedField = CachedPrimaryKeyRelatedField(queryset=Product.objects.all())
+
     class Meta:
         model = Stock
         fields: tuple[str, str, str, str] = (
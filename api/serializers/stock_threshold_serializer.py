@@ -0,0 +1,37 @@
+from typing import Any
+
+from rest_framework import serializers
+
+from api.models.stock_threshold import StockThreshold
+
+
+class StockThresholdSerializer(serializers.ModelSerializer):
+    """Stock Threshold serializer."""
+
+    class Meta:
+        model = StockThreshold
+        fields: tuple[str, str, str, str] = ("id", "vending_machine", "product", "reorder_level")
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """
+        Validate that the product has no other threshold for all vending machines.
+
+        Params:
+            attrs (dict[str, Any]): Validated fields
+        Returns:
+            dict[str, Any]: Same fields.
+        Raises:
+            ValidationError: The product already has a threshold for all vending machines.
+        """
+        attrs = super().validate(attrs)
+        vending_machine: Any = attrs.get("vending_machine", getattr(self.instance, "vending_machine", None))
+        product: Any = attrs.get("product", getattr(self.instance, "product", None))
+        if vending_machine is None and product is not None:
+            thresholds: Any = StockThreshold.objects.filter(vending_machine__isnull=True, product=product)
+            if self.instance is not None:
+                thresholds = thresholds.exclude(pk=self.instance.pk)
+            if thresholds.exists():
+                raise serializers.ValidationError(
+                    {"non_field_errors": ["The fields vending_machine, product must make a unique set."]}
+                )
+        return attrs
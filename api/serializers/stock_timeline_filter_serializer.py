@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+
+class StockTimelineFilterSerializer(serializers.Serializer):
+    """Stock Timeline filter serializer, validating the query parameters of stock timeline queries."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField(required=False)
+    product: serializers.IntegerField = serializers.IntegerField(required=False)
+    since: serializers.DateTimeField = serializers.DateTimeField(required=False)
+    until: serializers.DateTimeField = serializers.DateTimeField(required=False)
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from api.models.stock_timeline_rollup import StockTimelineRollup
+from api.serializers.stock_timeline_filter_serializer import StockTimelineFilterSerializer
+
+
+class StockTimelineSeriesFilterSerializer(StockTimelineFilterSerializer):
+    """Stock Timeline series filter serializer, adding the bucket interval to the stock timeline filters."""
+
+    interval: serializers.ChoiceField = serializers.ChoiceField(
+        choices=StockTimelineRollup.INTERVALS, default=StockTimelineRollup.HOUR
+    )
+
+
+class StockTimelineSeriesSerializer(serializers.Serializer):
+    """Stock Timeline series serializer, the aggregated stock timelines of a product in a vending machine."""
+
+    vending_machine: serializers.IntegerField = serializers.IntegerField()
+    product: serializers.IntegerField = serializers.IntegerField()
+    bucket: serializers.DateTimeField = serializers.DateTimeField()
+    last: serializers.IntegerField = serializers.IntegerField()
+    min: serializers.IntegerField = serializers.IntegerField()
+    max: serializers.IntegerField = serializers.IntegerField()
+    changes: serializers.IntegerField = serializers.IntegerField()
@@ -1,3 +1,5 @@
+from typing import Any
+
 from rest_framework import serializers
 
 from api.models.vending_machine import VendingMachine
@@ -8,4 +10,24 @@ class VendingMachineSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = VendingMachine
-        fields: tuple[str, str, str, str] = ("id", "name", "location", "is_active")
+        fields: tuple[str, ...] = ("id", "name", "location", "is_active", "latitude", "longitude")
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """
+        Validate that the latitude and longitude are either both set or both null.
+
+        Params:
+            attrs (dict[str, Any]): Validated fields
+        Returns:
+            dict[str, Any]: Same fields.
+        Raises:
+            ValidationError: Only one of the coordinates is set.
+        """
+        attrs = super().validate(attrs)
+        latitude: Any = attrs.get("latitude", getattr(self.instance, "latitude", None))
+        longitude: Any = attrs.get("longitude", getattr(self.instance, "longitude", None))
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                {"non_field_errors": ["The fields latitude, longitude must be both set or both null."]}
+            )
+        return attrs
@@ -0,0 +1,241 @@
+import json
+import math
+import time
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from api.middleware.metrics_middleware import RequestTimings
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.stock_threshold import StockThreshold
+from api.models.stock_timeline import StockTimeline
+from api.models.vending_machine import VendingMachine
+
+PERCENTILES: tuple[int, ...] = (50, 90, 95, 99)
+
+
+def get_endpoints() -> list[dict[str, Any]]:
+    """
+    Return one request per endpoint of `api/urls.py`, on the first seeded rows, except the stock feed which never ends.
+
+    Reads are filtered to one vending machine where the full table would be returned. The bulk stock request rewrites
+    the quantities of existing stocks, and the stock is restocked before it is vended by as many items.
+
+    Returns:
+        list[dict[str, Any]]: Name, method, path and body of every request.
+    """
+    vending_machine_id: int = VendingMachine.objects.order_by("id").values_list("id", flat=True).first()
+    product_id: int = Product.objects.order_by("id").values_list("id", flat=True).first()
+    stock_id: int = Stock.objects.order_by("id").values_list("id", flat=True).first()
+    stock_timeline_id: int = StockTimeline.objects.order_by("id").values_list("id", flat=True).first()
+    location: str = VendingMachine.objects.order_by("id").values_list("location", flat=True).first()
+    stock_threshold_id: int = StockThreshold.objects.order_by("id").values_list("id", flat=True).first()
+    as_of: str = urlencode({"as_of": timezone.now().isoformat()})
+    stocks: list[dict[str, Any]] = list(
+        Stock.objects.order_by("id").values("id", "vending_machine", "product", "quantity")[:100]
+    )
+    return [
+        {"name": "vendingmachine-list", "path": reverse("vendingmachine-list")},
+        {"name": "vendingmachine-detail", "path": reverse("vendingmachine-detail", args=[vending_machine_id])},
+        {"name": "vendingmachine-inventory", "path": reverse("vendingmachine-inventory", args=[vending_machine_id])},
+        {
+            "name": "vendingmachine-inventory-as-of",
+            "path": f"{reverse('vendingmachine-inventory', args=[vending_machine_id])}?{as_of}",
+        },
+        {"name": "vendingmachine-fleet-inventory", "path": reverse("vendingmachine-fleet-inventory")},
+        {"name": "vendingmachine-inventory-summary", "path": reverse("vendingmachine-inventory-summary")},
+        {
+            "name": "vendingmachine-nearby",
+            "path": f"{reverse('vendingmachine-nearby')}?{urlencode({'lat': 0, 'lon': 0, 'product': product_id})}",
+        },
+        {"name": "product-list", "path": reverse("product-list")},
+        {"name": "product-detail", "path": reverse("product-detail", args=[product_id])},
+        {"name": "product-availability", "path": reverse("product-availability", args=[product_id])},
+        {"name": "stock-list", "path": reverse("stock-list")},
+        {"name": "stock-list-as-of", "path": f"{reverse('stock-list')}?{as_of}"},
+        {"name": "stock-detail", "path": reverse("stock-detail", args=[stock_id])},
+        {"name": "stock-bulk", "method": "post", "path": reverse("stock-bulk"), "data": stocks},
+        {
+            "name": "stock-restock",
+            "method": "post",
+            "path": reverse("stock-restock", args=[stock_id]),
+            "data": {"quantity": 1},
+        },
+        {
+            "name": "stock-vend",
+            "method": "post",
+            "path": reverse("stock-vend", args=[stock_id]),
+            "data": {"quantity": 1},
+        },
+        {
+            "name": "stock-adjust",
+            "method": "post",
+            "path": reverse("stock-adjust"),
+            "data": [{"id": stock["id"], "delta": delta} for stock in stocks for delta in (1, -1)],
+        },
+        {"name": "stock-low", "path": reverse("stock-low")},
+        {"name": "stock-forecast", "path": reverse("stock-forecast")},
+        {
+            "name": "stock-replenishment",
+            "path": f"{reverse('stock-replenishment')}?{urlencode({'target': 50, 'location': location})}",
+        },
+        {"name": "stockthreshold-list", "path": reverse("stockthreshold-list")},
+        {"name": "stockthreshold-detail", "path": reverse("stockthreshold-detail", args=[stock_threshold_id])},
+        {"name": "stocktimeline-list", "path": reverse("stocktimeline-list")},
+        {
+            "name": "stocktimeline-list-vending-machine",
+            "path": f"{reverse('stocktimeline-list')}?vending_machine={vending_machine_id}",
+        },
+        {"name": "stocktimeline-detail", "path": reverse("stocktimeline-detail", args=[stock_timeline_id])},
+        {
+            "name": "stocktimeline-export",
+            "path": f"{reverse('stocktimeline-export')}?vending_machine={vending_machine_id}",
+        },
+        {
+            "name": "stocktimeline-series",
+            "path": f"{reverse('stocktimeline-series')}?vending_machine={vending_machine_id}&interval=day",
+        },
+        {
+            "name": "stocktimeline-consumption",
+            "path": f"{reverse('stocktimeline-consumption')}?group=product",
+        },
+        {"name": "cache-stats", "path": reverse("cache-stats")},
+        {"name": "metrics", "path": reverse("metrics")},
+        {"name": "async-stock-list", "path": reverse("async-stock-list")},
+        {
+            "name": "async-stocktimeline-list",
+            "path": f"{reverse('async-stocktimeline-list')}?vending_machine={vending_machine_id}",
+        },
+        {
+            "name": "async-vendingmachine-inventory",
+            "path": reverse("async-vendingmachine-inventory", args=[vending_machine_id]),
+        },
+        {"name": "async-vendingmachine-fleet-inventory", "path": reverse("async-vendingmachine-fleet-inventory")},
+    ]
+
+
+def run_benchmark(
+    endpoints: list[dict[str, Any]], requests: int, warmup: int, client: Optional[Client] = None
+) -> list[dict[str, Any]]:
+    """
+    Measure the latency and the queries of every given endpoint.
+
+    Every endpoint is called `warmup` times without measuring, then `requests` times. Streaming responses are read
+    to the end, so the latency covers the whole body.
+
+    Params:
+        endpoints (list[dict[str, Any]]): Requests returned by `get_endpoints`
+        requests (int): Number of measured requests per endpoint
+        warmup (int): Number of requests per endpoint before measuring
+        client (Optional[Client]): Client sending the requests
+    Returns:
+        list[dict[str, Any]]: Latency percentiles in milliseconds, queries and response size per endpoint.
+    Raises:
+        ValueError: If an endpoint does not respond with a success status.
+    """
+    client = client or Client()
+    results: list[dict[str, Any]] = []
+    for endpoint in endpoints:
+        latencies: list[float] = []
+        queries: list[int] = []
+        size: int = 0
+        for index in range(warmup + requests):
+            timings: RequestTimings = RequestTimings()
+            with connection.execute_wrapper(timings):
+                size = send_request(client, endpoint)
+            if index >= warmup:
+                latencies.append((time.perf_counter() - timings.start) * 1000)
+                queries.append(timings.queries)
+        results.append(
+            {
+                "name": endpoint["name"],
+                "method": endpoint.get("method", "get").upper(),
+                "path": endpoint["path"],
+                "requests": requests,
+                "latency_ms": summarize(latencies),
+                "queries": summarize(queries),
+                "bytes": size,
+            }
+        )
+    return results
+
+
+def send_request(client: Client, endpoint: dict[str, Any]) -> int:
+    """
+    Send the request of the given endpoint and read its body.
+
+    Params:
+        client (Client): Client sending the request
+        endpoint (dict[str, Any]): Request returned by `get_endpoints`
+    Returns:
+        int: Size of the response body.
+    Raises:
+        ValueError: If the endpoint does not respond with a success status.
+    """
+    method: str = endpoint.get("method", "get")
+    if "data" in endpoint:
+        response: Any = getattr(client, method)(
+            endpoint["path"], data=json.dumps(endpoint["data"]), content_type="application/json"
+        )
+    else:
+        response = getattr(client, method)(endpoint["path"])
+    if response.status_code >= 400:
+        raise ValueError(f"{method.upper()} {endpoint['path']} responded with {response.status_code}.")
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """
+    Summarize the given measurements.
+
+    Params:
+        values (list[float]): Measurements
+    Returns:
+        dict[str, float]: Minimum, mean, maximum and nearest-rank percentiles.
+    """
+    ordered: list[float] = sorted(values)
+    summary: dict[str, float] = {
+        "min": round(ordered[0], 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "max": round(ordered[-1], 3),
+    }
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}"] = round(ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)], 3)
+    return summary
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Compare the results of two benchmark runs, matched by endpoint name.
+
+    Params:
+        baseline (dict[str, Any]): Results of the previous run
+        current (dict[str, Any]): Results of this run
+    Returns:
+        list[dict[str, Any]]: p50 and p95 latencies, mean queries and the p50 ratio per endpoint of both runs.
+    """
+    previous: dict[str, dict[str, Any]] = {result["name"]: result for result in baseline["results"]}
+    comparisons: list[dict[str, Any]] = []
+    for result in current["results"]:
+        before: Optional[dict[str, Any]] = previous.get(result["name"])
+        if before is None:
+            continue
+        comparisons.append(
+            {
+                "name": result["name"],
+                "p50_ms": (before["latency_ms"]["p50"], result["latency_ms"]["p50"]),
+                "p95_ms": (before["latency_ms"]["p95"], result["latency_ms"]["p95"]),
+                "queries": (before["queries"]["mean"], result["queries"]["mean"]),
+                "ratio": result["latency_ms"]["p50"] / before["latency_ms"]["p50"]
+                if before["latency_ms"]["p50"]
+                else 0,
+            }
+        )
+    return comparisons
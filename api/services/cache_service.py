@@ -0,0 +1,148 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db.models import Model
+
+
+class CacheStats:
+    """Hit and miss counters of the API cache per namespace, for this process."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.lock: threading.Lock = threading.Lock()
+        self.counters: dict[str, dict[str, int]] = {}
+
+    def record(self, namespace: str, hit: bool) -> None:
+        """
+        Count a hit or a miss of the given namespace.
+
+        Params:
+            namespace (str): Namespace of the cache key
+            hit (bool): Whether the key was found
+        """
+        with self.lock:
+            counter: dict[str, int] = self.counters.setdefault(namespace, {"hits": 0, "misses": 0})
+            counter["hits" if hit else "misses"] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """
+        Return a copy of the counters.
+
+        Returns:
+            dict[str, dict[str, int]]: Hits and misses per namespace.
+        """
+        with self.lock:
+            return {namespace: dict(counter) for namespace, counter in self.counters.items()}
+
+    def reset(self) -> None:
+        """Reset the counters."""
+        with self.lock:
+            self.counters.clear()
+
+
+cache_stats: CacheStats = CacheStats()
+
+
+def get_cache() -> BaseCache:
+    """
+    Return the cache of the API.
+
+    Returns:
+        BaseCache: Cache configured by `API_CACHE_ALIAS`.
+    """
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_namespace(model: type[Model]) -> str:
+    """
+    Return the cache namespace of the given model.
+
+    Params:
+        model (type[Model]): Model class
+    Returns:
+        str: Namespace, e.g. `product`.
+    """
+    return model._meta.model_name
+
+
+def get_version(namespace: str) -> int:
+    """
+    Return the current version of the given namespace, which is part of every key in it.
+
+    The first version is time based, so that keys of a flushed cache are never reused.
+
+    Params:
+        namespace (str): Namespace of the cache keys
+    Returns:
+        int: Version of the namespace.
+    """
+    cache: BaseCache = get_cache()
+    key: str = f"api:{namespace}:version"
+    version: Optional[int] = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def invalidate(namespace: str) -> None:
+    """
+    Invalidate every key of the given namespace by moving to a new version.
+
+    Params:
+        namespace (str): Namespace of the cache keys
+    """
+    cache: BaseCache = get_cache()
+    key: str = f"api:{namespace}:version"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_or_set(namespace: str, name: str, default: Callable[[], Any]) -> Any:
+    """
+    Return the cached value of the given name, or compute and cache it.
+
+    Params:
+        namespace (str): Namespace of the cache key
+        name (str): Name of the value in the namespace
+        default (Callable[[], Any]): Function computing the value on a miss
+    Returns:
+        Any: Cached or computed value.
+    """
+    if not settings.API_CACHE_ENABLED:
+        return default()
+    cache: BaseCache = get_cache()
+    key: str = f"api:{namespace}:{get_version(namespace)}:{name}"
+    value: Any = cache.get(key)
+    cache_stats.record(namespace, value is not None)
+    if value is None:
+        value = default()
+        cache.set(key, value, timeout=settings.API_CACHE_TIMEOUT)
+    return value
+
+
+def get_cached_instance(model: type[Model], pk: Any) -> Model:
+    """
+    Return the instance of the given model and primary key, read through the cache.
+
+    Params:
+        model (type[Model]): Model class
+        pk (Any): Primary key of the instance
+    Returns:
+        Model: Instance of the model.
+    Raises:
+        model.DoesNotExist: If the instance does not exist.
+    """
+    instance: Optional[Model] = get_or_set(
+        get_namespace(model), f"instance:{pk}", lambda: model.objects.filter(pk=pk).first() or False
+    )
+    if not instance:
+        raise model.DoesNotExist(f"{model.__name__} matching query does not exist.")
+    return instance
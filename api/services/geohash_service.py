@@ -0,0 +1,126 @@
+import math
+from typing import Optional
+
+BASE32: str = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION: int = 12
+EARTH_RADIUS: float = 6371008.8
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Return the geohash of the given coordinates.
+
+    Params:
+        latitude (float): Latitude in degrees, between -90 and 90
+        longitude (float): Longitude in degrees, between -180 and 180
+        precision (int): Number of characters of the geohash
+    Returns:
+        str: Geohash, whose prefixes are the geohashes of the same coordinates at lower precisions.
+    """
+    ranges: list[list[float]] = [[-180.0, 180.0], [-90.0, 90.0]]
+    values: tuple[float, float] = (longitude, latitude)
+    geohash: list[str] = []
+    bit: int = 0
+    for _ in range(precision):
+        index: int = 0
+        for _ in range(5):
+            low, high = ranges[bit % 2]
+            middle: float = (low + high) / 2
+            index <<= 1
+            if values[bit % 2] >= middle:
+                index |= 1
+                ranges[bit % 2][0] = middle
+            else:
+                ranges[bit % 2][1] = middle
+            bit += 1
+        geohash.append(BASE32[index])
+    return "".join(geohash)
+
+
+def get_cell_size(precision: int) -> tuple[float, float]:
+    """
+    Return the height and width in degrees of the geohash cells of the given precision.
+
+    Params:
+        precision (int): Number of characters of the geohashes
+    Returns:
+        tuple[float, float]: Height and width in degrees.
+    """
+    return 180 / 2 ** (5 * precision // 2), 360 / 2 ** ((5 * precision + 1) // 2)
+
+
+def get_neighbors(latitude: float, longitude: float, precision: int) -> set[str]:
+    """
+    Return the geohash cell of the given coordinates and its 8 neighbors.
+
+    Params:
+        latitude (float): Latitude in degrees
+        longitude (float): Longitude in degrees
+        precision (int): Number of characters of the geohashes
+    Returns:
+        set[str]: Geohashes of the cells, fewer than 9 next to a pole.
+    """
+    height, width = get_cell_size(precision)
+    return {
+        encode(
+            min(max(latitude + row * height, -90.0), 90.0),
+            (longitude + column * width + 180) % 360 - 180,
+            precision,
+        )
+        for row in (-1, 0, 1)
+        for column in (-1, 0, 1)
+    }
+
+
+def get_next_cell(geohash: str) -> Optional[str]:
+    """
+    Return the first geohash after every geohash starting with the given one, to read them as a range of an index.
+
+    Params:
+        geohash (str): Geohash prefix
+    Returns:
+        Optional[str]: Upper bound of the range, or None if it is unbounded.
+    """
+    geohash = geohash.rstrip(BASE32[-1])
+    if not geohash:
+        return None
+    return geohash[:-1] + BASE32[BASE32.index(geohash[-1]) + 1]
+
+
+def get_radius(latitude: float, precision: int) -> float:
+    """
+    Return the distance in meters within which every point is in the neighbors of the cell of the given latitude.
+
+    Params:
+        latitude (float): Latitude in degrees
+        precision (int): Number of characters of the geohashes
+    Returns:
+        float: Distance in meters, 0 when the neighbors reach a pole and miss the cells beyond it.
+    """
+    height, width = get_cell_size(precision)
+    if abs(latitude) + height >= 90:
+        return 0.0
+    return min(
+        EARTH_RADIUS * math.radians(height),
+        EARTH_RADIUS * math.asin(math.cos(math.radians(latitude)) * math.sin(math.radians(width))),
+    )
+
+
+def get_distance(latitude: float, longitude: float, other_latitude: float, other_longitude: float) -> float:
+    """
+    Return the great-circle distance in meters between the given coordinates.
+
+    Params:
+        latitude (float): Latitude of the first point in degrees
+        longitude (float): Longitude of the first point in degrees
+        other_latitude (float): Latitude of the second point in degrees
+        other_longitude (float): Longitude of the second point in degrees
+    Returns:
+        float: Haversine distance in meters.
+    """
+    phi, other_phi = math.radians(latitude), math.radians(other_latitude)
+    haversine: float = (
+        math.sin((other_phi - phi) / 2) ** 2
+        + math.cos(phi) * math.cos(other_phi) * math.sin(math.radians(other_longitude - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(haversine, 1.0)))
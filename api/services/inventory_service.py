@@ -0,0 +1,144 @@
+from datetime import datetime
+from decimal import Decimal
+from itertools import groupby
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+
+from api.models.inventory_summary import InventorySummary
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.services.stock_history_service import get_stocks_as_of
+
+
+def get_inventories(stocks: QuerySet) -> list[dict[str, Any]]:
+    """
+    Return the inventory of every vending machine of the given stocks, with one query joining the products.
+
+    Params:
+        stocks (QuerySet): Stocks to be grouped by vending machine
+    Returns:
+        list[dict[str, Any]]: Inventories with the stocked products and their totals, ordered by vending machine.
+    """
+    return _group_inventories(_get_inventory_rows(stocks))
+
+
+async def aget_inventories(stocks: QuerySet) -> list[dict[str, Any]]:
+    """
+    Return the inventory of every vending machine of the given stocks, read with the async ORM.
+
+    Params:
+        stocks (QuerySet): Stocks to be grouped by vending machine
+    Returns:
+        list[dict[str, Any]]: Inventories with the stocked products and their totals, ordered by vending machine.
+    """
+    return _group_inventories([row async for row in _get_inventory_rows(stocks)])
+
+
+def _get_inventory_rows(stocks: QuerySet) -> QuerySet:
+    """
+    Return the rows of the given stocks joined with their product, ordered by vending machine.
+
+    Params:
+        stocks (QuerySet): Stocks to be read
+    Returns:
+        QuerySet: Rows of vending machine id, product id, product name, product cost and quantity.
+    """
+    return stocks.order_by("vending_machine_id", "product_id").values_list(
+        "vending_machine_id", "product_id", "product__name", "product__cost", "quantity"
+    )
+
+
+def get_inventories_as_of(as_of: datetime, vending_machine_id: Optional[int] = None) -> list[dict[str, Any]]:
+    """
+    Return the inventory of every vending machine at the given time, reconstructed from the stock timelines.
+
+    Products are shown with their current name and cost.
+
+    Params:
+        as_of (datetime): Point in time
+        vending_machine_id (Optional[int]): Id of the only vending machine to be returned
+    Returns:
+        list[dict[str, Any]]: Inventories with the stocked products and their totals, ordered by vending machine.
+    """
+    stocks: dict[tuple[int, int], int] = get_stocks_as_of(as_of, vending_machine_id)
+    products: dict[int, tuple[str, Decimal]] = {
+        product_id: (name, cost)
+        for product_id, name, cost in Product.objects.filter(id__in={key[1] for key in stocks}).values_list(
+            "id", "name", "cost"
+        )
+    }
+    rows: list[tuple[int, int, str, Decimal, int]] = [
+        (stock_vending_machine_id, product_id, *products[product_id], stocks[(stock_vending_machine_id, product_id)])
+        for stock_vending_machine_id, product_id in sorted(stocks)
+        if product_id in products
+    ]
+    return _group_inventories(rows)
+
+
+def get_inventory(vending_machine: VendingMachine, as_of: Optional[datetime] = None) -> dict[str, Any]:
+    """
+    Return the inventory of the given vending machine, now or at the given time.
+
+    Params:
+        vending_machine (VendingMachine): Vending machine of the inventory
+        as_of (Optional[datetime]): Point in time, now by default
+    Returns:
+        dict[str, Any]: Inventory with the stocked products and their totals.
+    """
+    inventories: list[dict[str, Any]] = (
+        get_inventories(Stock.objects.filter(vending_machine=vending_machine))
+        if as_of is None
+        else get_inventories_as_of(as_of, vending_machine.id)
+    )
+    if inventories:
+        return inventories[0]
+    return {"vending_machine": vending_machine.id, "total_quantity": 0, "total_value": Decimal(0), "products": []}
+
+
+def _group_inventories(rows: Iterable[tuple[int, int, str, Decimal, int]]) -> list[dict[str, Any]]:
+    """
+    Group the given stock rows into inventories.
+
+    Params:
+        rows (Iterable[tuple[int, int, str, Decimal, int]]): Rows of vending machine id, product id, product name,
+            product cost and quantity, ordered by vending machine
+    Returns:
+        list[dict[str, Any]]: Inventories with the stocked products and their totals.
+    """
+    inventories: list[dict[str, Any]] = []
+    for vending_machine_id, vending_machine_rows in groupby(rows, key=lambda row: row[0]):
+        products: list[dict[str, Any]] = [
+            {"product": product_id, "name": name, "cost": cost, "quantity": quantity, "value": quantity * cost}
+            for _, product_id, name, cost, quantity in vending_machine_rows
+        ]
+        inventories.append(
+            {
+                "vending_machine": vending_machine_id,
+                "total_quantity": sum(product["quantity"] for product in products),
+                "total_value": sum((product["value"] for product in products), Decimal(0)),
+                "products": products,
+            }
+        )
+    return inventories
+
+
+def get_inventory_summaries() -> QuerySet:
+    """
+    Return the stock totals of every vending machine.
+
+    They are read from the inventory summary table when it is enabled, in O(vending machines),
+    and aggregated from the stocks otherwise.
+
+    Returns:
+        QuerySet: Rows of vending machine, product count, total quantity and total value.
+    """
+    if settings.INVENTORY_SUMMARY_ENABLED:
+        return InventorySummary.objects.order_by("vending_machine").values(
+            "vending_machine", "product_count", "total_quantity", "total_value"
+        )
+    return InventorySummary.aggregate(VendingMachine.objects.order_by("id")).values(
+        "product_count", "total_quantity", "total_value", vending_machine=F("id")
+    )
@@ -0,0 +1,122 @@
+import bisect
+import threading
+from typing import Optional
+
+DURATION_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+HISTOGRAMS: dict[str, tuple[str, tuple[float, ...]]] = {
+    "api_request_duration_seconds": ("Time spent handling the request.", DURATION_BUCKETS),
+    "api_view_duration_seconds": ("Time spent in the view, including its database queries.", DURATION_BUCKETS),
+    "api_serialize_duration_seconds": ("Time spent rendering the response body.", DURATION_BUCKETS),
+    "api_db_duration_seconds": ("Time spent executing SQL queries.", DURATION_BUCKETS),
+    "api_db_queries": ("Number of SQL queries.", QUERY_BUCKETS),
+}
+
+
+class Histogram:
+    """Cumulative histogram of observations, in the Prometheus layout."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """
+        Initialize the counters of the given buckets.
+
+        Params:
+            buckets (tuple[float, ...]): Sorted upper bounds of the buckets, without +Inf
+        """
+        self.buckets: tuple[float, ...] = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Count the given observation.
+
+        Params:
+            value (float): Observed value
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        """
+        Return the number of observations less than or equal to every bucket.
+
+        Returns:
+            list[int]: Cumulative counts, the last one for +Inf.
+        """
+        counts: list[int] = []
+        total: int = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class RequestMetrics:
+    """Histograms of the sampled requests per route and method, for this process."""
+
+    def __init__(self) -> None:
+        """Initialize the histograms."""
+        self.lock: threading.Lock = threading.Lock()
+        self.histograms: dict[tuple[str, str, str], Histogram] = {}
+
+    def record(self, route: str, method: str, values: dict[str, float]) -> None:
+        """
+        Observe the given values of a request.
+
+        Params:
+            route (str): Name of the route
+            method (str): HTTP method
+            values (dict[str, float]): Observed value per histogram name
+        """
+        with self.lock:
+            for name, value in values.items():
+                histogram: Optional[Histogram] = self.histograms.get((name, route, method))
+                if histogram is None:
+                    histogram = self.histograms[(name, route, method)] = Histogram(HISTOGRAMS[name][1])
+                histogram.observe(value)
+
+    def render(self) -> str:
+        """
+        Return the histograms in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition of every histogram.
+        """
+        lines: list[str] = []
+        with self.lock:
+            for name, (description, _) in HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (histogram_name, route, method), histogram in sorted(self.histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    labels: str = f'route="{_escape(route)}",method="{method}"'
+                    bounds: list[str] = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.cumulative_counts()):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:g}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Reset the histograms."""
+        with self.lock:
+            self.histograms.clear()
+
+
+def _escape(value: str) -> str:
+    """
+    Escape the given label value.
+
+    Params:
+        value (str): Label value
+    Returns:
+        str: Value with backslashes, quotes and newlines escaped.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_metrics: RequestMetrics = RequestMetrics()
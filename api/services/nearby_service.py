@@ -0,0 +1,88 @@
+from functools import reduce
+from operator import or_
+from typing import Any, Optional
+
+from django.db.models import Exists, OuterRef, Q, QuerySet
+
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.services.geohash_service import get_distance, get_neighbors, get_next_cell, get_radius
+
+NEARBY_PRECISION: int = 6
+
+
+def get_nearby_vending_machines(
+    latitude: float, longitude: float, limit: int, product_id: Optional[int] = None
+) -> list[dict[str, Any]]:
+    """
+    Return the nearest active vending machines to the given coordinates, with the given product in stock if any.
+
+    The vending machines of the geohash cell of the coordinates and of its 8 neighbors are read as ranges of the
+    geohash index, starting from cells of `NEARBY_PRECISION` characters. Every vending machine outside of them is
+    farther than the smallest cell size, so once enough vending machines are within it they are the nearest ones.
+    Otherwise the cells are one character shorter, until the whole fleet is read.
+
+    Params:
+        latitude (float): Latitude in degrees
+        longitude (float): Longitude in degrees
+        limit (int): Number of vending machines
+        product_id (Optional[int]): Id of a product the vending machines must have in stock, none by default
+    Returns:
+        list[dict[str, Any]]: Vending machines with their distance in meters, the nearest first.
+    """
+    vending_machines: QuerySet = VendingMachine.objects.filter(is_active=True, geohash__isnull=False)
+    if product_id is not None:
+        vending_machines = vending_machines.filter(
+            Exists(Stock.objects.filter(vending_machine_id=OuterRef("id"), product_id=product_id, quantity__gt=0))
+        )
+    for precision in range(NEARBY_PRECISION, 0, -1):
+        nearby: list[dict[str, Any]] = _get_nearest(
+            vending_machines.filter(
+                reduce(or_, (_get_cell_filter(cell) for cell in get_neighbors(latitude, longitude, precision)))
+            ),
+            latitude,
+            longitude,
+            limit,
+        )
+        if len(nearby) == limit and nearby[-1]["distance"] <= get_radius(latitude, precision):
+            return nearby
+    return _get_nearest(vending_machines, latitude, longitude, limit)
+
+
+def _get_nearest(vending_machines: QuerySet, latitude: float, longitude: float, limit: int) -> list[dict[str, Any]]:
+    """
+    Return the nearest of the given vending machines to the given coordinates.
+
+    Params:
+        vending_machines (QuerySet): Candidate vending machines
+        latitude (float): Latitude in degrees
+        longitude (float): Longitude in degrees
+        limit (int): Number of vending machines
+    Returns:
+        list[dict[str, Any]]: Vending machines with their distance in meters, the nearest first.
+    """
+    return sorted(
+        (
+            {
+                **vending_machine,
+                "distance": get_distance(
+                    latitude, longitude, vending_machine["latitude"], vending_machine["longitude"]
+                ),
+            }
+            for vending_machine in vending_machines.values("id", "name", "location", "latitude", "longitude")
+        ),
+        key=lambda vending_machine: (vending_machine["distance"], vending_machine["id"]),
+    )[:limit]
+
+
+def _get_cell_filter(cell: str) -> Q:
+    """
+    Return the filter of the vending machines in the given geohash cell, a range of the geohash index.
+
+    Params:
+        cell (str): Geohash of the cell
+    Returns:
+        Q: Filter of the geohashes starting with the cell.
+    """
+    next_cell: Optional[str] = get_next_cell(cell)
+    return Q(geohash__gte=cell, geohash__lt=next_cell) if next_cell is not None else Q(geohash__gte=cell)
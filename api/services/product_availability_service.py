@@ -0,0 +1,157 @@
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.services.stock_feed_service import StockFeedSubscription, get_stock_feed
+
+
+class AvailabilityBitmaps:
+    """
+    Availability bitmaps of the products for this process.
+
+    Bit `i` of the bitmap of a product is set when vending machine `i` is active and has the product in stock. The
+    bitmap of a product is loaded from the database on its first read, then updated from the stock feed, which this
+    process subscribes to before loading anything so that no change committed in between is missed. Every bitmap is
+    dropped when the feed drops changes, and after `PRODUCT_AVAILABILITY_BITMAP_TIMEOUT` seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the empty bitmaps, without subscribing yet."""
+        self.lock: threading.Lock = threading.Lock()
+        self.subscription: Optional[StockFeedSubscription] = None
+        self.loaded_at: float = 0.0
+        self.active: int = 0
+        self.bitmaps: dict[int, int] = {}
+        self.vending_machines: dict[int, list[int]] = {}
+
+    def get(self, product_id: int) -> list[int]:
+        """
+        Return the ids of the active vending machines which have the given product in stock.
+
+        Params:
+            product_id (int): Id of the product
+        Returns:
+            list[int]: Ids of the vending machines, in order.
+        """
+        with self.lock:
+            if self.subscription is None:
+                self.subscription = get_stock_feed().subscribe()
+            changes: Optional[list[dict[str, Any]]] = self.subscription.get(0)
+            if changes is None or time.monotonic() - self.loaded_at > settings.PRODUCT_AVAILABILITY_BITMAP_TIMEOUT:
+                self.reset()
+            else:
+                self.apply(changes)
+            if product_id not in self.bitmaps:
+                self.bitmaps[product_id] = _to_bitmap(_get_available(product_id))
+            if product_id not in self.vending_machines:
+                self.vending_machines[product_id] = _get_set_bits(self.bitmaps[product_id])
+            return self.vending_machines[product_id]
+
+    def reset(self) -> None:
+        """Drop every bitmap, and reload the active vending machines."""
+        self.loaded_at = time.monotonic()
+        self.active = _to_bitmap(VendingMachine.objects.filter(is_active=True).values_list("id", flat=True))
+        self.bitmaps.clear()
+        self.vending_machines.clear()
+
+    def apply(self, changes: list[dict[str, Any]]) -> None:
+        """
+        Update the loaded bitmaps with the given stock changes.
+
+        Params:
+            changes (list[dict[str, Any]]): Stock timelines pushed by the stock feed
+        """
+        for change in changes:
+            bitmap: Optional[int] = self.bitmaps.get(change["product"])
+            if bitmap is None:
+                continue
+            bit: int = 1 << change["vending_machine"]
+            self.bitmaps[change["product"]] = (
+                bitmap | bit if change["quantity"] > 0 and self.active & bit else bitmap & ~bit
+            )
+            self.vending_machines.pop(change["product"], None)
+
+    def close(self) -> None:
+        """Unsubscribe from the stock feed and drop every bitmap."""
+        with self.lock:
+            if self.subscription is not None:
+                get_stock_feed().unsubscribe(self.subscription)
+                self.subscription = None
+            self.loaded_at = 0.0
+            self.bitmaps.clear()
+            self.vending_machines.clear()
+
+
+availability_bitmaps: AvailabilityBitmaps = AvailabilityBitmaps()
+
+
+def get_product_availability(product_id: int) -> list[int]:
+    """
+    Return the ids of the active vending machines which have the given product in stock.
+
+    They are read from the availability bitmaps when `PRODUCT_AVAILABILITY_BITMAP_ENABLED`, else from the partial
+    index of the stocks in stock.
+
+    Params:
+        product_id (int): Id of the product
+    Returns:
+        list[int]: Ids of the vending machines, in order.
+    """
+    if settings.PRODUCT_AVAILABILITY_BITMAP_ENABLED:
+        return availability_bitmaps.get(product_id)
+    return _get_available(product_id)
+
+
+def _get_available(product_id: int) -> list[int]:
+    """
+    Return the ids of the active vending machines which have the given product in stock, from the database.
+
+    Params:
+        product_id (int): Id of the product
+    Returns:
+        list[int]: Ids of the vending machines, in order.
+    """
+    return list(
+        Stock.objects.filter(product_id=product_id, quantity__gt=0, vending_machine__is_active=True)
+        .order_by("vending_machine_id")
+        .values_list("vending_machine_id", flat=True)
+    )
+
+
+def _to_bitmap(positions: Iterable[int]) -> int:
+    """
+    Return the bitmap with the bits at the given positions set.
+
+    Params:
+        positions (Iterable[int]): Positions of the set bits
+    Returns:
+        int: Bitmap.
+    """
+    data: bytearray = bytearray()
+    for position in positions:
+        if position >> 3 >= len(data):
+            data.extend(bytes((position >> 3) - len(data) + 1))
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+
+def _get_set_bits(bitmap: int) -> list[int]:
+    """
+    Return the positions of the set bits of the given bitmap, skipping its empty bytes.
+
+    Params:
+        bitmap (int): Bitmap
+    Returns:
+        list[int]: Positions, in order.
+    """
+    return [
+        index * 8 + bit
+        for index, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"))
+        if byte
+        for bit in range(8)
+        if byte >> bit & 1
+    ]
@@ -0,0 +1,54 @@
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Iterator, Optional
+
+from django.db.models import F, QuerySet, Value
+
+from api.models.stock import Stock
+
+REPLENISHMENT_CHUNK_SIZE: int = 5000
+
+
+def get_pick_lists(target: int, location: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    Return the pick list of every location, the units of every product needed to fill its stocks up to the target.
+
+    The stocks of active vending machines below the target are read with their location and product name in one
+    query ordered by location, product and vending machine, then grouped in memory as the rows stream in.
+
+    Params:
+        target (int): Quantity every stock is filled up to
+        location (Optional[str]): Location of the only pick list, all of them by default
+    Returns:
+        list[dict[str, Any]]: Per location, the total units and, per product, its total units and the units of
+            every vending machine, in location, product and vending machine order.
+    """
+    stocks: QuerySet = Stock.objects.filter(vending_machine__is_active=True, quantity__lt=target)
+    if location is not None:
+        stocks = stocks.filter(vending_machine__location=location)
+    rows: Iterator[tuple[str, int, str, int, int]] = (
+        stocks.annotate(units=Value(target) - F("quantity"))
+        .order_by("vending_machine__location", "product_id", "vending_machine_id")
+        .values_list("vending_machine__location", "product_id", "product__name", "vending_machine_id", "units")
+        .iterator(chunk_size=REPLENISHMENT_CHUNK_SIZE)
+    )
+    pick_lists: list[dict[str, Any]] = []
+    for location_name, location_rows in groupby(rows, itemgetter(0)):
+        products: list[dict[str, Any]] = []
+        for (product_id, product_name), product_rows in groupby(location_rows, itemgetter(1, 2)):
+            vending_machines: list[dict[str, int]] = [
+                {"vending_machine": vending_machine_id, "units": units}
+                for *_, vending_machine_id, units in product_rows
+            ]
+            products.append(
+                {
+                    "product": product_id,
+                    "name": product_name,
+                    "units": sum(item["units"] for item in vending_machines),
+                    "vending_machines": vending_machines,
+                }
+            )
+        pick_lists.append(
+            {"location": location_name, "units": sum(product["units"] for product in products), "products": products}
+        )
+    return pick_lists
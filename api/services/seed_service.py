@@ -0,0 +1,150 @@
+import csv
+import io
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models.inventory_summary import InventorySummary
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.stock_threshold import StockThreshold
+from api.models.stock_timeline import StockTimeline
+from api.models.table_version import TableVersion
+from api.models.vending_machine import VendingMachine
+from api.services.cache_service import get_namespace, invalidate
+
+
+def seed(
+    vending_machines: int,
+    products: int,
+    stocks_per_vending_machine: int,
+    stock_timelines: int,
+    batch_size: int = 10000,
+    random_seed: int = 0,
+) -> dict[str, int]:
+    """
+    Seed a fleet of vending machines, products with a stock threshold, stocks and stock timelines in bulk.
+
+    Rows are inserted in batches without `Model.save`, stock timelines with `COPY` on PostgreSQL and plain batched
+    inserts elsewhere. The stock timelines
+    are spread over the stocks, one second apart and ending now. Table versions, inventory summaries and the cache
+    are refreshed once at the end.
+
+    Params:
+        vending_machines (int): Number of vending machines
+        products (int): Number of products
+        stocks_per_vending_machine (int): Number of stocks per vending machine, at most the number of products
+        stock_timelines (int): Number of stock timelines
+        batch_size (int): Number of rows per insert
+        random_seed (int): Seed of the generated quantities and costs
+    Returns:
+        dict[str, int]: Number of rows created per model.
+    """
+    generator: random.Random = random.Random(random_seed)
+    with transaction.atomic():
+        vending_machine_ids: list[int] = [
+            vending_machine.id
+            for vending_machine in VendingMachine.objects.bulk_create(
+                (
+                    VendingMachine(name=f"seed machine {i}", location=f"seed location {i % 100}", is_active=True)
+                    for i in range(vending_machines)
+                ),
+                batch_size=batch_size,
+            )
+        ]
+        product_ids: list[int] = [
+            product.id
+            for product in Product.objects.bulk_create(
+                (
+                    Product(name=f"seed product {i}", cost=Decimal(generator.randrange(50, 1000)) / 100)
+                    for i in range(products)
+                ),
+                batch_size=batch_size,
+            )
+        ]
+        reorder_levels: dict[int, int] = {product_id: generator.randrange(20) for product_id in product_ids}
+        StockThreshold.objects.bulk_create(
+            (
+                StockThreshold(product_id=product_id, reorder_level=level)
+                for product_id, level in reorder_levels.items()
+            ),
+            batch_size=batch_size,
+        )
+        pairs: list[tuple[int, int]] = [
+            (vending_machine_id, product_ids[(index + offset) % len(product_ids)])
+            for index, vending_machine_id in enumerate(vending_machine_ids)
+            for offset in range(min(stocks_per_vending_machine, len(product_ids)))
+        ]
+        Stock.objects.bulk_create(
+            (
+                Stock(
+                    vending_machine_id=vending_machine_id,
+                    product_id=product_id,
+                    quantity=generator.randrange(100),
+                    reorder_level=reorder_levels[product_id],
+                )
+                for vending_machine_id, product_id in pairs
+            ),
+            batch_size=batch_size,
+        )
+        timeline_count: int = _insert_stock_timelines(pairs, stock_timelines, batch_size, generator) if pairs else 0
+    TableVersion.bump(VendingMachine, Product, Stock, StockTimeline)
+    if settings.INVENTORY_SUMMARY_ENABLED:
+        for start in range(0, len(vending_machine_ids), batch_size):
+            InventorySummary.refresh(vending_machine_ids[start : start + batch_size])
+    invalidate(get_namespace(VendingMachine))
+    invalidate(get_namespace(Product))
+    return {
+        "vending_machines": len(vending_machine_ids),
+        "products": len(product_ids),
+        "stock_thresholds": len(product_ids),
+        "stocks": len(pairs),
+        "stock_timelines": timeline_count,
+    }
+
+
+def _insert_stock_timelines(pairs: list[tuple[int, int]], count: int, batch_size: int, generator: random.Random) -> int:
+    """
+    Insert the given number of stock timelines over the given stocks.
+
+    Params:
+        pairs (list[tuple[int, int]]): Vending machine and product ids of the stocks
+        count (int): Number of stock timelines
+        batch_size (int): Number of rows per insert
+        generator (random.Random): Generator of the quantities
+    Returns:
+        int: Number of stock timelines inserted.
+    """
+    start: datetime = timezone.now() - timedelta(seconds=count)
+    table: str = connection.ops.quote_name(StockTimeline._meta.db_table)
+    with connection.cursor() as cursor:
+        copy: Any = getattr(cursor, "copy_expert", None) if connection.vendor == "postgresql" else None
+        for offset in range(0, count, batch_size):
+            rows: list[tuple[int, int, int, Any]] = [
+                (
+                    *pairs[index % len(pairs)],
+                    generator.randrange(100),
+                    connection.ops.adapt_datetimefield_value(start + timedelta(seconds=index)),
+                )
+                for index in range(offset, min(offset + batch_size, count))
+            ]
+            if copy is None:
+                cursor.executemany(
+                    f"INSERT INTO {table} (vending_machine_id, product_id, quantity, timestamp) "
+                    "VALUES (%s, %s, %s, %s)",
+                    rows,
+                )
+                continue
+            buffer: io.StringIO = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            copy(
+                f"COPY {table} (vending_machine_id, product_id, quantity, timestamp) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+    return count
@@ -0,0 +1,172 @@
+from datetime import datetime, time
+from typing import Any, Iterator, Optional
+
+from django.db import connection, transaction
+from django.db.models import F, Max, Min, OuterRef, QuerySet, Subquery, Sum, Window
+from django.db.models.functions import Coalesce, Lag, TruncDate
+from django.utils import timezone
+
+from api.models.stock import Stock
+from api.models.stock_consumption import StockConsumption
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_watermark import StockTimelineWatermark
+
+STOCK: str = "stock"
+PRODUCT: str = "product"
+GROUPS: tuple[str, str] = (STOCK, PRODUCT)
+ORDERINGS: dict[str, str] = {
+    "-sold": "sold DESC",
+    "sold": "sold ASC",
+    "-sell_through": "sell_through DESC",
+    "sell_through": "sell_through ASC",
+}
+CONSUMPTION_BATCH_SIZE: int = 5000
+
+
+def get_stock_consumptions(filters: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return the units sold and restocked between since and until, per stock or per product of the whole fleet.
+
+    The daily stock consumptions are summed and joined to the current stocks in one query, so that stocks without
+    sales are returned as slow movers too. The sell-through rate is the share of the units sold over the units sold
+    plus the units still in stock.
+
+    Params:
+        filters (dict[str, Any]): Validated vending_machine, product, since, until, group, ordering and limit
+    Returns:
+        list[dict[str, Any]]: Vending machine, unless grouped by product, product, current quantity, units sold and
+            restocked, and sell-through rate, in the given order.
+    """
+    consumptions: QuerySet = StockConsumption.objects.all()
+    stocks: QuerySet = Stock.objects.all()
+    for key in ("vending_machine", "product"):
+        if key in filters:
+            consumptions = consumptions.filter(**{f"{key}_id": filters[key]})
+            stocks = stocks.filter(**{f"{key}_id": filters[key]})
+    if "since" in filters:
+        consumptions = consumptions.filter(day__gte=filters["since"])
+    if "until" in filters:
+        consumptions = consumptions.filter(day__lt=filters["until"])
+    keys: list[str] = ["vending_machine_id", "product_id"] if filters["group"] == STOCK else ["product_id"]
+    consumptions = consumptions.values(*keys).annotate(sold=Sum("sold"), restocked=Sum("restocked"))
+    stocks = (
+        stocks.values(*keys).annotate(units=F("quantity"))
+        if filters["group"] == STOCK
+        else stocks.values(*keys).annotate(units=Sum("quantity"))
+    )
+    stock_sql, stock_params = stocks.query.sql_with_params()
+    consumption_sql, consumption_params = consumptions.query.sql_with_params()
+    columns: str = ", ".join(f'stocks."{key}"' for key in keys)
+    sold: str = "COALESCE(consumptions.sold, 0)"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {columns}, stocks.units, {sold} AS sold, COALESCE(consumptions.restocked, 0) AS restocked, "
+            f"CASE WHEN {sold} + stocks.units > 0 THEN {sold} * 1.0 / ({sold} + stocks.units) ELSE 0 END "
+            f"AS sell_through FROM ({stock_sql}) stocks LEFT JOIN ({consumption_sql}) consumptions ON "
+            + " AND ".join(f'stocks."{key}" = consumptions."{key}"' for key in keys)
+            + f" ORDER BY {ORDERINGS[filters['ordering']]}, {columns} LIMIT %s",
+            [*stock_params, *consumption_params, filters["limit"]],
+        )
+        rows: list[tuple[Any, ...]] = cursor.fetchall()
+    return [
+        {
+            "vending_machine": row[0] if filters["group"] == STOCK else None,
+            "product": row[len(keys) - 1],
+            "quantity": row[-4],
+            "sold": row[-3],
+            "restocked": row[-2],
+            "sell_through": row[-1],
+        }
+        for row in rows
+    ]
+
+
+def refresh_stock_consumptions() -> int:
+    """
+    Compute the daily consumption of the new stock timelines into the stock consumption table.
+
+    The stock timelines inserted since the previous refresh are found by id, whatever their timestamps, and every
+    day from the earliest of them on is recomputed.
+
+    Returns:
+        int: Number of saved stock consumptions.
+    """
+    count: int = 0
+    with transaction.atomic():
+        watermark: StockTimelineWatermark = StockTimelineWatermark.lock("consumption")
+        refreshed_at: datetime = timezone.now()
+        new: dict[str, Any] = watermark.get_new_stock_timelines().aggregate(timestamp=Min("timestamp"), id=Max("id"))
+        if new["timestamp"] is not None:
+            since: datetime = timezone.make_aware(datetime.combine(timezone.localdate(new["timestamp"]), time.min))
+            for batch in _aggregate_stock_consumptions(since):
+                StockConsumption.objects.bulk_create(
+                    [
+                        StockConsumption(
+                            vending_machine_id=vending_machine_id,
+                            product_id=product_id,
+                            day=day,
+                            sold=sold,
+                            restocked=restocked,
+                        )
+                        for vending_machine_id, product_id, day, sold, restocked in batch
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["vending_machine", "product", "day"],
+                    update_fields=["sold", "restocked"],
+                )
+                count += len(batch)
+        watermark.advance(new["id"], refreshed_at)
+    return count
+
+
+def _aggregate_stock_consumptions(since: Optional[datetime] = None) -> Iterator[list[tuple[Any, ...]]]:
+    """
+    Aggregate the units sold and restocked per (vending machine, product, day) from the stock timelines since then.
+
+    Every stock timeline is paired with the previous one of its stock by `LAG` over (vending machine, product)
+    ordered by timestamp. A decrease counts as sold and an increase as restocked. The first stock timeline of every
+    stock since then is paired with the last one before, and the first one ever counts as neither.
+
+    Params:
+        since (Optional[datetime]): Only stock timelines at or after this time are aggregated, all by default
+    Returns:
+        Iterator[list[tuple[Any, ...]]]: Batches of vending machine id, product id, day, sold and restocked.
+    """
+    stock_timelines: QuerySet = StockTimeline.objects.all()
+    previous: Any = Window(
+        Lag("quantity"),
+        partition_by=[F("vending_machine_id"), F("product_id")],
+        order_by=[F("timestamp").asc(), F("id").asc()],
+    )
+    if since is not None:
+        stock_timelines = stock_timelines.filter(timestamp__gte=since)
+        previous = Coalesce(
+            previous,
+            Subquery(
+                StockTimeline.objects.filter(
+                    vending_machine_id=OuterRef("vending_machine_id"),
+                    product_id=OuterRef("product_id"),
+                    timestamp__lt=since,
+                )
+                .order_by("-timestamp", "-id")
+                .values("quantity")[:1]
+            ),
+        )
+    sql, params = (
+        stock_timelines.annotate(day=TruncDate("timestamp"), previous=previous)
+        .values_list("vending_machine_id", "product_id", "day", "quantity", "previous")
+        .query.sql_with_params()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT "vending_machine_id", "product_id", "day", '
+            'SUM(CASE WHEN "previous" > "quantity" THEN "previous" - "quantity" ELSE 0 END), '
+            'SUM(CASE WHEN "quantity" > "previous" THEN "quantity" - "previous" ELSE 0 END) '
+            f'FROM ({sql}) deltas GROUP BY "vending_machine_id", "product_id", "day"',
+            params,
+        )
+        while True:
+            batch: list[tuple[Any, ...]] = cursor.fetchmany(CONSUMPTION_BATCH_SIZE)
+            if not batch:
+                break
+            yield batch
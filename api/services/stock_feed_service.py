@@ -0,0 +1,364 @@
+import json
+import logging
+import select
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models import Max, Q, QuerySet
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from api.models.stock_timeline import StockTimeline
+from api.services.stock_timeline_service import EXPORT_CHUNK_SIZE, EXPORT_FIELDS, format_stock_timeline
+
+NOTIFY_PAYLOAD_SIZE: int = 7000
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class StockFeedSubscription:
+    """Queue of the stock changes pushed to one subscriber, filtered by vending machine if given."""
+
+    def __init__(self, vending_machines: Optional[set[int]] = None) -> None:
+        """
+        Initialize the empty queue.
+
+        Params:
+            vending_machines (Optional[set[int]]): Ids of the only vending machines to be pushed, all by default
+        """
+        self.vending_machines: Optional[set[int]] = vending_machines
+        self.condition: threading.Condition = threading.Condition()
+        self.changes: list[dict[str, Any]] = []
+        self.overflowed: bool = False
+
+    def put(self, changes: list[dict[str, Any]]) -> None:
+        """
+        Queue the given stock changes of the subscribed vending machines.
+
+        When the subscriber falls `STOCK_FEED_QUEUE_SIZE` changes behind, the queue is dropped and the subscriber
+        reads the missed changes from the database instead.
+
+        Params:
+            changes (list[dict[str, Any]]): Published stock timelines
+        """
+        if self.vending_machines is not None:
+            changes = [change for change in changes if change["vending_machine"] in self.vending_machines]
+        if not changes:
+            return
+        with self.condition:
+            if len(self.changes) + len(changes) > settings.STOCK_FEED_QUEUE_SIZE:
+                self.changes = []
+                self.overflowed = True
+            else:
+                self.changes += changes
+            self.condition.notify()
+
+    def get(self, timeout: float) -> Optional[list[dict[str, Any]]]:
+        """
+        Wait for stock changes and return them.
+
+        Params:
+            timeout (float): Maximum wait in seconds
+        Returns:
+            Optional[list[dict[str, Any]]]: Queued stock changes, empty after the timeout, or None if some were dropped.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.changes or self.overflowed, timeout=timeout)
+            if self.overflowed:
+                self.overflowed = False
+                return None
+            changes, self.changes = self.changes, []
+        return changes
+
+    def drop(self) -> None:
+        """Mark the queue as dropped, so that the subscriber reads the missed changes from the database."""
+        with self.condition:
+            self.changes = []
+            self.overflowed = True
+            self.condition.notify()
+
+
+class LocalStockFeedBackend:
+    """Stock feed pushing the stock changes published by this process to its subscribers."""
+
+    def __init__(self) -> None:
+        """Initialize the backend without subscribers."""
+        self.lock: threading.Lock = threading.Lock()
+        self.subscriptions: set[StockFeedSubscription] = set()
+
+    def publish(self, changes: list[dict[str, Any]]) -> None:
+        """
+        Publish the given stock changes.
+
+        Params:
+            changes (list[dict[str, Any]]): Committed stock timelines
+        """
+        self.deliver(changes)
+
+    def deliver(self, changes: list[dict[str, Any]]) -> None:
+        """
+        Push the given stock changes to the subscribers of this process.
+
+        Params:
+            changes (list[dict[str, Any]]): Published stock timelines
+        """
+        with self.lock:
+            subscriptions: list[StockFeedSubscription] = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.put(changes)
+
+    def subscribe(self, vending_machines: Optional[set[int]] = None) -> StockFeedSubscription:
+        """
+        Subscribe to the stock changes.
+
+        Params:
+            vending_machines (Optional[set[int]]): Ids of the only vending machines to be pushed, all by default
+        Returns:
+            StockFeedSubscription: Queue of the pushed stock changes.
+        """
+        subscription: StockFeedSubscription = StockFeedSubscription(vending_machines)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StockFeedSubscription) -> None:
+        """
+        Stop pushing stock changes to the given subscription.
+
+        Params:
+            subscription (StockFeedSubscription): Subscription to be removed
+        """
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+
+class PostgresStockFeedBackend(LocalStockFeedBackend):
+    """
+    Stock feed sharing the stock changes of every process through PostgreSQL `NOTIFY`.
+
+    Every process with subscribers `LISTEN`s on a dedicated connection from a background thread, started with the first
+    subscriber. When that connection is lost, the subscribers read the changes they missed from the database.
+    """
+
+    channel: str = "stock_feed"
+
+    def __init__(self) -> None:
+        """Initialize the backend without subscribers nor listener."""
+        super().__init__()
+        self.thread: Optional[threading.Thread] = None
+
+    def publish(self, changes: list[dict[str, Any]]) -> None:
+        """
+        Notify the given stock changes to every process, in payloads under the size limit of `NOTIFY`.
+
+        Params:
+            changes (list[dict[str, Any]]): Committed stock timelines
+        """
+        payloads: list[str] = []
+        batch: list[str] = []
+        size: int = 0
+        for change in changes:
+            item: str = json.dumps(change)
+            if batch and size + len(item) > NOTIFY_PAYLOAD_SIZE:
+                payloads.append(f"[{','.join(batch)}]")
+                batch, size = [], 0
+            batch.append(item)
+            size += len(item) + 1
+        if batch:
+            payloads.append(f"[{','.join(batch)}]")
+        with connection.cursor() as cursor:
+            for payload in payloads:
+                cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, payload])
+
+    def subscribe(self, vending_machines: Optional[set[int]] = None) -> StockFeedSubscription:
+        """
+        Subscribe to the stock changes of every process, starting the listener if needed.
+
+        Params:
+            vending_machines (Optional[set[int]]): Ids of the only vending machines to be pushed, all by default
+        Returns:
+            StockFeedSubscription: Queue of the pushed stock changes.
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.listen, name="stock-feed-listener", daemon=True)
+                self.thread.start()
+        return super().subscribe(vending_machines)
+
+    def listen(self) -> None:
+        """Push the notified stock changes to the subscribers, reconnecting whenever the connection is lost."""
+        while True:
+            listener: Any = None
+            try:
+                listener = connection.get_new_connection(connection.get_connection_params())
+                listener.autocommit = True
+                with listener.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                while True:
+                    if select.select([listener], [], [], settings.STOCK_FEED_HEARTBEAT) == ([], [], []):
+                        continue
+                    listener.poll()
+                    while listener.notifies:
+                        self.deliver(json.loads(listener.notifies.pop(0).payload))
+            except Exception:
+                logger.exception("Stock feed listener disconnected, reconnecting.")
+            finally:
+                if listener is not None:
+                    listener.close()
+            with self.lock:
+                subscriptions: list[StockFeedSubscription] = list(self.subscriptions)
+            for subscription in subscriptions:
+                subscription.drop()
+            time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def _get_backend(path: str) -> LocalStockFeedBackend:
+    """
+    Return the stock feed backend of the given class, created once per process.
+
+    Params:
+        path (str): Dotted path of the backend class
+    Returns:
+        LocalStockFeedBackend: Stock feed backend.
+    """
+    return import_string(path)()
+
+
+def get_stock_feed() -> LocalStockFeedBackend:
+    """
+    Return the stock feed backend of `STOCK_FEED_BACKEND`.
+
+    Returns:
+        LocalStockFeedBackend: Stock feed backend.
+    """
+    return _get_backend(settings.STOCK_FEED_BACKEND)
+
+
+def publish_stock_timelines(stock_timelines: Iterable[StockTimeline]) -> None:
+    """
+    Publish the given saved stock timelines to the stock feed once the current transaction commits.
+
+    Params:
+        stock_timelines (Iterable[StockTimeline]): Saved stock timelines
+    """
+    changes: list[dict[str, Any]] = [
+        format_stock_timeline(
+            (
+                stock_timeline.id,
+                stock_timeline.vending_machine_id,
+                stock_timeline.product_id,
+                stock_timeline.quantity,
+                stock_timeline.timestamp,
+            )
+        )
+        for stock_timeline in stock_timelines
+    ]
+    if changes:
+        transaction.on_commit(lambda: _publish(changes))
+
+
+def _publish(changes: list[dict[str, Any]]) -> None:
+    """
+    Publish the given stock changes, logging instead of failing the committed write.
+
+    Params:
+        changes (list[dict[str, Any]]): Committed stock timelines
+    """
+    try:
+        get_stock_feed().publish(changes)
+    except Exception:
+        logger.exception("Could not publish %d stock changes.", len(changes))
+
+
+def stream_stock_changes(vending_machines: Optional[set[int]] = None, last_id: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream the stock changes as server-sent events, until `STOCK_FEED_TIMEOUT` seconds have passed.
+
+    The stock timelines after `last_id` are read from the database first, then the published ones are pushed as they
+    commit. Every event has the id of its stock timeline, so a client reconnecting with the last one it received
+    resumes where it stopped. A comment is sent every `STOCK_FEED_HEARTBEAT` seconds without changes.
+
+    Stock timeline ids are taken when they are inserted, but may commit in another order, so a stock timeline can
+    commit after one with a higher id was streamed. Every read from the database also reads the stock timelines of the
+    last `STOCK_TIMELINE_COMMIT_GRACE` seconds before `last_id`, and changes are skipped by id once they were streamed,
+    so a stock timeline is streamed at least once if its transaction commits within that time.
+
+    Params:
+        vending_machines (Optional[set[int]]): Ids of the only vending machines to be streamed, all by default
+        last_id (Optional[int]): Id of the last stock timeline received, only new ones by default
+    Returns:
+        Iterator[str]: Server-sent events.
+    """
+    feed: LocalStockFeedBackend = get_stock_feed()
+    subscription: StockFeedSubscription = feed.subscribe(vending_machines)
+    deadline: float = time.monotonic() + settings.STOCK_FEED_TIMEOUT
+    # Ids of the streamed stock timelines with the time they were streamed, until they are out of the grace window.
+    delivered: dict[int, float] = {}
+    try:
+        if last_id is None:
+            last_id = StockTimeline.objects.using(DEFAULT_DB_ALIAS).aggregate(id=Max("id"))["id"] or 0
+            delivered = {
+                change["id"]: time.monotonic()
+                for change in _read_stock_changes(vending_machines, last_id)
+                if change["id"] <= last_id
+            }
+        yield "retry: 1000\n\n"
+        changes: Optional[list[dict[str, Any]]] = None
+        while True:
+            if changes is None:
+                changes = list(_read_stock_changes(vending_machines, last_id))
+            for change in changes:
+                if change["id"] not in delivered:
+                    delivered[change["id"]] = time.monotonic()
+                    last_id = max(last_id, change["id"])
+                    yield _format_event(change)
+            horizon: float = time.monotonic() - settings.STOCK_TIMELINE_COMMIT_GRACE
+            delivered = {
+                change_id: streamed_at for change_id, streamed_at in delivered.items() if streamed_at > horizon
+            }
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            changes = subscription.get(min(settings.STOCK_FEED_HEARTBEAT, remaining))
+            if changes == []:
+                yield ": keep-alive\n\n"
+    finally:
+        feed.unsubscribe(subscription)
+
+
+def _read_stock_changes(vending_machines: Optional[set[int]], last_id: int) -> Iterator[dict[str, Any]]:
+    """
+    Read the stock timelines after the given id, or of the last `STOCK_TIMELINE_COMMIT_GRACE` seconds, in id order.
+
+    Params:
+        vending_machines (Optional[set[int]]): Ids of the only vending machines to be read, all by default
+        last_id (int): Id of the last stock timeline received
+    Returns:
+        Iterator[dict[str, Any]]: Stock timelines.
+    """
+    # Read from default, since a replica which has not replayed some of them yet would skip them for good.
+    queryset: QuerySet = StockTimeline.objects.using(DEFAULT_DB_ALIAS).filter(
+        Q(id__gt=last_id) | Q(timestamp__gte=timezone.now() - timedelta(seconds=settings.STOCK_TIMELINE_COMMIT_GRACE))
+    )
+    if vending_machines is not None:
+        queryset = queryset.filter(vending_machine_id__in=vending_machines)
+    for row in queryset.order_by("id").values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield format_stock_timeline(row)
+
+
+def _format_event(change: dict[str, Any]) -> str:
+    """
+    Format the given stock change as a server-sent event.
+
+    Params:
+        change (dict[str, Any]): Stock timeline
+    Returns:
+        str: Server-sent event.
+    """
+    return f"id: {change['id']}\nevent: stock\ndata: {json.dumps(change)}\n\n"
@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from django.db import connection, transaction
+from django.db.models import Case, ExpressionWrapper, F, FloatField, QuerySet, Sum, Value, When
+from django.utils import timezone
+
+from api.models.stock import Stock
+from api.models.stock_consumption import StockConsumption
+from api.models.stock_forecast import StockForecast
+
+FORECAST_WINDOW_DAYS: int = 28
+FORECAST_SMOOTHING: float = 0.3
+FORECAST_BATCH_SIZE: int = 5000
+
+
+def get_stock_forecasts(filters: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return the stocks which are being consumed, the soonest empty first.
+
+    Days until empty are the current quantity over the forecast rate, so they follow every stock write between two
+    refreshes of the forecasts.
+
+    Params:
+        filters (dict[str, Any]): Validated vending_machine, product, within_days and limit
+    Returns:
+        list[dict[str, Any]]: Stock, rate in units per day, days until empty and estimated empty time.
+    """
+    stocks: QuerySet = Stock.objects.filter(forecast__rate__gt=0).annotate(
+        rate=F("forecast__rate"),
+        days_until_empty=ExpressionWrapper(F("quantity") / F("forecast__rate"), output_field=FloatField()),
+    )
+    if "vending_machine" in filters:
+        stocks = stocks.filter(vending_machine_id=filters["vending_machine"])
+    if "product" in filters:
+        stocks = stocks.filter(product_id=filters["product"])
+    if "within_days" in filters:
+        stocks = stocks.filter(days_until_empty__lt=filters["within_days"])
+    now: datetime = timezone.now()
+    return [
+        {**stock, "empty_at": now + timedelta(days=stock["days_until_empty"])}
+        for stock in stocks.order_by("days_until_empty", "id").values(
+            "id", "vending_machine", "product", "quantity", "rate", "days_until_empty"
+        )[: filters["limit"]]
+    ]
+
+
+def refresh_stock_forecasts(
+    window_days: int = FORECAST_WINDOW_DAYS, smoothing: float = FORECAST_SMOOTHING, today: Optional[date] = None
+) -> int:
+    """
+    Forecast the consumption rate of every stock from its daily stock consumptions, and save them in bulk.
+
+    The rate is the simple exponential smoothing of the units sold per day over the last `window_days` full days,
+    where the weight of a day is `smoothing * (1 - smoothing) ** age` normalized over the window. It is fitted for
+    every stock at once by a single weighted `GROUP BY` in the database, instead of one series at a time.
+
+    Params:
+        window_days (int): Number of full days before today the rates are fitted on
+        smoothing (float): Smoothing factor between 0 and 1, the higher the more recent days weigh
+        today (Optional[date]): Day of the forecast, excluded as it is not over, the current day by default
+    Returns:
+        int: Number of saved stock forecasts.
+    """
+    today = today or timezone.localdate()
+    weights: list[float] = [smoothing * (1 - smoothing) ** age for age in range(window_days)]
+    weight: Case = Case(
+        *[
+            When(day=today - timedelta(days=age + 1), then=Value(value / sum(weights)))
+            for age, value in enumerate(weights)
+        ],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    rates: QuerySet = (
+        StockConsumption.objects.filter(day__gte=today - timedelta(days=window_days), day__lt=today)
+        .values("vending_machine_id", "product_id")
+        .annotate(rate=Sum(ExpressionWrapper(F("sold") * weight, output_field=FloatField())))
+    )
+    stock_sql, stock_params = Stock.objects.values("id", "vending_machine_id", "product_id").query.sql_with_params()
+    rate_sql, rate_params = rates.query.sql_with_params()
+    updated_at: datetime = timezone.now()
+    count: int = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT stocks.id, COALESCE(rates.rate, 0) FROM ({stock_sql}) stocks LEFT JOIN ({rate_sql}) rates "
+            'ON stocks."vending_machine_id" = rates."vending_machine_id" AND stocks."product_id" = rates."product_id"',
+            [*stock_params, *rate_params],
+        )
+        while True:
+            batch: list[tuple[int, float]] = cursor.fetchmany(FORECAST_BATCH_SIZE)
+            if not batch:
+                break
+            StockForecast.objects.bulk_create(
+                [StockForecast(stock_id=stock_id, rate=rate, updated_at=updated_at) for stock_id, rate in batch],
+                update_conflicts=True,
+                unique_fields=["stock"],
+                update_fields=["rate", "updated_at"],
+            )
+            count += len(batch)
+    return count
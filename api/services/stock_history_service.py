@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, OuterRef, QuerySet, Subquery
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from api.models.stock_checkpoint import StockCheckpoint
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_watermark import StockTimelineWatermark
+from api.serializers.as_of_serializer import AsOfSerializer
+
+
+def get_as_of(request: Request) -> Optional[datetime]:
+    """
+    Return the validated `as_of` query parameter of the given request.
+
+    Params:
+        request (Request): Request with optional `as_of`
+    Returns:
+        Optional[datetime]: Point in time, or None if not given.
+    """
+    serializer: AsOfSerializer = AsOfSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data.get("as_of")
+
+
+def latest_stock_timelines(stock_timelines: QuerySet) -> QuerySet:
+    """
+    Return the latest of the given stock timelines per (vending machine, product).
+
+    PostgreSQL uses `DISTINCT ON`, other databases a correlated subquery. Both walk the
+    (vending_machine, product, timestamp) index backwards instead of sorting the whole history.
+
+    Params:
+        stock_timelines (QuerySet): Stock timelines to be reduced
+    Returns:
+        QuerySet: Rows of vending machine id, product id and quantity.
+    """
+    fields: tuple[str, str, str] = ("vending_machine_id", "product_id", "quantity")
+    if connection.vendor == "postgresql":
+        return (
+            stock_timelines.order_by("vending_machine_id", "product_id", "-timestamp", "-id")
+            .distinct("vending_machine_id", "product_id")
+            .values_list(*fields)
+        )
+    latest: QuerySet = (
+        stock_timelines.filter(vending_machine_id=OuterRef("vending_machine_id"), product_id=OuterRef("product_id"))
+        .order_by("-timestamp", "-id")
+        .values("id")[:1]
+    )
+    return stock_timelines.filter(id=Subquery(latest)).values_list(*fields)
+
+
+def get_stocks_as_of(as_of: datetime, vending_machine_id: Optional[int] = None) -> dict[tuple[int, int], int]:
+    """
+    Return the quantity of every (vending machine, product) at the given time.
+
+    The state is read from the latest stock checkpoint at or before that time, then updated with the latest
+    stock timeline of every (vending machine, product) between the checkpoint and that time. Once old stock
+    timelines were detached, times before the oldest checkpoint cannot be rebuilt.
+
+    Params:
+        as_of (datetime): Point in time
+        vending_machine_id (Optional[int]): Id of the only vending machine to be returned
+    Returns:
+        dict[tuple[int, int], int]: Quantities by (vending machine id, product id).
+    Raises:
+        ValidationError: If the time is before the oldest checkpoint and stock timelines were detached.
+    """
+    checkpoints: QuerySet = StockCheckpoint.objects.filter(timestamp__lte=as_of)
+    stock_timelines: QuerySet = StockTimeline.objects.filter(timestamp__lte=as_of)
+    if vending_machine_id is not None:
+        stock_timelines = stock_timelines.filter(vending_machine_id=vending_machine_id)
+    checkpoint: Optional[datetime] = checkpoints.aggregate(timestamp=Max("timestamp"))["timestamp"]
+
+    stocks: dict[tuple[int, int], int] = {}
+    if checkpoint is not None:
+        checkpoints = checkpoints.filter(timestamp=checkpoint)
+        if vending_machine_id is not None:
+            checkpoints = checkpoints.filter(vending_machine_id=vending_machine_id)
+        for checkpoint_vending_machine_id, product_id, quantity in checkpoints.values_list(
+            "vending_machine_id", "product_id", "quantity"
+        ):
+            stocks[(checkpoint_vending_machine_id, product_id)] = quantity
+        stock_timelines = stock_timelines.filter(timestamp__gt=checkpoint)
+    elif StockTimelineWatermark.objects.filter(name=StockTimelineWatermark.DETACHED).exists():
+        raise ValidationError({"as_of": ["Stock history before the oldest stock checkpoint was detached."]})
+    for timeline_vending_machine_id, product_id, quantity in latest_stock_timelines(stock_timelines):
+        stocks[(timeline_vending_machine_id, product_id)] = quantity
+    return stocks
+
+
+def create_stock_checkpoint(timestamp: Optional[datetime] = None, keep: Optional[int] = None) -> int:
+    """
+    Save the quantity of every (vending machine, product) at the given time as a stock checkpoint.
+
+    The checkpoint is built incrementally from the previous one, so taking it periodically stays cheap. Stock
+    timelines may commit up to `STOCK_TIMELINE_COMMIT_GRACE` seconds after their timestamp, and only those after
+    the checkpoint are replayed, so the checkpoint is never taken later than that long ago.
+
+    Params:
+        timestamp (Optional[datetime]): Point in time of the checkpoint, the end of the grace period by default
+        keep (Optional[int]): Number of latest checkpoints to be kept, all by default
+    Returns:
+        int: Number of saved stock checkpoints.
+    """
+    committed: datetime = timezone.now() - timedelta(seconds=settings.STOCK_TIMELINE_COMMIT_GRACE)
+    timestamp = min(timestamp or committed, committed)
+    with transaction.atomic():
+        stocks: dict[tuple[int, int], int] = get_stocks_as_of(timestamp)
+        StockCheckpoint.objects.bulk_create(
+            [
+                StockCheckpoint(
+                    vending_machine_id=vending_machine_id, product_id=product_id, quantity=quantity, timestamp=timestamp
+                )
+                for (vending_machine_id, product_id), quantity in stocks.items()
+            ],
+            batch_size=5000,
+        )
+        if keep is not None:
+            timestamps: Any = (
+                StockCheckpoint.objects.order_by("-timestamp").values_list("timestamp", flat=True).distinct()
+            )
+            oldest_kept: Optional[datetime] = next(iter(timestamps[keep - 1 : keep]), None)
+            if oldest_kept is not None:
+                StockCheckpoint.objects.filter(timestamp__lt=oldest_kept).delete()
+    return len(stocks)
@@ -0,0 +1,244 @@
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+
+from api.models.inventory_summary import InventorySummary
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.stock_threshold import StockThreshold
+from api.models.stock_timeline import StockTimeline
+from api.models.table_version import TableVersion
+from api.models.vending_machine import VendingMachine
+from api.serializers.stock_adjust_serializer import StockAdjustItemSerializer
+from api.serializers.stock_bulk_serializer import StockBulkItemSerializer
+from api.services.stock_feed_service import publish_stock_timelines
+
+CREATED: str = "created"
+UPDATED: str = "updated"
+ERROR: str = "error"
+STOCK_KEY_BATCH_SIZE: int = 500
+
+
+def bulk_upsert_stocks(items: list[Any]) -> list[dict[str, Any]]:
+    """
+    Create or update many stocks and their stock timelines in a constant number of queries.
+
+    Every valid item is upserted on the `vending_machine_product` constraint and gets one stock timeline row,
+    all in a single transaction. Invalid items are reported and skipped without affecting the others. The existing
+    stocks are read by exact pairs, with one more query per `STOCK_KEY_BATCH_SIZE` items.
+
+    Params:
+        items (list[Any]): Items with `vending_machine`, `product` and `quantity`
+    Returns:
+        list[dict[str, Any]]: One result per item, in the order of the given items.
+    """
+    results: list[dict[str, Any]] = [{} for _ in items]
+    pending: dict[tuple[int, int], int] = {}
+    for index, item in enumerate(items):
+        serializer: StockBulkItemSerializer = StockBulkItemSerializer(data=item)
+        if not serializer.is_valid():
+            results[index] = {"status": ERROR, "errors": serializer.errors}
+            continue
+        key: tuple[int, int] = (serializer.validated_data["vending_machine"], serializer.validated_data["product"])
+        if key in pending:
+            results[index] = {"status": ERROR, "errors": {"non_field_errors": ["Duplicate stock in request."]}}
+            continue
+        pending[key] = index
+        results[index] = dict(serializer.validated_data)
+
+    with transaction.atomic():
+        _reject_missing_foreign_keys(pending, results)
+        if not pending:
+            return results
+
+        previous_keys: set[tuple[int, int]] = set(_read_stocks(pending, "vending_machine_id", "product_id"))
+        reorder_levels: dict[tuple[int, int], int] = StockThreshold.get_reorder_levels(pending)
+        Stock.objects.bulk_create(
+            [
+                Stock(
+                    vending_machine_id=key[0],
+                    product_id=key[1],
+                    quantity=results[i]["quantity"],
+                    reorder_level=reorder_levels.get(key),
+                )
+                for key, i in pending.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["vending_machine", "product"],
+            update_fields=["quantity"],
+        )
+        publish_stock_timelines(
+            StockTimeline.objects.bulk_create(
+                [
+                    StockTimeline(vending_machine_id=key[0], product_id=key[1], quantity=results[i]["quantity"])
+                    for key, i in pending.items()
+                ]
+            )
+        )
+        for stock_id, vending_machine_id, product_id in _read_stocks(pending, "id", "vending_machine_id", "product_id"):
+            result_index: int = pending[(vending_machine_id, product_id)]
+            results[result_index]["id"] = stock_id
+            results[result_index]["status"] = UPDATED if (vending_machine_id, product_id) in previous_keys else CREATED
+        TableVersion.bump(Stock, StockTimeline)
+        if settings.INVENTORY_SUMMARY_ENABLED:
+            InventorySummary.refresh(key[0] for key in pending)
+    return results
+
+
+def adjust_stocks(adjustments: list[tuple[int, int]]) -> list[dict[str, Any]]:
+    """
+    Add signed deltas to the quantities of stocks in the database, writing one stock timeline row per adjustment.
+
+    Every delta is applied as a single `quantity = quantity + delta` update guarded by `quantity >= -delta`, or by
+    `quantity <= MAX_QUANTITY - delta`, so concurrent adjustments never lose updates nor take a quantity out of the
+    range of the column. Stocks are updated in id order to avoid deadlocks between batches, and the table versions
+    and inventory summaries are refreshed after commit, so the transaction only locks the adjusted stocks.
+
+    Params:
+        adjustments (list[tuple[int, int]]): Stock id and delta of every adjustment
+    Returns:
+        list[dict[str, Any]]: One result per adjustment, in the given order, with the quantity after it, or the
+            quantity the adjustment failed on.
+    """
+    results: list[dict[str, Any]] = [{} for _ in adjustments]
+    applied: dict[int, list[int]] = {}
+    failed: dict[int, Optional[int]] = {}
+    with transaction.atomic():
+        for index in sorted(range(len(adjustments)), key=lambda i: adjustments[i][0]):
+            stock_id, delta = adjustments[index]
+            queryset: QuerySet = Stock.objects.filter(id=stock_id)
+            if delta < 0:
+                queryset = queryset.filter(quantity__gte=-delta)
+            else:
+                queryset = queryset.filter(quantity__lte=Stock.MAX_QUANTITY - delta)
+            if queryset.update(quantity=F("quantity") + delta):
+                applied.setdefault(stock_id, []).append(index)
+            else:
+                # Read when it fails, as the later adjustments of the same stock change it.
+                failed[index] = Stock.objects.filter(id=stock_id).values_list("quantity", flat=True).first()
+        stocks: dict[int, tuple[int, int, int]] = {
+            stock_id: (vending_machine_id, product_id, quantity)
+            for stock_id, vending_machine_id, product_id, quantity in Stock.objects.filter(
+                id__in=applied.keys()
+            ).values_list("id", "vending_machine_id", "product_id", "quantity")
+        }
+        for stock_id, indexes in applied.items():
+            vending_machine_id, product_id, quantity = stocks[stock_id]
+            for index in reversed(indexes):
+                results[index] = {
+                    "status": UPDATED,
+                    "id": stock_id,
+                    "vending_machine": vending_machine_id,
+                    "product": product_id,
+                    "quantity": quantity,
+                }
+                quantity -= adjustments[index][1]
+        publish_stock_timelines(
+            StockTimeline.objects.bulk_create(
+                [
+                    StockTimeline(
+                        vending_machine_id=results[index]["vending_machine"],
+                        product_id=results[index]["product"],
+                        quantity=results[index]["quantity"],
+                    )
+                    for index in sorted(index for indexes in applied.values() for index in indexes)
+                ]
+            )
+        )
+        if applied:
+            transaction.on_commit(lambda: _refresh_adjusted_stocks({stocks[stock_id][0] for stock_id in applied}))
+    for index, quantity in failed.items():
+        stock_id, delta = adjustments[index]
+        if quantity is None:
+            results[index] = {"status": ERROR, "errors": {"id": [f'Invalid pk "{stock_id}" - object does not exist.']}}
+        else:
+            maximum: int = quantity if delta < 0 else Stock.MAX_QUANTITY
+            results[index] = {
+                "status": ERROR,
+                "errors": {"quantity": [f"Ensure this value is less than or equal to {maximum}."]},
+            }
+    return results
+
+
+def bulk_adjust_stocks(items: list[Any]) -> list[dict[str, Any]]:
+    """
+    Validate and apply many stock adjustments in one transaction.
+
+    Invalid items are reported and skipped without affecting the others.
+
+    Params:
+        items (list[Any]): Items with `id` and a signed `delta`
+    Returns:
+        list[dict[str, Any]]: One result per item, in the order of the given items.
+    """
+    results: list[dict[str, Any]] = [{} for _ in items]
+    valid: list[tuple[int, tuple[int, int]]] = []
+    for index, item in enumerate(items):
+        serializer: StockAdjustItemSerializer = StockAdjustItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, (serializer.validated_data["id"], serializer.validated_data["delta"])))
+        else:
+            results[index] = {"status": ERROR, "errors": serializer.errors}
+    for (index, _), result in zip(valid, adjust_stocks([adjustment for _, adjustment in valid])):
+        results[index] = result
+    return results
+
+
+def _refresh_adjusted_stocks(vending_machine_ids: set[int]) -> None:
+    """
+    Bump the stock versions and refresh the inventory summaries of the given vending machines.
+
+    Params:
+        vending_machine_ids (set[int]): Ids of the vending machines whose stocks were adjusted
+    """
+    TableVersion.bump(Stock, StockTimeline)
+    if settings.INVENTORY_SUMMARY_ENABLED:
+        InventorySummary.refresh(vending_machine_ids)
+
+
+def _reject_missing_foreign_keys(pending: dict[tuple[int, int], int], results: list[dict[str, Any]]) -> None:
+    """
+    Mark pending items whose vending machine or product does not exist as errors, with one query per model.
+
+    Params:
+        pending (dict[tuple[int, int], int]): Pending (vending machine id, product id) keys and their item index
+        results (list[dict[str, Any]]): Results to be updated
+    """
+    vending_machine_ids: set[int] = set(
+        VendingMachine.objects.filter(id__in={key[0] for key in pending}).values_list("id", flat=True)
+    )
+    product_ids: set[int] = set(Product.objects.filter(id__in={key[1] for key in pending}).values_list("id", flat=True))
+    for key, index in list(pending.items()):
+        errors: dict[str, list[str]] = {}
+        if key[0] not in vending_machine_ids:
+            errors["vending_machine"] = [f'Invalid pk "{key[0]}" - object does not exist.']
+        if key[1] not in product_ids:
+            errors["product"] = [f'Invalid pk "{key[1]}" - object does not exist.']
+        if errors:
+            del pending[key]
+            results[index] = {"status": ERROR, "errors": errors}
+
+
+def _read_stocks(keys: dict[tuple[int, int], int], *fields: str) -> list[tuple[Any, ...]]:
+    """
+    Return the given fields of the stocks of exactly the given (vending machine, product) keys.
+
+    The pairs are matched one by one rather than the cross product of their vending machines and products, in
+    batches of `STOCK_KEY_BATCH_SIZE` pairs per query to bound the size of the condition.
+
+    Params:
+        keys (dict[tuple[int, int], int]): (vending machine id, product id) keys to be filtered by
+        fields (str): Fields of the stocks to be returned
+    Returns:
+        list[tuple[Any, ...]]: Rows of the given fields.
+    """
+    pairs: list[tuple[int, int]] = list(keys)
+    rows: list[tuple[Any, ...]] = []
+    for start in range(0, len(pairs), STOCK_KEY_BATCH_SIZE):
+        condition: Q = Q()
+        for vending_machine_id, product_id in pairs[start : start + STOCK_KEY_BATCH_SIZE]:
+            condition |= Q(vending_machine_id=vending_machine_id, product_id=product_id)
+        rows.extend(Stock.objects.filter(condition).values_list(*fields))
+    return rows
@@ -0,0 +1,203 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from itertools import chain
+from typing import IO, Any, Iterator, Optional
+
+from django.db import DatabaseError, connection
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_rollup import StockTimelineRollup
+from api.models.stock_timeline_watermark import StockTimelineWatermark
+from api.models.table_version import TableVersion
+from api.services.stock_timeline_series_service import truncate
+from api.services.stock_timeline_service import EXPORT_CHUNK_SIZE, EXPORT_FIELDS, format_stock_timeline
+
+NOOP: str = "noop"
+DOWNSAMPLED: str = "downsampled"
+COMPACTION_BATCH_SIZE: int = 20
+COMPACTION_CHUNK_SIZE: int = 1000
+
+
+def compact_stock_timelines(
+    before: datetime,
+    archive_dir: str,
+    downsample_before: Optional[datetime] = None,
+    interval: str = StockTimelineRollup.DAY,
+) -> dict[str, Any]:
+    """
+    Delete the redundant stock timelines before the given time, after archiving them as gzip NDJSON.
+
+    A stock timeline is redundant when its quantity is the same as the previous kept one of its (vending machine,
+    product), or, before `downsample_before`, when it is not the last one of its bucket. Quantities at any time
+    outside downsampled buckets stay the same. Only the stock timelines every refresh of the rollups and the
+    consumption has read are downsampled, so they count every change; refreshes which never ran do not hold it back.
+    The stock timelines of a few vending machines are read a page at a time, and the redundant ones deleted while
+    reading in chunks of `COMPACTION_CHUNK_SIZE`, each in a short transaction of its own.
+
+    Params:
+        before (datetime): Only stock timelines before this time are compacted
+        archive_dir (str): Directory of the archive file, created if needed
+        downsample_before (Optional[datetime]): Stock timelines before this time are reduced to one per bucket
+        interval (str): Interval of the downsampled buckets
+    Returns:
+        dict[str, Any]: Number of deleted `noop` and `downsampled` stock timelines, their estimated size in
+            `bytes`, and the path and size of the `archive`.
+    """
+    row_size: Optional[float] = _get_row_size()
+    downsample_until_id: Optional[int] = None
+    read: Optional[tuple[datetime, int]] = StockTimelineWatermark.get_read_by_all()
+    if downsample_before is not None and read is not None:
+        downsample_before, downsample_until_id = min(downsample_before, read[0]), read[1]
+    counts: dict[str, int] = {NOOP: 0, DOWNSAMPLED: 0}
+    queryset: QuerySet = StockTimeline.objects.filter(timestamp__lt=before)
+    vending_machine_ids: list[int] = list(
+        queryset.order_by("vending_machine_id").values_list("vending_machine_id", flat=True).distinct()
+    )
+    os.makedirs(archive_dir, exist_ok=True)
+    path: str = os.path.join(archive_dir, f"stock_timelines_{timezone.now():%Y%m%dT%H%M%S%f}.ndjson.gz")
+    with gzip.open(path, "wt") as archive:
+        for offset in range(0, len(vending_machine_ids), COMPACTION_BATCH_SIZE):
+            rows: Iterator[tuple[Any, ...]] = _read_pages(
+                queryset.filter(vending_machine_id__in=vending_machine_ids[offset : offset + COMPACTION_BATCH_SIZE])
+            )
+            redundant: list[tuple[Any, ...]] = []
+            for row, reason in _find_redundant(rows, downsample_before, downsample_until_id, interval):
+                redundant.append(row)
+                counts[reason] += 1
+                if len(redundant) == COMPACTION_CHUNK_SIZE:
+                    _archive_and_delete(redundant, before, archive)
+                    redundant = []
+            if redundant:
+                _archive_and_delete(redundant, before, archive)
+    deleted: int = counts[NOOP] + counts[DOWNSAMPLED]
+    if deleted:
+        TableVersion.bump(StockTimeline)
+    else:
+        os.remove(path)
+    return {
+        **counts,
+        "bytes": round(deleted * row_size) if row_size is not None else None,
+        "archive": path if deleted else None,
+        "archive_bytes": os.path.getsize(path) if deleted else 0,
+    }
+
+
+def _read_pages(queryset: QuerySet) -> Iterator[tuple[Any, ...]]:
+    """
+    Return the given stock timelines ordered by vending machine, product and time, read a page at a time.
+
+    Every page is a query of its own after the last row of the previous one, rather than a cursor kept open, so the
+    rows already read can be deleted in between.
+
+    Params:
+        queryset (QuerySet): Stock timelines to be read
+    Returns:
+        Iterator[tuple[Any, ...]]: Rows of the export fields.
+    """
+    ordered: QuerySet = queryset.order_by("vending_machine_id", "product_id", "timestamp", "id").values_list(
+        *EXPORT_FIELDS
+    )
+    after: Q = Q()
+    while True:
+        page: list[tuple[Any, ...]] = list(ordered.filter(after)[:EXPORT_CHUNK_SIZE])
+        yield from page
+        if len(page) < EXPORT_CHUNK_SIZE:
+            return
+        row_id, vending_machine_id, product_id, _, timestamp = page[-1]
+        after = (
+            Q(vending_machine_id__gt=vending_machine_id)
+            | Q(vending_machine_id=vending_machine_id, product_id__gt=product_id)
+            | Q(vending_machine_id=vending_machine_id, product_id=product_id, timestamp__gt=timestamp)
+            | Q(vending_machine_id=vending_machine_id, product_id=product_id, timestamp=timestamp, id__gt=row_id)
+        )
+
+
+def _find_redundant(
+    rows: Iterator[tuple[Any, ...]],
+    downsample_before: Optional[datetime],
+    downsample_until_id: Optional[int],
+    interval: str,
+) -> Iterator[tuple[tuple[Any, ...], str]]:
+    """
+    Return the redundant stock timelines among the given ones, with the reason they are redundant.
+
+    Params:
+        rows (Iterator[tuple[Any, ...]]): Rows of the export fields, ordered by vending machine, product and time
+        downsample_before (Optional[datetime]): Stock timelines before this time are reduced to one per bucket
+        downsample_until_id (Optional[int]): Only stock timelines up to this id are downsampled, any by default
+        interval (str): Interval of the downsampled buckets
+    Returns:
+        Iterator[tuple[tuple[Any, ...], str]]: Redundant rows, and either `noop` or `downsampled`.
+    """
+    kept_key: Optional[tuple[int, int]] = None
+    kept_quantity: Optional[int] = None
+    pending: Optional[tuple[Any, ...]] = None
+    # Every row is decided once the next one is read, to know whether it is the last of its bucket.
+    for row in chain(rows, [None]):
+        if pending is not None:
+            key: tuple[int, int] = (pending[1], pending[2])
+            if (
+                downsample_before is not None
+                and row is not None
+                and (row[1], row[2]) == key
+                and row[4] < downsample_before
+                and (downsample_until_id is None or max(row[0], pending[0]) <= downsample_until_id)
+                and truncate(row[4], interval) == truncate(pending[4], interval)
+            ):
+                yield pending, DOWNSAMPLED
+            elif key == kept_key and pending[3] == kept_quantity:
+                yield pending, NOOP
+            else:
+                kept_key, kept_quantity = key, pending[3]
+        pending = row
+
+
+def _archive_and_delete(rows: list[tuple[Any, ...]], before: datetime, archive: IO[str]) -> None:
+    """
+    Write the given stock timelines to the archive, then delete them.
+
+    Params:
+        rows (list[tuple[Any, ...]]): Rows of the export fields
+        before (datetime): Time the rows are before, which restricts the delete to the partitions before it
+        archive (IO[str]): Archive file
+    """
+    archive.writelines(json.dumps(format_stock_timeline(row)) + "\n" for row in rows)
+    archive.flush()
+    StockTimeline.objects.filter(timestamp__lt=before, id__in=[row[0] for row in rows]).delete()
+
+
+def _get_row_size() -> Optional[float]:
+    """
+    Return the average size of a stock timeline in bytes, with its share of the indexes.
+
+    PostgreSQL estimates it from the statistics of every partition, SQLite from `dbstat` when it is available.
+
+    Returns:
+        Optional[float]: Bytes per row, or None if unknown.
+    """
+    table: str = StockTimeline._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT sum(pg_total_relation_size(relid)) / NULLIF(sum(greatest(reltuples, 0)), 0) "
+                "FROM pg_partition_tree(%s::regclass) JOIN pg_class ON pg_class.oid = relid",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            try:
+                cursor.execute(
+                    "SELECT (SELECT sum(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE tbl_name = %s)) * 1.0 / NULLIF(count(*), 0) "
+                    f"FROM {connection.ops.quote_name(table)}",
+                    [table],
+                )
+            except DatabaseError:
+                return None
+        else:
+            return None
+        size: Any = cursor.fetchone()[0]
+    return float(size) if size is not None else None
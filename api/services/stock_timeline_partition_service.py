@@ -0,0 +1,173 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Optional
+
+from django.db import connection, transaction
+from django.db.models import Min, QuerySet
+from django.utils import timezone
+
+from api.models.stock_checkpoint import StockCheckpoint
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_watermark import StockTimelineWatermark
+from api.models.table_version import TableVersion
+
+TABLE: str = StockTimeline._meta.db_table
+DEFAULT_PARTITION: str = f"{TABLE}_default"
+PARTITION_PREFIX: str = f"{TABLE}_p"
+
+
+def get_month(moment: datetime) -> datetime:
+    """
+    Return the start of the month of the given time, in UTC like the bounds of the partitions.
+
+    Params:
+        moment (datetime): Point in time
+    Returns:
+        datetime: First instant of the month.
+    """
+    return moment.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """
+    Return the start of the month the given number of months after the given one.
+
+    Params:
+        month (datetime): Start of a month
+        months (int): Number of months, negative for earlier months
+    Returns:
+        datetime: Start of the other month.
+    """
+    index: int = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def get_partition_name(month: datetime) -> str:
+    """
+    Return the name of the partition of the given month, e.g. `api_stocktimeline_p202610`.
+
+    Params:
+        month (datetime): Start of the month
+    Returns:
+        str: Name of the table.
+    """
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned() -> bool:
+    """
+    Return whether the stock timeline table is partitioned, which it is on PostgreSQL once migrated.
+
+    Returns:
+        bool: True if it is partitioned.
+    """
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)", [TABLE])
+        return cursor.fetchone()[0]
+
+
+def get_partitions() -> dict[datetime, str]:
+    """
+    Return the monthly partitions attached to the stock timeline table, without the default partition.
+
+    Returns:
+        dict[datetime, str]: Names of the partitions by start of their month.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = %s::regclass", [TABLE])
+        names: list[str] = [name for name, in cursor.fetchall() if name.startswith(PARTITION_PREFIX)]
+    return {
+        datetime.strptime(name[len(PARTITION_PREFIX) :], "%Y%m").replace(tzinfo=dt_timezone.utc): name for name in names
+    }
+
+
+def create_partitions(months_ahead: int, now: Optional[datetime] = None) -> list[str]:
+    """
+    Create the missing partitions of the current month and of the given number of months after it.
+
+    Stock timelines of those months which went to the default partition are moved to their partition.
+    Nothing is created when the table is not partitioned.
+
+    Params:
+        months_ahead (int): Number of months after the current one
+        now (Optional[datetime]): Current time, now by default
+    Returns:
+        list[str]: Names of the created partitions.
+    """
+    if not is_partitioned():
+        return []
+    month: datetime = get_month(now or timezone.now())
+    partitions: dict[datetime, str] = get_partitions()
+    created: list[str] = []
+    for start in (add_months(month, offset) for offset in range(months_ahead + 1)):
+        if start in partitions:
+            continue
+        name: str = get_partition_name(start)
+        bounds: list[datetime] = [start, add_months(start, 1)]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING CONSTRAINTS)")
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" >= %s AND "timestamp" < %s '
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved",
+                bounds,
+            )
+            cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)", bounds)
+        created.append(name)
+    return created
+
+
+def detach_partitions(keep_months: int, drop: bool = False, now: Optional[datetime] = None) -> list[str]:
+    """
+    Detach the partitions of the months before the kept ones, into standalone tables or dropped.
+
+    Stock timelines after the oldest stock checkpoint are never detached, since as_of queries rebuild the stocks
+    from any checkpoint, so nothing is detached without a checkpoint. Once stock timelines are detached, as_of
+    queries before the oldest checkpoint are refused. Without partitioning, the stock timelines of every month are
+    moved to a standalone table of the same name as its partition would have, or deleted.
+
+    Params:
+        keep_months (int): Number of months before the current one to be kept
+        drop (bool): Whether the detached stock timelines are dropped instead of kept in standalone tables
+        now (Optional[datetime]): Current time, now by default
+    Returns:
+        list[str]: Names of the detached partitions.
+    """
+    checkpoint: Optional[datetime] = StockCheckpoint.objects.aggregate(timestamp=Min("timestamp"))["timestamp"]
+    if checkpoint is None:
+        return []
+    cutoff: datetime = min(add_months(get_month(now or timezone.now()), -keep_months), checkpoint)
+    detached: list[str] = []
+    if is_partitioned():
+        for month, name in sorted(get_partitions().items()):
+            if add_months(month, 1) > cutoff:
+                break
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {name}")
+            detached.append(name)
+    else:
+        first: Optional[datetime] = StockTimeline.objects.aggregate(timestamp=Min("timestamp"))["timestamp"]
+        month = get_month(first or cutoff)
+        while add_months(month, 1) <= cutoff:
+            stock_timelines: QuerySet = StockTimeline.objects.filter(
+                timestamp__gte=month, timestamp__lt=add_months(month, 1)
+            )
+            if stock_timelines.exists():
+                name = get_partition_name(month)
+                with transaction.atomic():
+                    if not drop:
+                        sql, params = stock_timelines.query.sql_with_params()
+                        with connection.cursor() as cursor:
+                            cursor.execute(f"CREATE TABLE {name} AS {sql}", params)
+                    stock_timelines.delete()
+                detached.append(name)
+            month = add_months(month, 1)
+    if detached:
+        TableVersion.bump(StockTimeline)
+        StockTimelineWatermark.objects.update_or_create(
+            name=StockTimelineWatermark.DETACHED, defaults={"refreshed_at": cutoff}
+        )
+    return detached
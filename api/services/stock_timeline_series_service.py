@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterator, Optional
+
+from django.db import transaction
+from django.db.models import Count, DateTimeField, ExpressionWrapper, Max, Min, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_rollup import StockTimelineRollup
+from api.models.stock_timeline_watermark import StockTimelineWatermark
+
+INTERVAL_DELTAS: dict[str, timedelta] = {
+    StockTimelineRollup.HOUR: timedelta(hours=1),
+    StockTimelineRollup.DAY: timedelta(days=1),
+}
+ROLLUP_BATCH_SIZE: int = 5000
+SERIES_FIELDS: tuple[str, ...] = ("vending_machine", "product", "bucket", "last", "min", "max", "changes")
+
+
+def get_stock_timeline_series(filters: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return the stock timelines aggregated per (vending machine, product, bucket).
+
+    Buckets before the latest rolled-up bucket are read from the rollup table, the rest is aggregated from
+    the raw stock timelines. Stock timelines inserted later into older buckets show once they are rolled up.
+    A bucket is returned when its start is in [since, until).
+
+    Params:
+        filters (dict[str, Any]): Validated interval, vending_machine, product, since and until
+    Returns:
+        list[dict[str, Any]]: Buckets with the last, min and max quantity and the number of changes,
+            ordered by vending machine, product and bucket.
+    """
+    interval: str = filters["interval"]
+    since: Optional[datetime] = truncate(filters["since"], interval) if "since" in filters else None
+    until: Optional[datetime] = ceil(filters["until"], interval) if "until" in filters else None
+    rollups: QuerySet = StockTimelineRollup.objects.filter(interval=interval)
+    stock_timelines: QuerySet = StockTimeline.objects.all()
+    for key in ("vending_machine", "product"):
+        if key in filters:
+            rollups = rollups.filter(**{f"{key}_id": filters[key]})
+            stock_timelines = stock_timelines.filter(**{f"{key}_id": filters[key]})
+    if since is not None:
+        rollups = rollups.filter(bucket__gte=since)
+        stock_timelines = stock_timelines.filter(timestamp__gte=since)
+    if until is not None:
+        rollups = rollups.filter(bucket__lt=until)
+        stock_timelines = stock_timelines.filter(timestamp__lt=until)
+
+    series: list[dict[str, Any]] = []
+    watermark: Optional[datetime] = get_rollup_watermark(interval)
+    if watermark is not None:
+        series += rollups.filter(bucket__lt=watermark).values(*SERIES_FIELDS)
+        stock_timelines = stock_timelines.filter(timestamp__gte=watermark)
+    for batch in aggregate_stock_timelines(stock_timelines, interval):
+        series += batch
+    series.sort(key=lambda bucket: (bucket["vending_machine"], bucket["product"], bucket["bucket"]))
+    return series
+
+
+def rollup_stock_timelines(interval: str) -> int:
+    """
+    Aggregate the new stock timelines into the rollup table.
+
+    The stock timelines inserted since the previous rollup are found by id, whatever their timestamps, and every
+    bucket from the earliest of them on is recomputed.
+
+    Params:
+        interval (str): Interval of the buckets
+    Returns:
+        int: Number of saved buckets.
+    """
+    count: int = 0
+    with transaction.atomic():
+        watermark: StockTimelineWatermark = StockTimelineWatermark.lock(f"rollup_{interval}")
+        refreshed_at: datetime = timezone.now()
+        new: dict[str, Any] = watermark.get_new_stock_timelines().aggregate(timestamp=Min("timestamp"), id=Max("id"))
+        if new["timestamp"] is not None:
+            stock_timelines: QuerySet = StockTimeline.objects.filter(
+                timestamp__gte=truncate(new["timestamp"], interval)
+            )
+            for batch in aggregate_stock_timelines(stock_timelines, interval):
+                StockTimelineRollup.objects.bulk_create(
+                    [
+                        StockTimelineRollup(
+                            vending_machine_id=bucket["vending_machine"],
+                            product_id=bucket["product"],
+                            interval=interval,
+                            bucket=bucket["bucket"],
+                            last=bucket["last"],
+                            min=bucket["min"],
+                            max=bucket["max"],
+                            changes=bucket["changes"],
+                        )
+                        for bucket in batch
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["interval", "vending_machine", "product", "bucket"],
+                    update_fields=["last", "min", "max", "changes"],
+                )
+                count += len(batch)
+        watermark.advance(new["id"], refreshed_at)
+    return count
+
+
+def get_rollup_watermark(interval: str) -> Optional[datetime]:
+    """
+    Return the latest rolled-up bucket of the given interval.
+
+    Params:
+        interval (str): Interval of the buckets
+    Returns:
+        Optional[datetime]: Start of the latest bucket, or None if nothing is rolled up yet.
+    """
+    return StockTimelineRollup.objects.filter(interval=interval).aggregate(bucket=Max("bucket"))["bucket"]
+
+
+def aggregate_stock_timelines(stock_timelines: QuerySet, interval: str) -> Iterator[list[dict[str, Any]]]:
+    """
+    Aggregate the given stock timelines per (vending machine, product, bucket) in the database.
+
+    The last quantity of a bucket is the quantity of its latest stock timeline by (timestamp, id), read by a subquery
+    on the (vending machine, product, timestamp) index.
+
+    Params:
+        stock_timelines (QuerySet): Stock timelines to be aggregated
+        interval (str): Interval of the buckets
+    Returns:
+        Iterator[list[dict[str, Any]]]: Batches of buckets.
+    """
+    last: Subquery = Subquery(
+        StockTimeline.objects.filter(
+            vending_machine_id=OuterRef("vending_machine"),
+            product_id=OuterRef("product"),
+            timestamp__gte=OuterRef("bucket"),
+            timestamp__lt=ExpressionWrapper(
+                OuterRef("bucket") + INTERVAL_DELTAS[interval], output_field=DateTimeField()
+            ),
+        )
+        .order_by("-timestamp", "-id")
+        .values("quantity")[:1]
+    )
+    buckets: Iterator[dict[str, Any]] = (
+        stock_timelines.annotate(bucket=Trunc("timestamp", interval))
+        .values("vending_machine", "product", "bucket")
+        .annotate(min=Min("quantity"), max=Max("quantity"), changes=Count("id"), last=last)
+        .order_by("vending_machine", "product", "bucket")
+        .iterator(chunk_size=ROLLUP_BATCH_SIZE)
+    )
+    batch: list[dict[str, Any]] = []
+    for bucket in buckets:
+        batch.append(bucket)
+        if len(batch) >= ROLLUP_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def truncate(timestamp: datetime, interval: str) -> datetime:
+    """
+    Return the start of the bucket of the given timestamp, in the current time zone like `Trunc`.
+
+    Params:
+        timestamp (datetime): Timestamp to be truncated
+        interval (str): Interval of the buckets
+    Returns:
+        datetime: Start of the bucket.
+    """
+    local: datetime = timezone.localtime(timestamp).replace(minute=0, second=0, microsecond=0)
+    return local.replace(hour=0) if interval == StockTimelineRollup.DAY else local
+
+
+def ceil(timestamp: datetime, interval: str) -> datetime:
+    """
+    Return the start of the first bucket at or after the given timestamp.
+
+    Params:
+        timestamp (datetime): Timestamp to be rounded up
+        interval (str): Interval of the buckets
+    Returns:
+        datetime: Start of the bucket.
+    """
+    start: datetime = truncate(timestamp, interval)
+    return start if start == timestamp else start + INTERVAL_DELTAS[interval]
@@ -0,0 +1,161 @@
+import csv
+import json
+from datetime import datetime
+from typing import Any, Iterator
+
+from django.db.models import QuerySet
+
+from api.serializers.stock_timeline_filter_serializer import StockTimelineFilterSerializer
+
+NDJSON: str = "ndjson"
+CSV: str = "csv"
+EXPORT_FORMATS: tuple[str, str] = (NDJSON, CSV)
+EXPORT_FIELDS: tuple[str, str, str, str, str] = ("id", "vending_machine_id", "product_id", "quantity", "timestamp")
+EXPORT_HEADER: tuple[str, str, str, str, str] = ("id", "vending_machine", "product", "quantity", "timestamp")
+EXPORT_CHUNK_SIZE: int = 2000
+EXPORT_BUFFER_SIZE: int = 64 * 1024
+
+
+def filter_stock_timelines(queryset: QuerySet, query_params: Any) -> QuerySet:
+    """
+    Filter the given stock timelines by vending_machine, product, since and until.
+
+    Params:
+        queryset (QuerySet): Stock timelines to be filtered
+        query_params (Any): Query parameters with the filters
+    Returns:
+        QuerySet: Filtered stock timelines.
+    """
+    serializer: StockTimelineFilterSerializer = StockTimelineFilterSerializer(data=query_params)
+    serializer.is_valid(raise_exception=True)
+    filters: dict[str, Any] = serializer.validated_data
+    if "vending_machine" in filters:
+        queryset = queryset.filter(vending_machine_id=filters["vending_machine"])
+    if "product" in filters:
+        queryset = queryset.filter(product_id=filters["product"])
+    if "since" in filters:
+        queryset = queryset.filter(timestamp__gte=filters["since"])
+    if "until" in filters:
+        queryset = queryset.filter(timestamp__lt=filters["until"])
+    return queryset
+
+
+def export_stock_timelines(
+    queryset: QuerySet, export_format: str, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Stream the given stock timelines as NDJSON or CSV lines, ordered by timestamp.
+
+    Rows are read as tuples through a server-side cursor in chunks, so memory use does not grow with the table.
+
+    Params:
+        queryset (QuerySet): Stock timelines to be exported
+        export_format (str): Either `ndjson` or `csv`
+        chunk_size (int): Number of rows fetched from the database at a time
+    Returns:
+        Iterator[str]: Lines of the export.
+    """
+    rows: Iterator[tuple[Any, ...]] = (
+        queryset.order_by("timestamp", "id").values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    )
+    if export_format == NDJSON:
+        return _buffer(_render_ndjson(rows))
+    if export_format == CSV:
+        return _buffer(_render_csv(rows))
+    raise ValueError(f'Invalid export format "{export_format}".')
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """
+    Format the given timestamp the same way as the stock timeline serializer.
+
+    Params:
+        timestamp (datetime): Timestamp to be formatted
+    Returns:
+        str: ISO 8601 timestamp.
+    """
+    value: str = timestamp.isoformat()
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+def format_stock_timeline(row: tuple[Any, ...]) -> dict[str, Any]:
+    """
+    Format the given row the same way as the stock timeline serializer.
+
+    Params:
+        row (tuple[Any, ...]): Row of the export fields
+    Returns:
+        dict[str, Any]: Stock timeline.
+    """
+    stock_timeline_id, vending_machine, product, quantity, timestamp = row
+    return {
+        "id": stock_timeline_id,
+        "vending_machine": vending_machine,
+        "product": product,
+        "quantity": quantity,
+        "timestamp": _format_timestamp(timestamp),
+    }
+
+
+def _render_ndjson(rows: Iterator[tuple[Any, ...]]) -> Iterator[str]:
+    """
+    Render the given rows as one JSON object per line.
+
+    Params:
+        rows (Iterator[tuple[Any, ...]]): Rows of the export fields
+    Returns:
+        Iterator[str]: NDJSON lines.
+    """
+    for row in rows:
+        yield json.dumps(format_stock_timeline(row)) + "\n"
+
+
+def _render_csv(rows: Iterator[tuple[Any, ...]]) -> Iterator[str]:
+    """
+    Render the given rows as CSV lines with a header.
+
+    Params:
+        rows (Iterator[tuple[Any, ...]]): Rows of the export fields
+    Returns:
+        Iterator[str]: CSV lines.
+    """
+    writer: Any = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for stock_timeline_id, vending_machine, product, quantity, timestamp in rows:
+        yield writer.writerow((stock_timeline_id, vending_machine, product, quantity, _format_timestamp(timestamp)))
+
+
+def _buffer(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Join the given lines into chunks of about `EXPORT_BUFFER_SIZE` characters, to avoid writing tiny chunks.
+
+    Params:
+        lines (Iterator[str]): Lines to be joined
+    Returns:
+        Iterator[str]: Chunks of lines.
+    """
+    chunk: list[str] = []
+    size: int = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk)
+
+
+class _Echo:
+    """File-like object which returns what is written, so that `csv.writer` renders a single line."""
+
+    def write(self, value: str) -> str:
+        """
+        Return the given value.
+
+        Params:
+            value (str): Value to be written
+        Returns:
+            str: Given value.
+        """
+        return value
@@ -0,0 +1,171 @@
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from api.models.stock_timeline import StockTimeline
+from api.models.table_version import TableVersion
+from api.services.stock_feed_service import publish_stock_timelines
+
+ASYNC: str = "async"
+SYNC: str = "sync"
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class StockTimelineWriter:
+    """
+    In-process queue of stock timelines, written with `bulk_create` by a background thread.
+
+    A batch is written once `STOCK_TIMELINE_BATCH_SIZE` stock timelines are queued, or every
+    `STOCK_TIMELINE_FLUSH_INTERVAL` seconds. The thread starts with the first stock timeline, and the queue is
+    flushed when the process exits. Once `STOCK_TIMELINE_QUEUE_SIZE` stock timelines are queued, the next ones are
+    written by their callers, so the queue stays bounded while the database is down.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the empty queue."""
+        self.condition: threading.Condition = threading.Condition()
+        self.pending: list[StockTimeline] = []
+        self.thread: Optional[threading.Thread] = None
+        self.closed: bool = False
+        self.registered: bool = False
+
+    def put(self, stock_timeline: StockTimeline) -> None:
+        """
+        Queue the given stock timeline, or write it in the current thread when the queue is full.
+
+        Params:
+            stock_timeline (StockTimeline): Unsaved stock timeline
+        """
+        with self.condition:
+            full: bool = len(self.pending) >= settings.STOCK_TIMELINE_QUEUE_SIZE
+            if not full:
+                self.pending.append(stock_timeline)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="stock-timeline-writer", daemon=True)
+                self.thread.start()
+                if not self.registered:
+                    atexit.register(self.close)
+                    self.registered = True
+            if len(self.pending) >= settings.STOCK_TIMELINE_BATCH_SIZE:
+                self.condition.notify()
+        if full:
+            self.write([stock_timeline])
+
+    def run(self) -> None:
+        """Write the queued stock timelines in batches until the writer is closed."""
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.closed or len(self.pending) >= settings.STOCK_TIMELINE_BATCH_SIZE,
+                    timeout=settings.STOCK_TIMELINE_FLUSH_INTERVAL,
+                )
+                if self.closed:
+                    return
+            close_old_connections()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the queued stock timelines in the current thread.
+
+        When a batch cannot be written, its stock timelines are written one by one. Those rejected by the database,
+        such as stock timelines of a deleted product, are logged and dropped. The others are queued again if the
+        database cannot be reached, to be retried by the next flush.
+
+        Returns:
+            int: Number of stock timelines written.
+        """
+        with self.condition:
+            stock_timelines, self.pending = self.pending, []
+        if not stock_timelines:
+            return 0
+        try:
+            self.write(stock_timelines)
+            return len(stock_timelines)
+        except Exception:
+            logger.warning("Could not write %d stock timelines, writing them one by one.", len(stock_timelines))
+        written: int = 0
+        for index, stock_timeline in enumerate(stock_timelines):
+            try:
+                self.write([stock_timeline])
+                written += 1
+            except (DataError, IntegrityError):
+                logger.exception(
+                    "Dropped the stock timeline of vending machine %s and product %s.",
+                    stock_timeline.vending_machine_id,
+                    stock_timeline.product_id,
+                )
+            except Exception:
+                logger.exception(
+                    "Could not write %d stock timelines, retrying with the next flush.", len(stock_timelines) - index
+                )
+                with self.condition:
+                    self.pending[:0] = stock_timelines[index:]
+                break
+        return written
+
+    @staticmethod
+    def write(stock_timelines: list[StockTimeline]) -> None:
+        """
+        Write the given stock timelines in one transaction, and publish them once it commits.
+
+        Params:
+            stock_timelines (list[StockTimeline]): Unsaved stock timelines
+        """
+        with transaction.atomic():
+            StockTimeline.objects.bulk_create(stock_timelines, batch_size=settings.STOCK_TIMELINE_BATCH_SIZE)
+            TableVersion.bump(StockTimeline)
+            publish_stock_timelines(stock_timelines)
+
+    def close(self) -> None:
+        """Stop the thread and write the remaining stock timelines. The writer restarts with the next one queued."""
+        with self.condition:
+            thread: Optional[threading.Thread] = self.thread
+            self.closed = True
+            self.condition.notify()
+        if thread is not None:
+            thread.join()
+        with self.condition:
+            self.thread = None
+            self.closed = False
+        self.flush()
+
+
+stock_timeline_writer: StockTimelineWriter = StockTimelineWriter()
+
+
+def write_stock_timeline(vending_machine_id: int, product_id: int, quantity: int) -> None:
+    """
+    Save the stock timeline of a stock write, now or through the queue depending on `STOCK_TIMELINE_WRITER`.
+
+    Queued stock timelines keep the time of the stock write, and are only queued once its transaction commits.
+
+    Params:
+        vending_machine_id (int): Id of the vending machine of the stock
+        product_id (int): Id of the product of the stock
+        quantity (int): Quantity of the stock
+    """
+    if settings.STOCK_TIMELINE_WRITER != ASYNC:
+        publish_stock_timelines(
+            [
+                StockTimeline.objects.create(
+                    vending_machine_id=vending_machine_id, product_id=product_id, quantity=quantity
+                )
+            ]
+        )
+        return
+    timestamp: datetime = timezone.now()
+    transaction.on_commit(
+        lambda: stock_timeline_writer.put(
+            StockTimeline(
+                vending_machine_id=vending_machine_id, product_id=product_id, quantity=quantity, timestamp=timestamp
+            )
+        )
+    )
@@ -0,0 +1,33 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.table_version import TableVersion
+from api.models.vending_machine import VendingMachine
+from api.services.cache_service import get_namespace, invalidate
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=VendingMachine)
+def product_or_vending_machine_saved(sender: Any, **kwargs) -> None:
+    """When product or vending machine is saved, invalidate its cached data on commit and bump its table version."""
+    transaction.on_commit(lambda: invalidate(get_namespace(sender)))
+    TableVersion.bump(sender)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=VendingMachine)
+def product_or_vending_machine_deleted(sender: Any, **kwargs) -> None:
+    """
+    When product or vending machine is deleted with its stocks, invalidate its cache and bump versions.
+
+    The cache is invalidated right away as well as on commit, so that stocks validated against cached instances
+    in the same transaction do not reference the deleted one.
+    """
+    invalidate(get_namespace(sender))
+    transaction.on_commit(lambda: invalidate(get_namespace(sender)))
+    TableVersion.bump(sender, Stock)
@@ -0,0 +1,19 @@
+import io
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from benchmarks import bench_serializers
+
+
+class TestBenchSerializers(SimpleTestCase):
+    """Test serializer benchmark, run with a few rows so that it follows the serializers."""
+
+    def test_bench_serializers_should_measure_every_serializer(self) -> None:
+        """Test serializer benchmark where the rows of every model are serialized before and after."""
+        stdout: io.StringIO = io.StringIO()
+        with patch("sys.argv", ["bench_serializers", "--rows", "4", "--repeat", "1"]), redirect_stdout(stdout):
+            bench_serializers.main()
+        for name in ("VendingMachineSerializer", "ProductSerializer", "StockSerializer", "StockTimelineSerializer"):
+            self.assertIn(name, stdout.getvalue())
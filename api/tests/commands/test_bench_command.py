@@ -0,0 +1,51 @@
+import io
+import json
+from typing import Any
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from api.models.stock_timeline import StockTimeline
+from api.urls import router
+
+
+class TestBenchCommand(TestCase):
+    """Test bench command."""
+
+    def test_bench_should_pass(self) -> None:
+        """Test bench seeds the fleet and measures every endpoint of the router, except the endless stock feed."""
+        stdout: io.StringIO = io.StringIO()
+        call_command(
+            "bench",
+            "--no-test-db",
+            *("--vending-machines", "3", "--products", "2", "--stocks-per-vending-machine", "2"),
+            *("--stock-timelines", "20", "--requests", "2", "--warmup", "0"),
+            stdout=stdout,
+            stderr=io.StringIO(),
+        )
+        report: dict[str, Any] = json.loads(stdout.getvalue())
+        names: set[str] = {result["name"] for result in report["results"]}
+        self.assertEqual(
+            report["fleet"],
+            {"vending_machines": 3, "products": 2, "stock_thresholds": 2, "stocks": 6, "stock_timelines": 20},
+        )
+        self.assertTrue(
+            {url.name for url in router.urls if url.name not in ("api-root", "stocktimeline-feed")} <= names
+        )
+        self.assertTrue({"cache-stats", "metrics"} <= names)
+        self.assertTrue(all(result["queries"]["max"] < 20 for result in report["results"]))
+        self.assertEqual(StockTimeline.objects.count(), 20 + 2 * (6 + 1 + 1 + 2 * 6))
+
+    def test_bench_should_fail_when_endpoint_is_unknown(self) -> None:
+        """Test bench with invalid arguments where no endpoint has the given name."""
+        with self.assertRaises(CommandError):
+            call_command(
+                "bench",
+                "--no-test-db",
+                "--endpoint",
+                "x",
+                "--stock-timelines",
+                "1",
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
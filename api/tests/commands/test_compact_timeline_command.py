@@ -0,0 +1,150 @@
+import gzip
+import io
+import json
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models.stock import Stock
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_watermark import StockTimelineWatermark
+from api.tests.utils import save_stock
+
+
+class TestCompactTimelineCommand(TestCase):
+    """Test compact_timeline command."""
+
+    def setUp(self) -> None:
+        """Save a stock, and an archive directory."""
+        self.stock: Stock = save_stock()
+        self.start: datetime = timezone.now().replace(hour=1, minute=0, second=0, microsecond=0) - timedelta(days=10)
+        archive_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.archive_dir: str = archive_dir.name
+
+    def save_stock_timelines(self, quantities: list[tuple[timedelta, int]]) -> list[int]:
+        """
+        Save stock timelines of the stock at the given times after the start.
+
+        Params:
+            quantities (list[tuple[timedelta, int]]): Time after the start and quantity of every stock timeline
+        Returns:
+            list[int]: Ids of the stock timelines.
+        """
+        return [
+            StockTimeline.objects.create(
+                vending_machine=self.stock.vending_machine,
+                product=self.stock.product,
+                quantity=quantity,
+                timestamp=self.start + delta,
+            ).id
+            for delta, quantity in quantities
+        ]
+
+    def compact(self, *args: str) -> str:
+        """
+        Run the command with the archive directory and the given arguments.
+
+        Params:
+            args (str): Arguments of the command
+        Returns:
+            str: Output of the command.
+        """
+        stdout: io.StringIO = io.StringIO()
+        call_command("compact_timeline", "--archive-dir", self.archive_dir, *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def read_archive(self, output: str) -> list[dict[str, Any]]:
+        """
+        Return the stock timelines of the archive reported in the given output.
+
+        Params:
+            output (str): Output of the command
+        Returns:
+            list[dict[str, Any]]: Archived stock timelines.
+        """
+        path: str = output.split("Archived them to ")[1].split(" (")[0]
+        with gzip.open(path, "rt") as archive:
+            return [json.loads(line) for line in archive]
+
+    def test_compact_timeline_should_delete_noop_stock_timelines(self) -> None:
+        """Test compact timeline where stock timelines repeating the previous quantity are archived and deleted."""
+        ids: list[int] = self.save_stock_timelines(
+            [(timedelta(), 5), (timedelta(hours=1), 5), (timedelta(hours=2), 3), (timedelta(hours=3), 3)]
+        )
+        output: str = self.compact()
+        self.assertIn("2 no-op and 0 downsampled", output)
+        self.assertEqual([row["id"] for row in self.read_archive(output)], [ids[1], ids[3]])
+        self.assertEqual(
+            list(StockTimeline.objects.filter(id__in=ids).order_by("id").values_list("id", flat=True)), [ids[0], ids[2]]
+        )
+
+    def test_compact_timeline_should_downsample_old_stock_timelines(self) -> None:
+        """Test compact timeline where old stock timelines are reduced to the last one per day, then to changes."""
+        ids: list[int] = self.save_stock_timelines(
+            [
+                (timedelta(), 5),
+                (timedelta(hours=1), 6),
+                (timedelta(days=1), 3),
+                (timedelta(days=1, hours=1), 6),
+                (timedelta(days=8), 4),
+                (timedelta(days=8, hours=1), 2),
+            ]
+        )
+        output: str = self.compact("--downsample-days", "5")
+        self.assertIn("1 no-op and 2 downsampled", output)
+        self.assertEqual(sorted(row["id"] for row in self.read_archive(output)), [ids[0], ids[2], ids[3]])
+        self.assertEqual(
+            list(StockTimeline.objects.filter(id__in=ids).order_by("id").values_list("id", flat=True)),
+            [ids[1], ids[4], ids[5]],
+        )
+
+    def test_compact_timeline_should_not_downsample_stock_timelines_not_yet_refreshed(self) -> None:
+        """Test compact timeline where stock timelines a refresh did not read yet are not downsampled."""
+        ids: list[int] = self.save_stock_timelines(
+            [(timedelta(), 5), (timedelta(hours=1), 6), (timedelta(days=1), 3), (timedelta(days=1, hours=1), 6)]
+        )
+        StockTimelineWatermark.objects.create(name="rollup_day", stock_timeline_id=ids[3], refreshed_at=timezone.now())
+        StockTimelineWatermark.objects.create(name="consumption", stock_timeline_id=ids[1], refreshed_at=timezone.now())
+        output: str = self.compact("--downsample-days", "5")
+        self.assertIn("0 no-op and 1 downsampled", output)
+        self.assertEqual([row["id"] for row in self.read_archive(output)], [ids[0]])
+
+    def test_compact_timeline_should_not_downsample_stock_timelines_after_refresh(self) -> None:
+        """Test compact timeline where stock timelines after the previous refresh, minus the grace, are kept."""
+        ids: list[int] = self.save_stock_timelines(
+            [(timedelta(), 5), (timedelta(hours=1), 6), (timedelta(days=1), 3), (timedelta(days=1, hours=1), 6)]
+        )
+        StockTimelineWatermark.objects.create(
+            name="consumption", stock_timeline_id=ids[3], refreshed_at=self.start + timedelta(days=1)
+        )
+        output: str = self.compact("--downsample-days", "5")
+        self.assertIn("0 no-op and 1 downsampled", output)
+        self.assertEqual([row["id"] for row in self.read_archive(output)], [ids[0]])
+
+    @patch("api.services.stock_timeline_compaction_service.EXPORT_CHUNK_SIZE", 2)
+    @patch("api.services.stock_timeline_compaction_service.COMPACTION_CHUNK_SIZE", 1)
+    def test_compact_timeline_should_delete_while_reading_pages(self) -> None:
+        """Test compact timeline where redundant stock timelines are deleted between the pages they are read in."""
+        ids: list[int] = self.save_stock_timelines([(timedelta(hours=hours), 5) for hours in range(5)])
+        output: str = self.compact()
+        self.assertIn("4 no-op and 0 downsampled", output)
+        self.assertEqual([row["id"] for row in self.read_archive(output)], ids[1:])
+        self.assertEqual(list(StockTimeline.objects.filter(id__in=ids).values_list("id", flat=True)), ids[:1])
+
+    def test_compact_timeline_should_not_archive_without_redundant_stock_timelines(self) -> None:
+        """Test compact timeline where nothing is deleted nor archived."""
+        self.save_stock_timelines([(timedelta(), 5), (timedelta(hours=1), 6)])
+        output: str = self.compact()
+        self.assertIn("Deleted 0 stock timelines", output)
+        self.assertNotIn("Archived", output)
+
+    def test_compact_timeline_should_fail_when_downsample_days_is_less_than_keep_days(self) -> None:
+        """Test compact timeline with invalid arguments where downsampled stock timelines would be kept."""
+        with self.assertRaises(CommandError):
+            self.compact("--keep-days", "3", "--downsample-days", "2")
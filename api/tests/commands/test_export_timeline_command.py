@@ -0,0 +1,32 @@
+import io
+import json
+from typing import Any
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.tests.utils import save_stock
+
+
+class TestExportTimelineCommand(TestCase):
+    """Test export_timeline command."""
+
+    def test_export_timeline_should_pass(self) -> None:
+        """Test export timeline as NDJSON filtered by product."""
+        saved_stock: Stock = save_stock()
+        other_product: Product = Product.objects.create(name="other", cost="1.00")
+        vending_machine: VendingMachine = saved_stock.vending_machine
+        Stock.objects.create(vending_machine=vending_machine, product=other_product, quantity=1)
+        stdout: io.StringIO = io.StringIO()
+        call_command("export_timeline", "--product", str(saved_stock.product.id), stdout=stdout)
+        rows: list[dict[str, Any]] = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["quantity"], saved_stock.quantity)
+
+    def test_export_timeline_should_fail_when_since_is_invalid(self) -> None:
+        """Test export timeline with invalid arguments where since is not a timestamp."""
+        with self.assertRaises(CommandError):
+            call_command("export_timeline", "--since", "x", stdout=io.StringIO())
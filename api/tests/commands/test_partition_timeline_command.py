@@ -0,0 +1,96 @@
+import io
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+
+from api.models.stock import Stock
+from api.models.stock_checkpoint import StockCheckpoint
+from api.models.stock_timeline import StockTimeline
+from api.services.stock_timeline_partition_service import get_month, get_partition_name
+from api.tests.utils import save_stock
+
+
+class TestPartitionTimelineCommand(TestCase):
+    """Test partition_timeline command, on the single stock timeline table of databases without partitioning."""
+
+    def setUp(self) -> None:
+        """Save a stock with a stock timeline of more than a year ago."""
+        self.stock: Stock = save_stock()
+        self.old_timestamp: datetime = timezone.now() - timedelta(days=400)
+        StockTimeline.objects.create(
+            vending_machine=self.stock.vending_machine,
+            product=self.stock.product,
+            quantity=7,
+            timestamp=self.old_timestamp,
+        )
+
+    def save_checkpoint(self) -> None:
+        """Save a stock checkpoint of a month ago."""
+        StockCheckpoint.objects.create(
+            vending_machine=self.stock.vending_machine,
+            product=self.stock.product,
+            quantity=7,
+            timestamp=timezone.now() - timedelta(days=31),
+        )
+
+    def test_partition_timeline_should_detach_old_months(self) -> None:
+        """Test partition timeline where the stock timelines of old months are moved to a table per month."""
+        self.save_checkpoint()
+        stdout: io.StringIO = io.StringIO()
+        call_command("partition_timeline", "--keep-months", "2", stdout=stdout)
+        name: str = get_partition_name(get_month(self.old_timestamp))
+        self.assertIn("Detached 1 stock timeline partitions.", stdout.getvalue())
+        self.assertIn(name, stdout.getvalue())
+        self.assertEqual(list(StockTimeline.objects.values_list("quantity", flat=True)), [self.stock.quantity])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT quantity FROM {name}")
+            self.assertEqual(cursor.fetchall(), [(7,)])
+
+    def test_partition_timeline_should_drop_old_months(self) -> None:
+        """Test partition timeline with drop where the stock timelines of old months are deleted."""
+        self.save_checkpoint()
+        call_command("partition_timeline", "--keep-months", "2", "--drop", stdout=io.StringIO())
+        self.assertEqual(StockTimeline.objects.count(), 1)
+        self.assertNotIn(get_partition_name(get_month(self.old_timestamp)), connection.introspection.table_names())
+
+    def test_partition_timeline_should_keep_months_after_checkpoint(self) -> None:
+        """Test partition timeline where nothing is detached without a stock checkpoint."""
+        stdout: io.StringIO = io.StringIO()
+        call_command("partition_timeline", "--keep-months", "0", stdout=stdout)
+        self.assertIn("Detached 0 stock timeline partitions.", stdout.getvalue())
+        self.assertEqual(StockTimeline.objects.count(), 2)
+
+    def test_partition_timeline_should_fail_when_keep_months_is_negative(self) -> None:
+        """Test partition timeline with invalid arguments where the number of kept months is negative."""
+        with self.assertRaises(CommandError):
+            call_command("partition_timeline", "--keep-months", "-1", stdout=io.StringIO())
+
+    def test_partition_timeline_should_keep_months_after_oldest_checkpoint(self) -> None:
+        """Test partition timeline where the months after the oldest of several stock checkpoints are kept."""
+        self.save_checkpoint()
+        StockCheckpoint.objects.create(
+            vending_machine=self.stock.vending_machine,
+            product=self.stock.product,
+            quantity=7,
+            timestamp=self.old_timestamp - timedelta(days=1),
+        )
+        stdout: io.StringIO = io.StringIO()
+        call_command("partition_timeline", "--keep-months", "0", stdout=stdout)
+        self.assertIn("Detached 0 stock timeline partitions.", stdout.getvalue())
+        self.assertEqual(StockTimeline.objects.count(), 2)
+
+    def test_partition_timeline_should_refuse_as_of_before_oldest_checkpoint(self) -> None:
+        """Test stock list as of a time before the oldest stock checkpoint once old months are detached."""
+        self.save_checkpoint()
+        call_command("partition_timeline", "--keep-months", "2", stdout=io.StringIO())
+        as_of: datetime = self.old_timestamp + timedelta(days=1)
+        response: Any = self.client.get("/stock/", {"as_of": as_of.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("as_of", response.json())
+        response = self.client.get("/stock/", {"as_of": timezone.now().isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,117 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.utils import ConnectionDoesNotExist
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from api.middleware.replica_middleware import STICKY_COOKIE
+from api.models.stock_timeline import StockTimeline
+from api.models.vending_machine import VendingMachine
+from api.routers.replica_router import ReplicaRouter, read_from_replica, replica_scope
+from api.services.cache_service import get_cache
+from api.views.vending_machine_view import VendingMachineView
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"], DATABASE_REPLICA_LAG_CHECK_INTERVAL=float("inf"))
+class TestReplicaRouter(SimpleTestCase):
+    """Test replica router, outside of the transaction of TestCase since reads inside one go to default."""
+
+    databases: set[str] = {"default"}
+    content_type: str = "application/json"
+
+    def setUp(self) -> None:
+        """Record the replicas as up to date, since they do not exist here."""
+        ReplicaRouter.lags.update({"replica_0": (0.0, 0.0), "replica_1": (0.0, 0.0)})
+
+    def tearDown(self) -> None:
+        """Forget the recorded lags."""
+        ReplicaRouter.lags.clear()
+
+    def test_db_for_read_should_return_replica_inside_read_from_replica(self) -> None:
+        """Test db for read where only the reads inside read_from_replica go to a replica."""
+        router: ReplicaRouter = ReplicaRouter()
+        with replica_scope():
+            self.assertEqual(router.db_for_read(VendingMachine), "default")
+            with read_from_replica():
+                self.assertEqual(router.db_for_read(VendingMachine), "replica_0")
+            self.assertEqual(router.db_for_read(VendingMachine), "default")
+
+    def test_db_for_read_should_return_replica_for_replica_models(self) -> None:
+        """Test db for read where the models of DATABASE_REPLICA_MODELS always go to a replica."""
+        with replica_scope():
+            self.assertEqual(ReplicaRouter().db_for_read(StockTimeline), "replica_0")
+
+    def test_db_for_read_should_return_default_without_replica(self) -> None:
+        """Test db for read where no replica is configured."""
+        with override_settings(DATABASE_REPLICAS=[]), replica_scope():
+            self.assertEqual(ReplicaRouter().db_for_read(StockTimeline), "default")
+
+    def test_db_for_read_should_return_default_after_write(self) -> None:
+        """Test db for read where a read after a write of the same request goes to default."""
+        router: ReplicaRouter = ReplicaRouter()
+        with replica_scope():
+            self.assertEqual(router.db_for_write(StockTimeline), "default")
+            self.assertEqual(router.db_for_read(StockTimeline), "default")
+
+    def test_db_for_read_should_return_default_when_sticky_or_in_transaction(self) -> None:
+        """Test db for read within the sticky window of a write, and inside a transaction."""
+        with replica_scope(primary=True):
+            self.assertEqual(ReplicaRouter().db_for_read(StockTimeline), "default")
+        with replica_scope(), transaction.atomic():
+            self.assertEqual(ReplicaRouter().db_for_read(StockTimeline), "default")
+
+    def test_db_for_read_should_skip_lagging_replica(self) -> None:
+        """Test db for read where a replica lagging more than DATABASE_REPLICA_MAX_LAG is skipped."""
+        router: ReplicaRouter = ReplicaRouter()
+        ReplicaRouter.lags["replica_0"] = (0.0, 100.0)
+        with override_settings(DATABASE_REPLICAS=["replica_0", "replica_1"]), replica_scope():
+            self.assertEqual(router.db_for_read(StockTimeline), "replica_1")
+            ReplicaRouter.lags["replica_1"] = (0.0, 100.0)
+            self.assertEqual(router.db_for_read(StockTimeline), "default")
+
+    def test_allow_migrate_should_skip_replicas(self) -> None:
+        """Test allow migrate where replicas are not migrated."""
+        self.assertTrue(ReplicaRouter().allow_migrate("default", "api"))
+        self.assertFalse(ReplicaRouter().allow_migrate("replica_0", "api"))
+
+    def test_list_and_retrieve_should_read_from_replica(self) -> None:
+        """Test list and retrieve vending machine where reads are sent to the replica, which does not exist here."""
+        for path in ("/vending-machine/", "/vending-machine/1/"):
+            with self.assertRaisesMessage(ConnectionDoesNotExist, "replica_0"):
+                self.client.get(path)
+
+    def test_write_should_use_default_and_stick_reads_to_default(self) -> None:
+        """Test create vending machine, after which the reads of the same client go to default for a while."""
+        response: Any = self.client.post(
+            "/vending-machine/", data={"name": "name", "location": "location"}, content_type=self.content_type
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.addCleanup(VendingMachine.objects.filter(id=response.data["id"]).delete)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        vending_machine_id: int = response.data["id"]
+        response = self.client.get(f"/vending-machine/{vending_machine_id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], vending_machine_id)
+
+    @override_settings(API_CACHE_ENABLED=True)
+    def test_cached_response_should_be_read_from_default_and_skipped_when_sticky(self) -> None:
+        """Test cached list vending machine where a miss reads from default, and the sticky window skips the cache."""
+        get_cache().clear()
+        request: Request = Request(APIRequestFactory().get("/vending-machine/"))
+        reads: list[str] = []
+
+        def get_response() -> Response:
+            """Record the database of the read, which is not queried."""
+            reads.append(ReplicaRouter().db_for_read(VendingMachine))
+            return Response([])
+
+        with replica_scope(), read_from_replica():
+            for _ in range(2):
+                VendingMachineView().get_cached_response(request, get_response)
+        with replica_scope(primary=True):
+            VendingMachineView().get_cached_response(request, get_response)
+        self.assertEqual(reads, ["default", "default"])
@@ -0,0 +1,69 @@
+from typing import Any
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from api.models.stock import Stock
+from api.models.stock_timeline import StockTimeline
+from api.models.table_version import TableVersion
+from api.services.stock_timeline_writer import stock_timeline_writer
+from api.tests.utils import save_product, save_vending_machine
+
+
+@override_settings(STOCK_TIMELINE_WRITER="async", STOCK_TIMELINE_FLUSH_INTERVAL=60)
+class TestStockTimelineWriter(TestCase):
+    """Test stock timelines queued by the asynchronous stock timeline writer."""
+
+    content_type: str = "application/json"
+
+    def tearDown(self) -> None:
+        """Stop the writer."""
+        stock_timeline_writer.close()
+
+    def test_write_stock_timeline_should_be_queued_until_flushed(self) -> None:
+        """Test stock save where the stock timeline is written in a batch when the writer is closed."""
+        new_stock: dict[str, Any] = {
+            "vending_machine": save_vending_machine().id,
+            "product": save_product().id,
+            "quantity": 3,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response: Any = self.client.post("/stock/", data=new_stock, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(StockTimeline.objects.exists())
+        version: int = TableVersion.objects.get(name=StockTimeline._meta.db_table).version
+        with self.captureOnCommitCallbacks(execute=True):
+            stock_timeline_writer.close()
+        self.assertEqual(list(StockTimeline.objects.values_list("quantity", flat=True)), [3])
+        self.assertEqual(TableVersion.objects.get(name=StockTimeline._meta.db_table).version, version + 1)
+
+    def test_write_stock_timeline_should_be_dropped_on_rollback(self) -> None:
+        """Test stock save where the stock timeline is not queued when the transaction does not commit."""
+        Stock(vending_machine=save_vending_machine(), product=save_product(), quantity=3).save()
+        self.assertEqual(stock_timeline_writer.flush(), 0)
+        self.assertFalse(StockTimeline.objects.exists())
+
+    def test_flush_should_drop_failing_stock_timeline(self) -> None:
+        """Test flush where a stock timeline the database rejects is dropped and the rest of the batch is written."""
+        vending_machine_id: int = save_vending_machine().id
+        product_id: int = save_product().id
+        for quantity in (1, -1, 2):
+            stock_timeline_writer.put(
+                StockTimeline(vending_machine_id=vending_machine_id, product_id=product_id, quantity=quantity)
+            )
+        with self.assertLogs("api.services.stock_timeline_writer", level="ERROR"):
+            self.assertEqual(stock_timeline_writer.flush(), 2)
+        self.assertEqual(list(StockTimeline.objects.order_by("id").values_list("quantity", flat=True)), [1, 2])
+        self.assertEqual(stock_timeline_writer.flush(), 0)
+
+    @override_settings(STOCK_TIMELINE_QUEUE_SIZE=1)
+    def test_put_should_write_stock_timeline_when_queue_is_full(self) -> None:
+        """Test put where the stock timeline is written by the caller once the queue is full."""
+        vending_machine_id: int = save_vending_machine().id
+        product_id: int = save_product().id
+        for quantity in (1, 2):
+            stock_timeline_writer.put(
+                StockTimeline(vending_machine_id=vending_machine_id, product_id=product_id, quantity=quantity)
+            )
+        self.assertEqual(list(StockTimeline.objects.values_list("quantity", flat=True)), [2])
+        self.assertEqual(stock_timeline_writer.flush(), 1)
@@ -0,0 +1,85 @@
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.tests.utils import save_vending_machine
+
+
+class TestAsyncViews(TestCase):
+    """Test asynchronous read views, which return the same responses as their API views."""
+
+    def setUp(self) -> None:
+        """Save a vending machine with two stocked products, and an empty vending machine."""
+        self.vending_machine: VendingMachine = save_vending_machine()
+        self.empty_vending_machine: VendingMachine = VendingMachine.objects.create(name="empty", location="empty")
+        water: Product = Product.objects.create(name="water", cost="1.50")
+        soda: Product = Product.objects.create(name="soda", cost="2.00")
+        Stock.objects.create(vending_machine=self.vending_machine, product=water, quantity=4)
+        Stock.objects.create(vending_machine=self.vending_machine, product=soda, quantity=3)
+        self.as_of: str = timezone.now().isoformat().replace("+", "%2B")
+
+    async def assert_same_response(self, async_path: str, path: str) -> Any:
+        """
+        Assert the asynchronous view returns the same response as the API view.
+
+        Params:
+            async_path (str): Path of the asynchronous view
+            path (str): Path of the API view
+        Returns:
+            Any: Response of the asynchronous view.
+        """
+        response: Any = await self.async_client.get(async_path)
+        expected: Any = await sync_to_async(self.client.get)(path)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content.replace(b"/async/", b"/"), expected.content)
+        return response
+
+    async def test_async_stock_should_pass(self) -> None:
+        """Test asynchronous stock list, now and as of a time."""
+        response: Any = await self.assert_same_response("/async/stock/", "/stock/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await self.assert_same_response(f"/async/stock/?as_of={self.as_of}", f"/stock/?as_of={self.as_of}")
+
+    async def test_async_stock_timeline_should_pass(self) -> None:
+        """Test asynchronous stock timeline list, across pages and filtered."""
+        response: Any = await self.assert_same_response(
+            "/async/stock-timeline/?page_size=1", "/stock-timeline/?page_size=1"
+        )
+        cursor: str = response.json()["next"].split("cursor=")[1]
+        await self.assert_same_response(
+            f"/async/stock-timeline/?page_size=1&cursor={cursor}", f"/stock-timeline/?page_size=1&cursor={cursor}"
+        )
+        await self.assert_same_response(
+            f"/async/stock-timeline/?vending_machine={self.empty_vending_machine.id}",
+            f"/stock-timeline/?vending_machine={self.empty_vending_machine.id}",
+        )
+
+    async def test_async_stock_timeline_should_fail_when_filter_is_invalid(self) -> None:
+        """Test asynchronous stock timeline list with invalid request where the filters are not valid."""
+        response: Any = await self.assert_same_response("/async/stock-timeline/?since=x", "/stock-timeline/?since=x")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_async_inventory_should_pass(self) -> None:
+        """Test asynchronous inventory of a vending machine, an empty one and all of them."""
+        for path in (
+            f"/vending-machine/{self.vending_machine.id}/inventory/",
+            f"/vending-machine/{self.vending_machine.id}/inventory/?as_of={self.as_of}",
+            f"/vending-machine/{self.empty_vending_machine.id}/inventory/",
+            "/vending-machine/inventory/",
+            f"/vending-machine/inventory/?as_of={self.as_of}",
+        ):
+            response: Any = await self.assert_same_response(f"/async{path}", path)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_async_inventory_should_fail_when_id_is_not_found(self) -> None:
+        """Test asynchronous inventory with invalid request where vending machine id does not exist."""
+        response: Any = await self.assert_same_response(
+            "/async/vending-machine/99999/inventory/", "/vending-machine/99999/inventory/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,88 @@
+from typing import Any
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models.product import Product
+from api.models.vending_machine import VendingMachine
+from api.services.cache_service import cache_stats, get_cache
+from api.tests.utils import get_values, save_product, save_vending_machine
+
+
+@override_settings(API_CACHE_ENABLED=True)
+class TestCacheStatsView(TestCase):
+    """Test cached product and vending machine responses and lookups."""
+
+    path: str = "/cache-stats/"
+    content_type: str = "application/json"
+
+    def setUp(self) -> None:
+        """Clear the cache and its counters."""
+        get_cache().clear()
+        cache_stats.reset()
+
+    def test_list_product_should_be_cached(self) -> None:
+        """Test list product where the second request is served from the cache, only querying the table version."""
+        saved_product: Product = save_product()
+        self.client.get("/product/")
+        with self.assertNumQueries(1):
+            response: Any = self.client.get("/product/")
+        self.assertIn(saved_product.name, get_values(response, "name"))
+        stats: Any = self.client.get(self.path).data
+        self.assertEqual(stats["product"], {"hits": 1, "misses": 1})
+
+    def test_retrieve_vending_machine_should_be_invalidated_on_commit(self) -> None:
+        """Test retrieve vending machine where the cached response is invalidated once an update commits."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        path: str = f"/vending-machine/{saved_vending_machine.id}/"
+        self.client.get(path)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.put(path, data={"name": "renamed", "location": "somewhere"}, content_type=self.content_type)
+        self.assertEqual(self.client.get(path).data["name"], saved_vending_machine.name)
+        for callback in callbacks:
+            callback()
+        response: Any = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "renamed")
+
+    def test_update_stock_should_read_foreign_keys_from_cache(self) -> None:
+        """Test update stock where the vending machine and product are not queried once cached."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        saved_product: Product = save_product()
+        new_stock: dict[str, Any] = {"vending_machine": saved_vending_machine.id, "product": saved_product.id}
+        created: Any = self.client.post("/stock/", data={**new_stock, "quantity": 1}, content_type=self.content_type)
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.put(
+                f"/stock/{created.data['id']}/",
+                data={**new_stock, "quantity": 2},
+                content_type=self.content_type,
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries: list[str] = [query["sql"] for query in context.captured_queries]
+        self.assertFalse([query for query in queries if 'FROM "api_product"' in query])
+        self.assertFalse([query for query in queries if 'FROM "api_vendingmachine"' in query])
+
+    def test_create_stock_should_fail_when_product_id_is_not_found(self) -> None:
+        """Test create stock with invalid request where the missing product is cached as missing."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        new_stock: dict[str, Any] = {"vending_machine": saved_vending_machine.id, "product": 99999, "quantity": 1}
+        for _ in range(2):
+            response: Any = self.client.post("/stock/", data=new_stock, content_type=self.content_type)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(cache_stats.snapshot()["product"], {"hits": 1, "misses": 1})
+
+    def test_create_stock_should_fail_when_cached_product_is_deleted(self) -> None:
+        """Test create stock with invalid request where the product was deleted after being cached."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        saved_product: Product = save_product()
+        self.client.get(f"/product/{saved_product.id}/availability/")
+        Product.objects.filter(id=saved_product.id).delete()
+        new_stock: dict[str, Any] = {
+            "vending_machine": saved_vending_machine.id,
+            "product": saved_product.id,
+            "quantity": 1,
+        }
+        response: Any = self.client.post("/stock/", data=new_stock, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
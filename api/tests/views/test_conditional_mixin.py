@@ -0,0 +1,90 @@
+from typing import Any
+
+from django.test import TestCase
+from rest_framework import status
+
+from api.models.stock import Stock
+from api.models.stock_timeline import StockTimeline
+from api.models.table_version import TableVersion
+from api.tests.utils import save_product, save_stock
+
+
+class TestConditionalMixin(TestCase):
+    """Test conditional list and retrieve requests of the viewsets."""
+
+    content_type: str = "application/json"
+
+    def test_list_product_should_return_not_modified(self) -> None:
+        """Test list product where the ETag of the previous response is still valid."""
+        save_product()
+        response: Any = self.client.get("/product/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            not_modified: Any = self.client.get("/product/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_list_product_should_return_ok_after_write(self) -> None:
+        """Test list product where a new product invalidates the ETag of the previous response."""
+        response: Any = self.client.get("/product/")
+        with self.captureOnCommitCallbacks(execute=True):
+            save_product()
+        modified: Any = self.client.get("/product/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified["ETag"], response["ETag"])
+
+    def test_retrieve_stock_should_ignore_if_modified_since(self) -> None:
+        """Test retrieve stock where If-Modified-Since is ignored, since it cannot tell writes within a second apart."""
+        saved_stock: Stock = save_stock()
+        response: Any = self.client.get(f"/stock/{saved_stock.id}/")
+        self.assertNotIn("Last-Modified", response)
+        modified: Any = self.client.get(
+            f"/stock/{saved_stock.id}/", HTTP_IF_MODIFIED_SINCE="Sun, 01 Jan 2090 00:00:00 GMT"
+        )
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_list_stock_timeline_should_return_ok_after_bulk_stock(self) -> None:
+        """Test list stock timeline where a bulk stock write invalidates the ETag of the previous response."""
+        saved_stock: Stock = save_stock()
+        response: Any = self.client.get("/stock-timeline/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/stock/bulk/",
+                data=[
+                    {
+                        "vending_machine": saved_stock.vending_machine.id,
+                        "product": saved_stock.product.id,
+                        "quantity": 1,
+                    }
+                ],
+                content_type=self.content_type,
+            )
+        modified: Any = self.client.get("/stock-timeline/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_save_stock_should_bump_versions_once_after_commit(self) -> None:
+        """Test stock save where the stock and stock timeline versions are bumped by one update after the commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            saved_stock: Stock = save_stock()
+        with self.captureOnCommitCallbacks() as callbacks:
+            saved_stock.quantity = 1
+            saved_stock.save()
+        versions: dict[str, int] = dict(TableVersion.objects.values_list("name", "version"))
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(
+            dict(TableVersion.objects.values_list("name", "version")),
+            {
+                **versions,
+                Stock._meta.db_table: versions[Stock._meta.db_table] + 1,
+                StockTimeline._meta.db_table: versions[StockTimeline._meta.db_table] + 1,
+            },
+        )
+
+    def test_list_stock_should_vary_etag_by_query(self) -> None:
+        """Test list stock where the ETag differs between the stocks and the stocks as of a time."""
+        response: Any = self.client.get("/stock/")
+        as_of: Any = self.client.get("/stock/", {"as_of": "2023-01-01T00:00:00Z"})
+        self.assertEqual(as_of.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(as_of["ETag"], response["ETag"])
@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+
+
+@override_settings(API_CACHE_ENABLED=False)
+class TestFastListMixin(TestCase):
+    """Test that the fast list responses are byte-compatible with the model serializer and JSON renderer."""
+
+    paths: tuple[str, ...] = ("/vending-machine/", "/product/", "/stock/", "/stock-timeline/?page_size=2")
+
+    def setUp(self) -> None:
+        """Save vending machines, products and stocks with non-ASCII names and decimal costs."""
+        vending_machines: list[VendingMachine] = [
+            VendingMachine.objects.create(name=f"café   {i}", location="東京", is_active=i % 2 == 0) for i in range(2)
+        ]
+        products: list[Product] = [Product.objects.create(name=f"\U0001f964 {i}", cost=f"{i}.5") for i in range(2)]
+        for vending_machine in vending_machines:
+            for product in products:
+                Stock.objects.create(vending_machine=vending_machine, product=product, quantity=3)
+
+    def test_list_should_match_model_serializer(self) -> None:
+        """Test list of every endpoint where fast and model serializer responses have the same bytes."""
+        for path in self.paths:
+            with self.subTest(path=path):
+                fast: Any = self.client.get(path, HTTP_ACCEPT="application/json")
+                with override_settings(API_FAST_LIST_ENABLED=False):
+                    standard: Any = self.client.get(path, HTTP_ACCEPT="application/json")
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, standard.content)
+                self.assertEqual(fast.content, JSONRenderer().render(standard.data))
@@ -0,0 +1,101 @@
+import io
+from decimal import Decimal
+from typing import Any
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models.inventory_summary import InventorySummary
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.tests.utils import save_vending_machine
+
+
+class TestInventoryView(TestCase):
+    """Test inventory actions of vending machine view."""
+
+    path: str = "/vending-machine/"
+
+    def setUp(self) -> None:
+        """Save a vending machine with two stocked products, and an empty vending machine."""
+        self.vending_machine: VendingMachine = save_vending_machine()
+        self.empty_vending_machine: VendingMachine = VendingMachine.objects.create(name="empty", location="empty")
+        self.water: Product = Product.objects.create(name="water", cost="1.50")
+        self.soda: Product = Product.objects.create(name="soda", cost="2.00")
+        Stock.objects.create(vending_machine=self.vending_machine, product=self.water, quantity=4)
+        Stock.objects.create(vending_machine=self.vending_machine, product=self.soda, quantity=3)
+
+    def test_inventory_should_pass(self) -> None:
+        """Test inventory of a vending machine with valid request."""
+        with self.assertNumQueries(2):
+            response: Any = self.client.get(f"{self.path}{self.vending_machine.id}/inventory/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_quantity"], 7)
+        self.assertEqual(response.data["total_value"], "12.00")
+        self.assertEqual(
+            [(data["name"], data["cost"], data["quantity"], data["value"]) for data in response.data["products"]],
+            [("water", "1.50", 4, "6.00"), ("soda", "2.00", 3, "6.00")],
+        )
+
+    def test_inventory_should_pass_when_vending_machine_is_empty(self) -> None:
+        """Test inventory of a vending machine without stock."""
+        response: Any = self.client.get(f"{self.path}{self.empty_vending_machine.id}/inventory/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["products"], [])
+
+    def test_inventory_should_fail_when_id_is_not_found(self) -> None:
+        """Test inventory with invalid request where vending machine id does not exist."""
+        response: Any = self.client.get(f"{self.path}99999/inventory/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fleet_inventory_should_pass(self) -> None:
+        """Test inventory of all vending machines with valid request."""
+        with self.assertNumQueries(1):
+            response: Any = self.client.get(f"{self.path}inventory/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data["vending_machine"] for data in response.data], [self.vending_machine.id])
+
+    def test_inventory_summary_should_pass(self) -> None:
+        """Test inventory summary aggregated from stocks."""
+        response: Any = self.client.get(f"{self.path}inventory-summary/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summaries: dict[int, Any] = {data["vending_machine"]: data for data in response.data}
+        self.assertEqual(summaries[self.vending_machine.id]["total_value"], "12.00")
+        self.assertEqual(summaries[self.empty_vending_machine.id]["product_count"], 0)
+
+    @override_settings(INVENTORY_SUMMARY_ENABLED=True)
+    def test_inventory_summary_should_follow_writes_when_enabled(self) -> None:
+        """Test inventory summary table kept up to date by stock and product writes."""
+        call_command("refresh_inventory_summary", stdout=io.StringIO())
+        self.assertEqual(InventorySummary.objects.get(vending_machine=self.vending_machine).total_value, Decimal("12"))
+        stock: Stock = Stock.objects.get(vending_machine=self.vending_machine, product=self.water)
+        stock.quantity = 10
+        stock.save()
+        self.soda.cost = "1.00"
+        self.soda.save()
+        Stock.objects.create(vending_machine=self.empty_vending_machine, product=self.water, quantity=2)
+        response: Any = self.client.get(f"{self.path}inventory-summary/")
+        summaries: dict[int, Any] = {data["vending_machine"]: data for data in response.data}
+        self.assertEqual(summaries[self.vending_machine.id]["total_value"], "18.00")
+        self.assertEqual(summaries[self.vending_machine.id]["total_quantity"], 13)
+        self.assertEqual(summaries[self.empty_vending_machine.id]["total_value"], "3.00")
+        stock.delete()
+        self.assertEqual(InventorySummary.objects.get(vending_machine=self.vending_machine).total_quantity, 3)
+
+    def test_inventory_summary_refresh_should_lock_then_upsert(self) -> None:
+        """Test inventory summary refresh where the vending machines are locked, then their totals upserted."""
+        InventorySummary.objects.create(vending_machine=self.vending_machine, total_quantity=1)
+        with CaptureQueriesContext(connection) as context:
+            InventorySummary.refresh([self.empty_vending_machine.id, self.vending_machine.id])
+        queries: list[str] = [query["sql"] for query in context.captured_queries if "SAVEPOINT" not in query["sql"]]
+        self.assertEqual(len(queries), 2)
+        self.assertIn('ORDER BY "api_vendingmachine"."id"', queries[0])
+        self.assertTrue(queries[1].startswith("INSERT INTO api_inventorysummary"))
+        summaries: dict[int, InventorySummary] = InventorySummary.objects.in_bulk()
+        self.assertEqual(summaries[self.vending_machine.id].total_quantity, 7)
+        self.assertEqual(summaries[self.vending_machine.id].total_value, Decimal("12"))
+        self.assertEqual(summaries[self.empty_vending_machine.id].product_count, 0)
@@ -0,0 +1,65 @@
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+
+from api.services.metrics_service import Histogram, request_metrics
+from api.tests.utils import save_stock
+
+
+class TestMetricsView(TestCase):
+    """Test request metrics recorded by the metrics middleware."""
+
+    path: str = "/metrics"
+
+    def setUp(self) -> None:
+        """Reset the request metrics."""
+        request_metrics.reset()
+
+    def test_metrics_should_pass(self) -> None:
+        """Test metrics with the queries and timings of the sampled requests per route."""
+        save_stock()
+        self.client.get("/stock/")
+        self.client.get("/stock/")
+        response: Any = self.client.get(self.path)
+        content: str = response.content.decode()
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn("# TYPE api_db_queries histogram", content)
+        self.assertIn('api_db_queries_count{route="stock-list",method="GET"} 2', content)
+        self.assertIn('api_serialize_duration_seconds_count{route="stock-list",method="GET"} 2', content)
+        self.assertIn('api_request_duration_seconds_bucket{route="stock-list",method="GET",le="+Inf"} 2', content)
+
+    @override_settings(API_METRICS_HEADER_ENABLED=True)
+    def test_metrics_header_should_pass(self) -> None:
+        """Test the query count and timings of a request returned in its headers."""
+        save_stock()
+        with self.assertNumQueries(2):
+            response: Any = self.client.get("/stock/1/")
+        self.assertEqual(response["X-Query-Count"], "2")
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
+    @override_settings(API_METRICS_SAMPLE_RATE=0)
+    def test_metrics_should_skip_requests_not_sampled(self) -> None:
+        """Test metrics where no request is sampled."""
+        self.client.get("/stock/")
+        self.assertNotIn('route="stock-list"', self.client.get(self.path).content.decode())
+
+    def test_histogram_should_count_observations_in_cumulative_buckets(self) -> None:
+        """Test histogram where an observation equal to a bound counts in its bucket."""
+        histogram: Histogram = Histogram((1, 2, 5))
+        for value in (0, 1, 3, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative_counts(), [2, 2, 3, 4])
+        self.assertEqual((histogram.sum, histogram.count), (14, 4))
+
+    @override_settings(API_METRICS_HEADER_ENABLED=True)
+    async def test_metrics_header_should_count_queries_of_async_requests(self) -> None:
+        """Test the query count of requests handled asynchronously, whose queries run in another thread."""
+        await sync_to_async(save_stock)()
+        for path, queries in (("/stock/1/", "2"), ("/async/stock/", "1")):
+            with self.subTest(path=path):
+                response: Any = await self.async_client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["X-Query-Count"], queries)
+                self.assertIn(f'desc="{queries} queries"', response["Server-Timing"])
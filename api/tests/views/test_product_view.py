@@ -1,10 +1,15 @@
 import secrets
 from typing import Any
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from api.models.product import Product
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.services.product_availability_service import availability_bitmaps
 from api.tests.utils import get_values, save_product
 
 
@@ -103,3 +108,54 @@ class TestProductView(TestCase):
         """Test delete product with invalid request where product id does not exist."""
         response: Any = self.client.delete(f"{self.path}99999/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def save_available_stocks(self) -> tuple[Product, list[Stock]]:
+        """
+        Save a product in stock in an active vending machine, out of stock in another and in stock in an inactive one.
+
+        Returns:
+            tuple[Product, list[Stock]]: Saved product and stocks.
+        """
+        saved_product: Product = save_product()
+        stocks: list[Stock] = [
+            Stock.objects.create(
+                vending_machine=VendingMachine.objects.create(name=f"machine {index}", location="x", is_active=active),
+                product=saved_product,
+                quantity=quantity,
+            )
+            for index, (active, quantity) in enumerate(((True, 4), (True, 0), (False, 4)))
+        ]
+        return saved_product, stocks
+
+    def test_availability_product_should_pass(self) -> None:
+        """Test availability product where only the active vending machines with the product in stock are returned."""
+        saved_product, stocks = self.save_available_stocks()
+        response: Any = self.client.get(f"{self.path}{saved_product.id}/availability/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"product": saved_product.id, "vending_machines": [stocks[0].vending_machine_id]}
+        )
+
+    @override_settings(PRODUCT_AVAILABILITY_BITMAP_ENABLED=True)
+    def test_availability_product_should_follow_stock_writes_from_bitmap(self) -> None:
+        """Test availability product where the bitmap is updated from the stock feed instead of reading the stocks."""
+        self.addCleanup(availability_bitmaps.close)
+        saved_product, stocks = self.save_available_stocks()
+        path: str = f"{self.path}{saved_product.id}/availability/"
+        self.assertEqual(self.client.get(path).data["vending_machines"], [stocks[0].vending_machine_id])
+        with self.captureOnCommitCallbacks(execute=True):
+            stocks[0].quantity = 0
+            stocks[0].save()
+            stocks[1].quantity = 2
+            stocks[1].save()
+            stocks[2].quantity = 2
+            stocks[2].save()
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.get(path)
+        self.assertEqual(response.data["vending_machines"], [stocks[1].vending_machine_id])
+        self.assertFalse([query for query in context.captured_queries if "api_stock" in query["sql"]])
+
+    def test_availability_product_should_fail_when_id_is_not_found(self) -> None:
+        """Test availability product with invalid request where the product does not exist."""
+        response: Any = self.client.get(f"{self.path}999999/availability/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,103 @@
+import io
+from datetime import timedelta
+from typing import Any
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+
+from api.models.product import Product
+from api.models.stock_checkpoint import StockCheckpoint
+from api.models.stock_timeline import StockTimeline
+from api.models.vending_machine import VendingMachine
+from api.services.stock_history_service import create_stock_checkpoint, get_stocks_as_of
+from api.tests.utils import save_product, save_vending_machine
+
+
+class TestStockHistoryView(TestCase):
+    """Test as_of queries of stock and vending machine inventory views."""
+
+    def setUp(self) -> None:
+        """Save stock timelines of a product in a vending machine, one per hour with quantity equal to the hour."""
+        self.vending_machine: VendingMachine = save_vending_machine()
+        self.product: Product = save_product()
+        self.start: Any = timezone.now() - timedelta(days=1)
+        StockTimeline.objects.bulk_create(
+            [
+                StockTimeline(
+                    vending_machine=self.vending_machine,
+                    product=self.product,
+                    quantity=hour,
+                    timestamp=self.start + timedelta(hours=hour),
+                )
+                for hour in range(10)
+            ]
+        )
+
+    def test_list_stock_as_of_should_pass(self) -> None:
+        """Test list stock as of a time between two stock timelines."""
+        response: Any = self.client.get("/stock/", {"as_of": (self.start + timedelta(hours=4, minutes=30)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{"vending_machine": self.vending_machine.id, "product": self.product.id, "quantity": 4}],
+        )
+
+    def test_list_stock_as_of_should_fail_when_as_of_is_invalid(self) -> None:
+        """Test list stock with invalid request where as_of is not a datetime."""
+        response: Any = self.client.get("/stock/", {"as_of": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_inventory_as_of_should_pass(self) -> None:
+        """Test inventory of a vending machine as of a time."""
+        response: Any = self.client.get(
+            f"/vending-machine/{self.vending_machine.id}/inventory/",
+            {"as_of": (self.start + timedelta(hours=7)).isoformat()},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_quantity"], 7)
+        self.assertEqual(response.data["products"][0]["name"], self.product.name)
+
+    def test_fleet_inventory_as_of_should_be_empty_before_history(self) -> None:
+        """Test inventory of all vending machines as of a time before any stock timeline."""
+        response: Any = self.client.get(
+            "/vending-machine/inventory/", {"as_of": (self.start - timedelta(hours=1)).isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_stocks_as_of_should_start_from_checkpoint(self) -> None:
+        """Test stocks as of a time, read from a checkpoint plus the stock timelines after it."""
+        self.assertEqual(create_stock_checkpoint(self.start + timedelta(hours=5)), 1)
+        StockTimeline.objects.filter(timestamp__lte=self.start + timedelta(hours=5)).delete()
+        self.assertEqual(get_stocks_as_of(self.start + timedelta(hours=5, minutes=30)), {self._key(): 5})
+        self.assertEqual(get_stocks_as_of(self.start + timedelta(hours=8)), {self._key(): 8})
+
+    def test_stocks_as_of_should_replay_stock_timeline_committed_after_checkpoint(self) -> None:
+        """Test stocks as of now with a stock timeline stamped before the checkpoint ran but inserted after it."""
+        now: Any = timezone.now()
+        create_stock_checkpoint()
+        StockTimeline.objects.create(
+            vending_machine=self.vending_machine,
+            product=self.product,
+            quantity=42,
+            timestamp=now - timedelta(seconds=5),
+        )
+        self.assertLess(StockCheckpoint.objects.get().timestamp, now - timedelta(seconds=5))
+        self.assertEqual(get_stocks_as_of(timezone.now()), {self._key(): 42})
+
+    def test_create_stock_checkpoint_command_should_keep_latest(self) -> None:
+        """Test create stock checkpoint command where only the latest checkpoint is kept."""
+        create_stock_checkpoint(self.start + timedelta(hours=1))
+        call_command("create_stock_checkpoint", "--keep", "1", stdout=io.StringIO())
+        self.assertEqual(list(StockCheckpoint.objects.values_list("quantity", flat=True)), [9])
+
+    def _key(self) -> tuple[int, int]:
+        """
+        Return the (vending machine id, product id) key of the saved stock timelines.
+
+        Returns:
+            tuple[int, int]: Key of the stock.
+        """
+        return (self.vending_machine.id, self.product.id)
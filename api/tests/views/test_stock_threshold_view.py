@@ -0,0 +1,100 @@
+from typing import Any
+
+from django.test import TestCase
+from rest_framework import status
+
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.stock_threshold import StockThreshold
+from api.models.vending_machine import VendingMachine
+from api.tests.utils import save_product, save_vending_machine
+
+
+class TestStockThresholdView(TestCase):
+    """Test stock threshold view."""
+
+    path: str = "/stock-threshold/"
+    content_type: str = "application/json"
+
+    def setUp(self) -> None:
+        """Save a product stocked in two vending machines."""
+        self.vending_machine: VendingMachine = save_vending_machine()
+        self.other_vending_machine: VendingMachine = VendingMachine.objects.create(name="other", location="other")
+        self.product: Product = save_product()
+        self.stock: Stock = Stock.objects.create(vending_machine=self.vending_machine, product=self.product, quantity=5)
+        self.other_stock: Stock = Stock.objects.create(
+            vending_machine=self.other_vending_machine, product=self.product, quantity=5
+        )
+
+    def get_reorder_levels(self) -> list[Any]:
+        """
+        Return the reorder levels of the stocks of both vending machines.
+
+        Returns:
+            list[Any]: Reorder levels of the stock and the other stock.
+        """
+        return [Stock.objects.get(pk=stock.pk).reorder_level for stock in (self.stock, self.other_stock)]
+
+    def test_create_stock_threshold_should_apply_to_stocks_of_product(self) -> None:
+        """Test create stock threshold of a product, which applies to its stocks in every vending machine."""
+        response: Any = self.client.post(
+            self.path, data={"product": self.product.id, "reorder_level": 10}, content_type=self.content_type
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(response.data["vending_machine"])
+        self.assertEqual(self.get_reorder_levels(), [10, 10])
+
+    def test_create_stock_threshold_should_override_product_threshold(self) -> None:
+        """Test create stock threshold of a vending machine, which overrides the threshold of the product."""
+        product_threshold: StockThreshold = StockThreshold.objects.create(product=self.product, reorder_level=10)
+        response: Any = self.client.post(
+            self.path,
+            data={"vending_machine": self.vending_machine.id, "product": self.product.id, "reorder_level": 3},
+            content_type=self.content_type,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.get_reorder_levels(), [3, 10])
+        product_threshold.delete()
+        self.assertEqual(self.get_reorder_levels(), [3, None])
+
+    def test_update_stock_threshold_should_apply_to_stocks(self) -> None:
+        """Test update stock threshold, moved from one vending machine to the other."""
+        threshold: StockThreshold = StockThreshold.objects.create(
+            vending_machine=self.vending_machine, product=self.product, reorder_level=3
+        )
+        response: Any = self.client.patch(
+            f"{self.path}{threshold.id}/",
+            data={"vending_machine": self.other_vending_machine.id, "reorder_level": 4},
+            content_type=self.content_type,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_reorder_levels(), [None, 4])
+
+    def test_delete_stock_threshold_should_fall_back_to_product_threshold(self) -> None:
+        """Test delete stock threshold of a vending machine, where its stock gets the threshold of the product."""
+        StockThreshold.objects.create(product=self.product, reorder_level=10)
+        threshold: StockThreshold = StockThreshold.objects.create(
+            vending_machine=self.vending_machine, product=self.product, reorder_level=3
+        )
+        response: Any = self.client.delete(f"{self.path}{threshold.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.get_reorder_levels(), [10, 10])
+
+    def test_create_stock_threshold_should_fail_when_product_threshold_exists(self) -> None:
+        """Test create stock threshold with invalid request where the product already has a threshold."""
+        StockThreshold.objects.create(product=self.product, reorder_level=10)
+        response: Any = self.client.post(
+            self.path, data={"product": self.product.id, "reorder_level": 5}, content_type=self.content_type
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_stock_threshold_should_fail_when_vending_machine_threshold_exists(self) -> None:
+        """Test create stock threshold with invalid request where the vending machine and product have a threshold."""
+        data: dict[str, Any] = {
+            "vending_machine": self.vending_machine.id,
+            "product": self.product.id,
+            "reorder_level": 1,
+        }
+        self.client.post(self.path, data=data, content_type=self.content_type)
+        response: Any = self.client.post(self.path, data=data, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
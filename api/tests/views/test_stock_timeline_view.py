@@ -0,0 +1,356 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from typing import Any
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from api.models.product import Product
+from api.models.stock import Stock
+from api.models.stock_consumption import StockConsumption
+from api.models.stock_timeline import StockTimeline
+from api.models.stock_timeline_rollup import StockTimelineRollup
+from api.models.vending_machine import VendingMachine
+from api.services.stock_feed_service import publish_stock_timelines
+from api.tests.utils import save_product, save_vending_machine
+
+
+class TestStockTimelineView(TestCase):
+    """Test stock timeline view."""
+
+    path: str = "/stock-timeline/"
+
+    def setUp(self) -> None:
+        """Save stock timelines of two vending machines, one hour apart."""
+        self.vending_machine: VendingMachine = save_vending_machine()
+        self.other_vending_machine: VendingMachine = VendingMachine.objects.create(name="other", location="other")
+        self.product: Product = save_product()
+        self.start: Any = timezone.now() - timedelta(days=1)
+        StockTimeline.objects.bulk_create(
+            [
+                StockTimeline(
+                    vending_machine=self.vending_machine if hour % 2 == 0 else self.other_vending_machine,
+                    product=self.product,
+                    quantity=hour,
+                    timestamp=self.start + timedelta(hours=hour),
+                )
+                for hour in range(10)
+            ]
+        )
+
+    def test_list_stock_timeline_should_pass(self) -> None:
+        """Test list stock timeline with valid request."""
+        response: Any = self.client.get(self.path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual([data["quantity"] for data in response.data["results"]], list(range(10)))
+
+    def test_list_stock_timeline_should_follow_cursor(self) -> None:
+        """Test list stock timeline where pages are followed with the next cursor."""
+        quantities: list[int] = []
+        url: Any = f"{self.path}?page_size=3"
+        while url:
+            response: Any = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            quantities += [data["quantity"] for data in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(quantities, list(range(10)))
+
+    def test_list_stock_timeline_should_filter(self) -> None:
+        """Test list stock timeline filtered by vending machine, product, since and until."""
+        response: Any = self.client.get(
+            self.path,
+            {
+                "vending_machine": self.vending_machine.id,
+                "product": self.product.id,
+                "since": (self.start + timedelta(hours=2)).isoformat(),
+                "until": (self.start + timedelta(hours=8)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data["quantity"] for data in response.data["results"]], [2, 4, 6])
+
+    def test_list_stock_timeline_should_fail_when_filter_is_invalid(self) -> None:
+        """Test list stock timeline with invalid request where since is not a datetime."""
+        response: Any = self.client.get(self.path, {"since": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_stock_timeline_should_fail_when_cursor_is_invalid(self) -> None:
+        """Test list stock timeline with invalid request where cursor cannot be decoded."""
+        response: Any = self.client.get(self.path, {"cursor": "x"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_stock_timeline_should_pass(self) -> None:
+        """Test retrieve stock timeline with valid request."""
+        saved_stock_timeline: StockTimeline = StockTimeline.objects.first()
+        response: Any = self.client.get(f"{self.path}{saved_stock_timeline.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["quantity"], saved_stock_timeline.quantity)
+
+    def test_export_stock_timeline_should_stream_ndjson(self) -> None:
+        """Test export stock timeline as NDJSON filtered by vending machine."""
+        response: Any = self.client.get(f"{self.path}export/", {"vending_machine": self.vending_machine.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows: list[dict[str, Any]] = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["quantity"] for row in rows], [0, 2, 4, 6, 8])
+        listed: Any = self.client.get(self.path, {"vending_machine": self.vending_machine.id})
+        self.assertEqual(rows, [dict(data) for data in listed.data["results"]])
+
+    def test_export_stock_timeline_should_stream_csv(self) -> None:
+        """Test export stock timeline as CSV."""
+        response: Any = self.client.get(f"{self.path}export/", {"output": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows: list[dict[str, str]] = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["quantity"] for row in rows], [str(hour) for hour in range(10)])
+
+    def test_export_stock_timeline_should_fail_when_output_is_invalid(self) -> None:
+        """Test export stock timeline with invalid request where output is not a supported format."""
+        response: Any = self.client.get(f"{self.path}export/", {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_series_stock_timeline_should_pass(self) -> None:
+        """Test series stock timeline aggregated per hour from raw stock timelines."""
+        StockTimeline.objects.create(
+            vending_machine=self.vending_machine, product=self.product, quantity=1, timestamp=self.start
+        )
+        response: Any = self.client.get(f"{self.path}series/", {"vending_machine": self.vending_machine.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data["last"] for data in response.data], [1, 2, 4, 6, 8])
+        self.assertEqual((response.data[0]["min"], response.data[0]["max"], response.data[0]["changes"]), (0, 1, 2))
+
+    def test_series_stock_timeline_should_read_rollups(self) -> None:
+        """Test series stock timeline where old buckets are read from the rollup table."""
+        expected: Any = self.client.get(f"{self.path}series/").data
+        call_command("rollup_timeline", stdout=io.StringIO())
+        self.assertEqual(StockTimelineRollup.objects.filter(interval="hour").count(), 10)
+        StockTimeline.objects.filter(quantity__lt=9).delete()
+        response: Any = self.client.get(f"{self.path}series/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, expected)
+
+    def test_rollup_stock_timeline_should_update_latest_bucket(self) -> None:
+        """Test rollup where the latest bucket is recomputed with new stock timelines."""
+        call_command("rollup_timeline", "--interval", "hour", stdout=io.StringIO())
+        latest: StockTimeline = StockTimeline.objects.order_by("timestamp").last()
+        StockTimeline.objects.create(
+            vending_machine=latest.vending_machine, product=latest.product, quantity=0, timestamp=latest.timestamp
+        )
+        call_command("rollup_timeline", "--interval", "hour", stdout=io.StringIO())
+        rollup: StockTimelineRollup = StockTimelineRollup.objects.filter(interval="hour").order_by("bucket").last()
+        self.assertEqual((rollup.last, rollup.min, rollup.max, rollup.changes), (0, 0, 9, 2))
+
+    def test_rollup_stock_timeline_should_update_bucket_of_late_stock_timeline(self) -> None:
+        """Test rollup where a stock timeline inserted later into an older bucket is rolled up, last by timestamp."""
+        call_command("rollup_timeline", "--interval", "hour", stdout=io.StringIO())
+        early: StockTimeline = StockTimeline.objects.get(quantity=1)
+        bucket: Any = early.timestamp.replace(minute=0, second=0, microsecond=0)
+        StockTimeline.objects.create(
+            vending_machine=early.vending_machine, product=early.product, quantity=100, timestamp=bucket
+        )
+        call_command("rollup_timeline", "--interval", "hour", stdout=io.StringIO())
+        rollup: StockTimelineRollup = StockTimelineRollup.objects.get(interval="hour", bucket=bucket)
+        self.assertEqual((rollup.last, rollup.min, rollup.max, rollup.changes), (1, 1, 100, 2))
+        response: Any = self.client.get(f"{self.path}series/", {"vending_machine": early.vending_machine_id})
+        self.assertIn(100, [data["max"] for data in response.data])
+
+    def test_series_stock_timeline_should_fail_when_interval_is_invalid(self) -> None:
+        """Test series stock timeline with invalid request where interval is not supported."""
+        response: Any = self.client.get(f"{self.path}series/", {"interval": "minute"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def save_stocks(self) -> Stock:
+        """
+        Save the stocks of both vending machines, selling 5 items in the first one since its last stock timeline.
+
+        Returns:
+            Stock: Stock of the first vending machine.
+        """
+        Stock.objects.create(vending_machine=self.other_vending_machine, product=self.product, quantity=9)
+        return Stock.objects.create(vending_machine=self.vending_machine, product=self.product, quantity=3)
+
+    def test_consumption_stock_timeline_should_pass(self) -> None:
+        """Test consumption stock timeline per stock, ordered by units sold."""
+        self.save_stocks()
+        call_command("refresh_consumption", stdout=io.StringIO())
+        response: Any = self.client.get(f"{self.path}consumption/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (data["vending_machine"], data["quantity"], data["sold"], data["restocked"], data["sell_through"])
+                for data in response.data
+            ],
+            [(self.vending_machine.id, 3, 5, 8, 0.625), (self.other_vending_machine.id, 9, 0, 8, 0)],
+        )
+
+    def test_consumption_stock_timeline_should_group_by_product(self) -> None:
+        """Test consumption stock timeline summed over the fleet per product."""
+        self.save_stocks()
+        call_command("refresh_consumption", stdout=io.StringIO())
+        response: Any = self.client.get(f"{self.path}consumption/", {"group": "product"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "vending_machine": None,
+                    "product": self.product.id,
+                    "quantity": 12,
+                    "sold": 5,
+                    "restocked": 16,
+                    "sell_through": 5 / 17,
+                }
+            ],
+        )
+
+    def test_refresh_consumption_stock_timeline_should_update_latest_day(self) -> None:
+        """Test refresh consumption where the latest day is recomputed with new stock timelines."""
+        stock: Stock = self.save_stocks()
+        call_command("refresh_consumption", stdout=io.StringIO())
+        stock.quantity = 1
+        stock.save()
+        call_command("refresh_consumption", stdout=io.StringIO())
+        response: Any = self.client.get(
+            f"{self.path}consumption/", {"vending_machine": self.vending_machine.id, "since": self.start.date()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(data["sold"], data["restocked"]) for data in response.data], [(7, 8)])
+        self.assertEqual(StockConsumption.objects.filter(day=timezone.now().date(), sold__gt=0).count(), 1)
+
+    def test_refresh_consumption_stock_timeline_should_count_late_stock_timeline(self) -> None:
+        """Test refresh consumption where a stock timeline inserted later with an earlier timestamp is counted."""
+        call_command("refresh_consumption", stdout=io.StringIO())
+        StockTimeline.objects.create(
+            vending_machine=self.vending_machine,
+            product=self.product,
+            quantity=0,
+            timestamp=self.start + timedelta(hours=3),
+        )
+        call_command("refresh_consumption", stdout=io.StringIO())
+        self.assertEqual(
+            StockConsumption.objects.filter(vending_machine=self.vending_machine).aggregate(
+                sold=Sum("sold"), restocked=Sum("restocked")
+            ),
+            {"sold": 2, "restocked": 10},
+        )
+
+    def test_consumption_stock_timeline_should_fail_when_ordering_is_invalid(self) -> None:
+        """Test consumption stock timeline with invalid request where ordering is not supported."""
+        response: Any = self.client.get(f"{self.path}consumption/", {"ordering": "quantity"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def get_events(self, content: bytes) -> list[dict[str, Any]]:
+        """
+        Return the data of the stock events of the given server-sent events.
+
+        Params:
+            content (bytes): Server-sent events
+        Returns:
+            list[dict[str, Any]]: Data of every stock event, with its id.
+        """
+        events: list[dict[str, Any]] = []
+        for event in content.decode().split("\n\n"):
+            fields: dict[str, str] = dict(line.split(": ", 1) for line in event.splitlines() if ": " in line)
+            if fields.get("event") == "stock":
+                events.append({**json.loads(fields["data"]), "event_id": int(fields["id"])})
+        return events
+
+    @override_settings(STOCK_FEED_TIMEOUT=0)
+    def test_feed_stock_timeline_should_resume_after_last_id(self) -> None:
+        """Test feed stock timeline where the stock timelines after last_id are read, filtered by vending machine."""
+        last_id: int = StockTimeline.objects.order_by("id").values_list("id", flat=True)[2]
+        response: Any = self.client.get(
+            f"{self.path}feed/", {"vending_machine": self.vending_machine.id, "last_id": last_id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events: list[dict[str, Any]] = self.get_events(b"".join(response.streaming_content))
+        self.assertEqual([event["quantity"] for event in events], [4, 6, 8])
+        self.assertTrue(all(event["event_id"] == event["id"] > last_id for event in events))
+        listed: Any = self.client.get(self.path, {"vending_machine": self.vending_machine.id})
+        self.assertEqual(
+            [{key: value for key, value in event.items() if key != "event_id"} for event in events],
+            [dict(data) for data in listed.data["results"][2:]],
+        )
+
+    @override_settings(STOCK_FEED_TIMEOUT=0)
+    def test_feed_stock_timeline_should_resume_after_last_event_id(self) -> None:
+        """Test feed stock timeline where a reconnecting client sends the id of the last event in a header."""
+        last_id: int = StockTimeline.objects.order_by("id").values_list("id", flat=True)[7]
+        response: Any = self.client.get(f"{self.path}feed/", HTTP_LAST_EVENT_ID=str(last_id))
+        events: list[dict[str, Any]] = self.get_events(b"".join(response.streaming_content))
+        self.assertEqual([event["quantity"] for event in events], [8, 9])
+
+    @override_settings(STOCK_FEED_TIMEOUT=0.2, STOCK_FEED_HEARTBEAT=0.01)
+    def test_feed_stock_timeline_should_push_stock_changes(self) -> None:
+        """Test feed stock timeline where saved stocks of the subscribed vending machine are pushed after commit."""
+        response: Any = self.client.get(f"{self.path}feed/", {"vending_machine": self.vending_machine.id})
+        content: Any = iter(response.streaming_content)
+        self.assertEqual(next(content), b"retry: 1000\n\n")
+        with self.captureOnCommitCallbacks(execute=True):
+            Stock.objects.create(vending_machine=self.other_vending_machine, product=self.product, quantity=20)
+            stock: Stock = Stock.objects.create(vending_machine=self.vending_machine, product=self.product, quantity=21)
+        with self.captureOnCommitCallbacks(execute=True):
+            response_vend: Any = self.client.post(f"/stock/{stock.id}/vend/")
+        self.assertEqual(response_vend.status_code, status.HTTP_200_OK)
+        stream: bytes = b"".join(content)
+        self.assertEqual([event["quantity"] for event in self.get_events(stream)], [21, 20])
+        self.assertIn(b": keep-alive\n\n", stream)
+
+    @override_settings(STOCK_FEED_TIMEOUT=0.1, STOCK_FEED_HEARTBEAT=0.01, STOCK_FEED_QUEUE_SIZE=1)
+    def test_feed_stock_timeline_should_read_dropped_changes(self) -> None:
+        """Test feed stock timeline where changes dropped from a full queue are read from the database."""
+        response: Any = self.client.get(f"{self.path}feed/")
+        content: Any = iter(response.streaming_content)
+        next(content)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/stock/bulk/",
+                data=[
+                    {"vending_machine": vending_machine.id, "product": self.product.id, "quantity": 30}
+                    for vending_machine in (self.vending_machine, self.other_vending_machine)
+                ],
+                content_type="application/json",
+            )
+        events: list[dict[str, Any]] = self.get_events(b"".join(content))
+        self.assertEqual(
+            [(event["vending_machine"], event["quantity"]) for event in events],
+            [(self.vending_machine.id, 30), (self.other_vending_machine.id, 30)],
+        )
+
+    @override_settings(STOCK_FEED_TIMEOUT=0.1, STOCK_FEED_HEARTBEAT=0.01)
+    def test_feed_stock_timeline_should_stream_stock_changes_committed_out_of_order(self) -> None:
+        """Test feed stock timeline where a stock timeline commits after one with a higher id was streamed."""
+        last_id: int = StockTimeline.objects.order_by("-id").values_list("id", flat=True)[0]
+        StockTimeline.objects.create(
+            id=last_id + 2, vending_machine=self.vending_machine, product=self.product, quantity=50
+        )
+        response: Any = self.client.get(f"{self.path}feed/", {"last_id": last_id})
+        content: Any = iter(response.streaming_content)
+        next(content)
+        self.assertEqual(self.get_events(next(content))[0]["id"], last_id + 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_stock_timelines(
+                [
+                    StockTimeline.objects.create(
+                        id=last_id + 1, vending_machine=self.vending_machine, product=self.product, quantity=51
+                    )
+                ]
+            )
+        self.assertEqual([event["id"] for event in self.get_events(b"".join(content))], [last_id + 1])
+        reconnected: Any = self.client.get(f"{self.path}feed/", HTTP_LAST_EVENT_ID=str(last_id + 2))
+        self.assertEqual(
+            [event["id"] for event in self.get_events(b"".join(reconnected.streaming_content))],
+            [last_id + 1, last_id + 2],
+        )
+
+    def test_feed_stock_timeline_should_fail_when_filter_is_invalid(self) -> None:
+        """Test feed stock timeline with invalid request where last_id is negative."""
+        response: Any = self.client.get(f"{self.path}feed/", {"last_id": -1}, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.content.startswith(b"event: error\n"))
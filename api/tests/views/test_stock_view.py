@@ -1,11 +1,22 @@
+import io
 import secrets
+from datetime import date, timedelta
 from typing import Any
+from unittest.mock import patch
 
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 
 from api.models.product import Product
 from api.models.stock import Stock
+from api.models.stock_consumption import StockConsumption
+from api.models.stock_threshold import StockThreshold
+from api.models.stock_timeline import StockTimeline
 from api.models.vending_machine import VendingMachine
 from api.tests.utils import get_values, save_product, save_stock, save_vending_machine
 
@@ -161,3 +172,360 @@ class TestStockView(TestCase):
         """Test delete stock with invalid request where stock id does not exist."""
         response: Any = self.client.delete(f"{self.path}99999/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_stock_should_pass(self) -> None:
+        """Test bulk stock with valid request that creates one stock and updates another."""
+        saved_stock: Stock = save_stock()
+        new_product: Product = Product.objects.create(name=secrets.token_hex(16), cost="1.00")
+        timeline_count: int = StockTimeline.objects.count()
+        new_stocks: list[dict[str, Any]] = [
+            {"vending_machine": saved_stock.vending_machine.id, "product": saved_stock.product.id, "quantity": 7},
+            {"vending_machine": saved_stock.vending_machine.id, "product": new_product.id, "quantity": 3},
+        ]
+        response: Any = self.client.post(f"{self.path}bulk/", data=new_stocks, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_values(response, "status"), ["updated", "created"])
+        self.assertEqual(response.data[0]["id"], saved_stock.id)
+        self.assertEqual(Stock.objects.get(id=saved_stock.id).quantity, 7)
+        self.assertEqual(Stock.objects.get(id=response.data[1]["id"]).quantity, 3)
+        self.assertEqual(
+            list(StockTimeline.objects.order_by("id").values_list("quantity", flat=True)[timeline_count:]), [7, 3]
+        )
+
+    def test_bulk_stock_should_report_invalid_items(self) -> None:
+        """Test bulk stock with invalid items, where the valid items are still saved."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        saved_product: Product = save_product()
+        new_stocks: list[dict[str, Any]] = [
+            {"vending_machine": saved_vending_machine.id, "product": saved_product.id, "quantity": 5},
+            {"vending_machine": saved_vending_machine.id, "product": saved_product.id, "quantity": 6},
+            {"vending_machine": 99999, "product": saved_product.id, "quantity": 5},
+            {"vending_machine": saved_vending_machine.id, "product": saved_product.id, "quantity": "x"},
+            {"vending_machine": saved_vending_machine.id, "product": saved_product.id, "quantity": 2147483648},
+        ]
+        response: Any = self.client.post(f"{self.path}bulk/", data=new_stocks, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_values(response, "status"), ["created", "error", "error", "error", "error"])
+        self.assertIn("vending_machine", response.data[2]["errors"])
+        self.assertIn("quantity", response.data[3]["errors"])
+        self.assertIn("quantity", response.data[4]["errors"])
+        self.assertEqual(Stock.objects.get(id=response.data[0]["id"]).quantity, 5)
+
+    def test_bulk_stock_should_fail_when_body_is_not_a_list(self) -> None:
+        """Test bulk stock with invalid request where body is not a list."""
+        response: Any = self.client.post(f"{self.path}bulk/", data={}, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_stock_should_use_constant_number_of_queries(self) -> None:
+        """Test bulk stock where the number of queries does not grow with the number of items."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        products: list[Product] = Product.objects.bulk_create(
+            [Product(name=secrets.token_hex(16), cost="1.00") for _ in range(50)]
+        )
+        query_counts: list[int] = []
+        for size in (5, 50):
+            new_stocks: list[dict[str, Any]] = [
+                {"vending_machine": saved_vending_machine.id, "product": product.id, "quantity": size}
+                for product in products[:size]
+            ]
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(f"{self.path}bulk/", data=new_stocks, content_type=self.content_type)
+            query_counts.append(len(context.captured_queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    @patch("api.services.stock_service.STOCK_KEY_BATCH_SIZE", 2)
+    def test_bulk_stock_should_read_exact_pairs(self) -> None:
+        """Test bulk stock where the stocks of other products of the same vending machines are not read."""
+        vending_machines: list[VendingMachine] = VendingMachine.objects.bulk_create(
+            [VendingMachine(name=secrets.token_hex(16), location="floor") for _ in range(3)]
+        )
+        products: list[Product] = Product.objects.bulk_create(
+            [Product(name=secrets.token_hex(16), cost="1.00") for _ in range(3)]
+        )
+        Stock.objects.bulk_create(
+            [Stock(vending_machine=vending_machines[i], product=products[(i + 1) % 3], quantity=1) for i in range(3)]
+            + [Stock(vending_machine=vending_machines[2], product=products[2], quantity=1)]
+        )
+        new_stocks: list[dict[str, Any]] = [
+            {"vending_machine": vending_machines[i].id, "product": products[i].id, "quantity": 9} for i in range(3)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.post(f"{self.path}bulk/", data=new_stocks, content_type=self.content_type)
+        self.assertEqual(get_values(response, "status"), ["created", "created", "updated"])
+        reads: list[str] = [
+            query["sql"] for query in context.captured_queries if query["sql"].startswith('SELECT "api_stock"')
+        ]
+        self.assertEqual(len(reads), 4)
+        self.assertFalse([sql for sql in reads if '"api_stock"."product_id" IN' in sql])
+
+    def test_vend_stock_should_pass(self) -> None:
+        """Test vend stock with valid request, which decreases the quantity and saves a stock timeline."""
+        saved_stock: Stock = save_stock()
+        Stock.objects.filter(id=saved_stock.id).update(quantity=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            response: Any = self.client.post(
+                f"{self.path}{saved_stock.id}/vend/", data={"quantity": 2}, content_type=self.content_type
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["quantity"], 3)
+        self.assertEqual(Stock.objects.get(id=saved_stock.id).quantity, 3)
+        self.assertEqual(StockTimeline.objects.order_by("id").last().quantity, 3)
+
+    def test_vend_stock_should_fail_when_quantity_is_insufficient(self) -> None:
+        """Test vend stock with invalid request where fewer items are left than vended."""
+        saved_stock: Stock = save_stock()
+        Stock.objects.filter(id=saved_stock.id).update(quantity=1)
+        timeline_count: int = StockTimeline.objects.count()
+        response: Any = self.client.post(
+            f"{self.path}{saved_stock.id}/vend/", data={"quantity": 2}, content_type=self.content_type
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Stock.objects.get(id=saved_stock.id).quantity, 1)
+        self.assertEqual(StockTimeline.objects.count(), timeline_count)
+
+    def test_vend_stock_should_fail_when_id_is_not_found(self) -> None:
+        """Test vend stock with invalid request where stock id does not exist."""
+        response: Any = self.client.post(f"{self.path}99999/vend/", data={}, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_restock_stock_should_pass(self) -> None:
+        """Test restock stock with valid request, which increases the quantity in a single update."""
+        saved_stock: Stock = save_stock()
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.post(
+                f"{self.path}{saved_stock.id}/restock/", data={"quantity": 10}, content_type=self.content_type
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["quantity"], saved_stock.quantity + 10)
+        updates: list[str] = [query["sql"] for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"quantity" = ("api_stock"."quantity" + 10)', updates[0])
+
+    def test_restock_stock_should_fail_when_quantity_overflows(self) -> None:
+        """Test restock stock with invalid request where the quantity would not fit the column."""
+        saved_stock: Stock = save_stock()
+        Stock.objects.filter(id=saved_stock.id).update(quantity=Stock.MAX_QUANTITY - 1)
+        response: Any = self.client.post(
+            f"{self.path}{saved_stock.id}/restock/", data={"quantity": 2}, content_type=self.content_type
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn("quantity", response.data)
+        self.assertEqual(Stock.objects.get(id=saved_stock.id).quantity, Stock.MAX_QUANTITY - 1)
+        response = self.client.post(
+            f"{self.path}adjust/",
+            data=[{"id": saved_stock.id, "delta": 1}, {"id": saved_stock.id, "delta": 1}],
+            content_type=self.content_type,
+        )
+        self.assertEqual(get_values(response, "status"), ["updated", "error"])
+        self.assertEqual(response.data[0]["quantity"], Stock.MAX_QUANTITY)
+
+    def test_adjust_stock_should_pass(self) -> None:
+        """Test adjust stock with repeated, insufficient and invalid items, where valid items are applied in order."""
+        saved_stock: Stock = save_stock()
+        Stock.objects.filter(id=saved_stock.id).update(quantity=5)
+        timeline_count: int = StockTimeline.objects.count()
+        items: list[dict[str, Any]] = [
+            {"id": saved_stock.id, "delta": -4},
+            {"id": saved_stock.id, "delta": -4},
+            {"id": saved_stock.id, "delta": 10},
+            {"id": 99999, "delta": 1},
+            {"id": saved_stock.id, "delta": 0},
+        ]
+        response: Any = self.client.post(f"{self.path}adjust/", data=items, content_type=self.content_type)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_values(response, "status"), ["updated", "error", "updated", "error", "error"])
+        self.assertEqual([response.data[0]["quantity"], response.data[2]["quantity"]], [1, 11])
+        self.assertEqual(response.data[1]["errors"]["quantity"], ["Ensure this value is less than or equal to 1."])
+        self.assertIn("id", response.data[3]["errors"])
+        self.assertIn("delta", response.data[4]["errors"])
+        self.assertEqual(
+            list(StockTimeline.objects.order_by("id").values_list("quantity", flat=True)[timeline_count:]), [1, 11]
+        )
+
+    def test_low_stock_should_follow_stock_writes(self) -> None:
+        """Test low stock where stocks enter and leave the list as they are written, without scanning stocks."""
+        saved_stock: Stock = save_stock()
+        StockThreshold.objects.create(product=saved_stock.product, reorder_level=5)
+        saved_stock.quantity = 5
+        saved_stock.save()
+        response: Any = self.client.get(f"{self.path}low/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+        self.client.post(f"{self.path}{saved_stock.id}/vend/")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"{self.path}low/", {"vending_machine": saved_stock.vending_machine_id})
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "id": saved_stock.id,
+                    "vending_machine": saved_stock.vending_machine_id,
+                    "product": saved_stock.product_id,
+                    "quantity": 4,
+                    "reorder_level": 5,
+                }
+            ],
+        )
+        self.client.post(f"{self.path}{saved_stock.id}/restock/")
+        self.assertEqual(self.client.get(f"{self.path}low/").data, [])
+
+    def test_low_stock_should_include_created_stocks(self) -> None:
+        """Test low stock where stocks created alone or in bulk get the reorder level of their product."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        saved_product: Product = save_product()
+        other_product: Product = Product.objects.create(name="other", cost=1)
+        StockThreshold.objects.create(product=saved_product, reorder_level=5)
+        StockThreshold.objects.create(product=other_product, reorder_level=5)
+        self.client.post(
+            self.path,
+            data={"vending_machine": saved_vending_machine.id, "product": saved_product.id, "quantity": 1},
+            content_type=self.content_type,
+        )
+        self.client.post(
+            f"{self.path}bulk/",
+            data=[{"vending_machine": saved_vending_machine.id, "product": other_product.id, "quantity": 2}],
+            content_type=self.content_type,
+        )
+        response: Any = self.client.get(f"{self.path}low/")
+        self.assertEqual([data["quantity"] for data in response.data], [1, 2])
+        response = self.client.get(f"{self.path}low/", {"product": other_product.id})
+        self.assertEqual([data["quantity"] for data in response.data], [2])
+
+    def test_low_stock_should_fail_when_filter_is_invalid(self) -> None:
+        """Test low stock with invalid request where vending machine is not an integer."""
+        response: Any = self.client.get(f"{self.path}low/", {"vending_machine": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def save_forecast_stocks(self) -> list[Stock]:
+        """
+        Save three stocks, the first one sold 4 items every day, the second one 2 items yesterday only, and refresh.
+
+        Returns:
+            list[Stock]: Saved stocks.
+        """
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        stocks: list[Stock] = [
+            Stock.objects.create(
+                vending_machine=saved_vending_machine,
+                product=Product.objects.create(name=f"product {index}", cost=1),
+                quantity=quantity,
+            )
+            for index, quantity in enumerate((10, 30, 5))
+        ]
+        today: date = timezone.localdate()
+        StockConsumption.objects.bulk_create(
+            [
+                StockConsumption(
+                    vending_machine=saved_vending_machine,
+                    product=stocks[0].product,
+                    day=today - timedelta(days=age),
+                    sold=4,
+                    restocked=0,
+                )
+                for age in range(29)
+            ]
+            + [
+                StockConsumption(
+                    vending_machine=saved_vending_machine,
+                    product=stocks[1].product,
+                    day=today - timedelta(days=1),
+                    sold=2,
+                    restocked=0,
+                )
+            ]
+        )
+        stdout: io.StringIO = io.StringIO()
+        call_command("refresh_forecasts", stdout=stdout)
+        self.assertIn("Refreshed 3 stock forecasts.", stdout.getvalue())
+        return stocks
+
+    def test_forecast_stock_should_pass(self) -> None:
+        """Test forecast stock where consumed stocks are returned the soonest empty first, within the given days."""
+        stocks: list[Stock] = self.save_forecast_stocks()
+        response: Any = self.client.get(f"{self.path}forecast/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data["id"] for data in response.data], [stocks[0].id, stocks[1].id])
+        self.assertAlmostEqual(response.data[0]["rate"], 4)
+        self.assertAlmostEqual(response.data[0]["days_until_empty"], 2.5)
+        self.assertAlmostEqual(response.data[1]["rate"], 0.6, places=3)
+        response = self.client.get(f"{self.path}forecast/", {"within_days": 10})
+        self.assertEqual([data["id"] for data in response.data], [stocks[0].id])
+
+    def test_forecast_stock_should_follow_stock_writes(self) -> None:
+        """Test forecast stock where days until empty follow the quantity saved after the forecast."""
+        stocks: list[Stock] = self.save_forecast_stocks()
+        stocks[1].quantity = 1
+        stocks[1].save()
+        response: Any = self.client.get(f"{self.path}forecast/", {"product": stocks[1].product_id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(response.data[0]["days_until_empty"], 1 / 0.6, places=3)
+        self.assertLess(
+            abs(parse_datetime(response.data[0]["empty_at"]) - timezone.now() - timedelta(days=1 / 0.6)),
+            timedelta(minutes=1),
+        )
+
+    def test_forecast_stock_should_fail_when_filter_is_invalid(self) -> None:
+        """Test forecast stock with invalid request where within days is negative."""
+        response: Any = self.client.get(f"{self.path}forecast/", {"within_days": -1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_replenishment_stock_should_pass(self) -> None:
+        """Test replenishment stock where the units needed by active vending machines are grouped by location."""
+        north: VendingMachine = VendingMachine.objects.create(name="north 1", location="north")
+        other_north: VendingMachine = VendingMachine.objects.create(name="north 2", location="north")
+        south: VendingMachine = VendingMachine.objects.create(name="south", location="south")
+        inactive: VendingMachine = VendingMachine.objects.create(name="north 3", location="north", is_active=False)
+        product: Product = Product.objects.create(name="water", cost=1)
+        other_product: Product = Product.objects.create(name="soda", cost=1)
+        for vending_machine, stock_product, quantity in (
+            (north, product, 2),
+            (north, other_product, 10),
+            (other_north, product, 5),
+            (south, other_product, 0),
+            (inactive, product, 0),
+        ):
+            Stock.objects.create(vending_machine=vending_machine, product=stock_product, quantity=quantity)
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.get(f"{self.path}replenishment/", {"target": 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len([query for query in context.captured_queries if "api_stock" in query["sql"]]), 1)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "location": "north",
+                    "units": 13,
+                    "products": [
+                        {
+                            "product": product.id,
+                            "name": "water",
+                            "units": 13,
+                            "vending_machines": [
+                                {"vending_machine": north.id, "units": 8},
+                                {"vending_machine": other_north.id, "units": 5},
+                            ],
+                        }
+                    ],
+                },
+                {
+                    "location": "south",
+                    "units": 10,
+                    "products": [
+                        {
+                            "product": other_product.id,
+                            "name": "soda",
+                            "units": 10,
+                            "vending_machines": [{"vending_machine": south.id, "units": 10}],
+                        }
+                    ],
+                },
+            ],
+        )
+        response = self.client.get(f"{self.path}replenishment/", {"target": 10, "location": "south"})
+        self.assertEqual([pick_list["location"] for pick_list in response.data], ["south"])
+
+    def test_replenishment_stock_should_fail_when_target_is_missing(self) -> None:
+        """Test replenishment stock with invalid request where target is missing."""
+        response: Any = self.client.get(f"{self.path}replenishment/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -4,8 +4,10 @@ from typing import Any
 from django.test import TestCase
 from rest_framework import status
 
+from api.models.product import Product
+from api.models.stock import Stock
 from api.models.vending_machine import VendingMachine
-from api.tests.utils import get_values, save_vending_machine
+from api.tests.utils import get_values, save_product, save_vending_machine
 
 
 class TestVendingMachineView(TestCase):
@@ -121,3 +123,73 @@ class TestVendingMachineView(TestCase):
         """Test delete vending machine with invalid request where vending machine id does not exist."""
         response: Any = self.client.delete(f"{self.path}99999/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def save_located_vending_machines(self) -> list[VendingMachine]:
+        """
+        Save vending machines in Paris, one of them inactive, in London, and one without coordinates.
+
+        Returns:
+            list[VendingMachine]: Saved vending machines.
+        """
+        return [
+            VendingMachine.objects.create(
+                name=name, location=name, is_active=is_active, latitude=latitude, longitude=longitude
+            )
+            for name, is_active, latitude, longitude in (
+                ("louvre", True, 48.8606, 2.3376),
+                ("notre dame", True, 48.8530, 2.3499),
+                ("eiffel", False, 48.8584, 2.2945),
+                ("london", True, 51.5074, -0.1278),
+                ("unknown", True, None, None),
+            )
+        ]
+
+    def test_nearby_vending_machine_should_pass(self) -> None:
+        """Test nearby vending machine where the nearest active ones are returned, beyond the first cells if needed."""
+        vending_machines: list[VendingMachine] = self.save_located_vending_machines()
+        response: Any = self.client.get(f"{self.path}nearby/", {"lat": 48.8566, "lon": 2.3522, "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data["id"] for data in response.data], [vending_machines[1].id, vending_machines[0].id])
+        self.assertAlmostEqual(response.data[0]["distance"], 434, delta=1)
+        response = self.client.get(f"{self.path}nearby/", {"lat": 48.8566, "lon": 2.3522})
+        self.assertEqual(
+            [data["id"] for data in response.data],
+            [vending_machines[1].id, vending_machines[0].id, vending_machines[3].id],
+        )
+
+    def test_nearby_vending_machine_should_filter_by_product_in_stock(self) -> None:
+        """Test nearby vending machine where only vending machines with the product in stock are returned."""
+        vending_machines: list[VendingMachine] = self.save_located_vending_machines()
+        saved_product: Product = save_product()
+        Stock.objects.create(vending_machine=vending_machines[0], product=saved_product, quantity=0)
+        Stock.objects.create(vending_machine=vending_machines[3], product=saved_product, quantity=3)
+        response: Any = self.client.get(
+            f"{self.path}nearby/", {"lat": 48.8566, "lon": 2.3522, "product": saved_product.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data["id"] for data in response.data], [vending_machines[3].id])
+
+    def test_update_vending_machine_should_update_geohash(self) -> None:
+        """Test update vending machine where the geohash follows the coordinates."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        response: Any = self.client.patch(
+            f"{self.path}{saved_vending_machine.id}/",
+            data={"latitude": 57.64911, "longitude": 10.40744},
+            content_type=self.content_type,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        saved_vending_machine.refresh_from_db()
+        self.assertEqual(saved_vending_machine.geohash[:11], "u4pruydqqvj")
+
+    def test_update_vending_machine_should_fail_when_longitude_is_missing(self) -> None:
+        """Test update vending machine with invalid request where only the latitude is set."""
+        saved_vending_machine: VendingMachine = save_vending_machine()
+        response: Any = self.client.patch(
+            f"{self.path}{saved_vending_machine.id}/", data={"latitude": 57.6}, content_type=self.content_type
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nearby_vending_machine_should_fail_when_latitude_is_invalid(self) -> None:
+        """Test nearby vending machine with invalid request where latitude is out of range."""
+        response: Any = self.client.get(f"{self.path}nearby/", {"lat": 91, "lon": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -2,7 +2,13 @@ from django.urls import include, path
 from rest_framework import routers
 from rest_framework.routers import DefaultRouter
 
+from api.views.async_inventory_view import AsyncInventoryView
+from api.views.async_stock_timeline_view import AsyncStockTimelineView
+from api.views.async_stock_view import AsyncStockView
+from api.views.cache_stats_view import CacheStatsView
+from api.views.metrics_view import MetricsView
 from api.views.product_view import ProductView
+from api.views.stock_threshold_view import StockThresholdView
 from api.views.stock_timeline_view import StockTimelineView
 from api.views.stock_view import StockView
 from api.views.vending_machine_view import VendingMachineView
@@ -12,8 +18,15 @@ router.register(r"vending-machine", VendingMachineView)
 router.register(r"product", ProductView)
 router.register(r"stock", StockView)
 router.register(r"stock-timeline", StockTimelineView)
+router.register(r"stock-threshold", StockThresholdView)
 
 urlpatterns: list = [
     path("", include(router.urls)),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("async/stock/", AsyncStockView.as_view(), name="async-stock-list"),
+    path("async/stock-timeline/", AsyncStockTimelineView.as_view(), name="async-stocktimeline-list"),
+    path("async/vending-machine/inventory/", AsyncInventoryView.as_view(), name="async-vendingmachine-fleet-inventory"),
+    path("async/vending-machine/<pk>/inventory/", AsyncInventoryView.as_view(), name="async-vendingmachine-inventory"),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
 ]
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from api.models.stock import Stock
+from api.models.vending_machine import VendingMachine
+from api.serializers.inventory_serializer import InventorySerializer
+from api.services.inventory_service import aget_inventories, get_inventories_as_of, get_inventory
+from api.services.stock_history_service import get_as_of
+from api.views.async_read_view import AsyncReadView
+
+
+class AsyncInventoryView(AsyncReadView):
+    """Get: Return the stocked products of the existing vending machine, or of all of them, now or as of a time."""
+
+    async def get(self, request: Request, pk: Optional[Any] = None) -> HttpResponse:
+        """Return the stocked products with their quantity and value, now or `as_of`."""
+        as_of: Optional[datetime] = get_as_of(request)
+        if pk is None:
+            inventories: list[dict[str, Any]] = (
+                await aget_inventories(Stock.objects.all())
+                if as_of is None
+                else await sync_to_async(get_inventories_as_of)(as_of)
+            )
+            return self.render(InventorySerializer(inventories, many=True).data)
+        # A single hop to the thread of the ORM for both queries, as every async query of Django 4 is one.
+        return self.render(InventorySerializer(await sync_to_async(self.get_inventory)(pk, as_of)).data)
+
+    def get_inventory(self, pk: Any, as_of: Optional[datetime]) -> dict[str, Any]:
+        """
+        Return the inventory of the given vending machine, now or at the given time.
+
+        Params:
+            pk (Any): Id of the vending machine
+            as_of (Optional[datetime]): Point in time, now by default
+        Returns:
+            dict[str, Any]: Inventory with the stocked products and their totals.
+        Raises:
+            NotFound: The vending machine does not exist.
+        """
+        vending_machine: Optional[VendingMachine] = (
+            VendingMachine.objects.filter(pk=pk).first() if str(pk).isdigit() else None
+        )
+        if vending_machine is None:
+            raise NotFound(f"No {VendingMachine._meta.object_name} matches the given query.")
+        return get_inventory(vending_machine, as_of)
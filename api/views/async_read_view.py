@@ -0,0 +1,39 @@
+from typing import Any
+
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from api.renderers.orjson_renderer import ORJSONRenderer
+
+
+class AsyncReadView(View):
+    """
+    Base of the asynchronous read views, served without a thread per request under ASGI.
+
+    Handlers get a REST framework request, so they share the query parameter validation of the API views,
+    and their data and errors are rendered as JSON the same way.
+    """
+
+    http_method_names: list[str] = ["get", "options"]
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Call the handler with a REST framework request, and render the API errors it raises."""
+        try:
+            return await super().dispatch(Request(request), *args, **kwargs)
+        except APIException as error:
+            data: Any = error.detail if isinstance(error.detail, (dict, list)) else {"detail": error.detail}
+            return self.render(data, error.status_code)
+
+    def render(self, data: Any, status: int = 200) -> HttpResponse:
+        """
+        Return the given data as a JSON response.
+
+        Params:
+            data (Any): Data to be rendered
+            status (int): Status code of the response
+        Returns:
+            HttpResponse: JSON response.
+        """
+        return HttpResponse(ORJSONRenderer().render(data), content_type="application/json", status=status)
@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.http import HttpResponse
+from rest_framework.request import Request
+
+from api.models.stock_timeline import StockTimeline
+from api.pagination.stock_timeline_pagination import StockTimelinePagination
+from api.serializers.read_serializer import ReadSerializer, get_read_serializer
+from api.serializers.stock_timeline_serializer import StockTimelineSerializer
+from api.services.stock_timeline_service import filter_stock_timelines
+from api.views.async_read_view import AsyncReadView
+
+
+class AsyncStockTimelineView(AsyncReadView):
+    """Get: Return a page of the existing stock timelines ordered by timestamp, with the filters of the list."""
+
+    async def get(self, request: Request) -> HttpResponse:
+        """Return the page of stock timelines after the cursor, with the link to the next page."""
+        serializer: ReadSerializer = get_read_serializer(StockTimelineSerializer)
+        pagination: StockTimelinePagination = StockTimelinePagination()
+        page: list[Any] = await pagination.apaginate_queryset(
+            filter_stock_timelines(StockTimeline.objects.all(), request.query_params).values(*serializer.sources),
+            request,
+        )
+        return self.render({"next": pagination.get_next_link(), "results": serializer.serialize(page)})
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.request import Request
+
+from api.models.stock import Stock
+from api.serializers.as_of_serializer import StockAsOfSerializer
+from api.serializers.read_serializer import ReadSerializer, get_read_serializer
+from api.serializers.stock_serializer import StockSerializer
+from api.services.stock_history_service import get_as_of, get_stocks_as_of
+from api.views.async_read_view import AsyncReadView
+
+
+class AsyncStockView(AsyncReadView):
+    """Get: Return a list of all the existing stocks, or of the quantities as of a time."""
+
+    async def get(self, request: Request) -> HttpResponse:
+        """Return the stocks, or the quantity of every product in every vending machine `as_of` a time."""
+        as_of: Optional[datetime] = get_as_of(request)
+        if as_of is not None:
+            stocks: dict[tuple[int, int], int] = await sync_to_async(get_stocks_as_of)(as_of)
+            rows: list[dict[str, Any]] = [
+                {"vending_machine": vending_machine_id, "product": product_id, "quantity": quantity}
+                for (vending_machine_id, product_id), quantity in sorted(stocks.items())
+            ]
+            return self.render(StockAsOfSerializer(rows, many=True).data)
+        serializer: ReadSerializer = get_read_serializer(StockSerializer)
+        return self.render(serializer.serialize([row async for row in Stock.objects.values(*serializer.sources)]))
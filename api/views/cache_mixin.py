@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.conf import settings
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.routers.replica_router import get_state, read_from_primary
+from api.services.cache_service import get_namespace, get_or_set
+
+
+class CacheMixin:
+    """
+    Viewset mixin which caches list and retrieve responses.
+
+    Cached responses are invalidated when a save or delete of an instance of the model commits. They are read from
+    default on a miss, never from a lagging replica, and clients within the sticky window of a write skip the cache.
+    """
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """Return the cached list response, or list and cache it."""
+        return self.get_cached_response(request, lambda: super(CacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Return the cached retrieve response, or retrieve and cache it."""
+        return self.get_cached_response(request, lambda: super(CacheMixin, self).retrieve(request, *args, **kwargs))
+
+    def get_cached_response(self, request: Request, get_response: Any) -> Response:
+        """
+        Return a response with the cached data of the request path.
+
+        Params:
+            request (Request): Request to be answered
+            get_response (Any): Function returning the response on a miss
+        Returns:
+            Response: Response with the cached data.
+        """
+        if not settings.API_CACHE_ENABLED or get_state().primary:
+            return get_response()
+
+        def get_data() -> Any:
+            """Return the data of the response, read from default."""
+            with read_from_primary():
+                return get_response().data
+
+        data: Any = get_or_set(
+            get_namespace(self.get_queryset().model), f"response:{request.get_full_path()}", get_data
+        )
+        return Response(data)
@@ -0,0 +1,13 @@
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.services.cache_service import cache_stats
+
+
+class CacheStatsView(APIView):
+    """Get: Return the hits and misses of the API cache per namespace, for the process serving the request."""
+
+    def get(self, request: Request) -> Response:
+        """Return the hits and misses of the API cache."""
+        return Response(cache_stats.snapshot())
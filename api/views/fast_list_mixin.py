@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.serializers.read_serializer import ReadSerializer, get_read_serializer
+
+
+class FastListMixin:
+    """
+    Viewset mixin which lists `.values()` rows through a read serializer instead of the model serializer.
+
+    The response is the same as the one of the model serializer, without building model instances
+    or going through the fields of the model serializer for every row.
+    """
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """Return the list of rows, or fall back to the model serializer when `API_FAST_LIST_ENABLED` is off."""
+        if not settings.API_FAST_LIST_ENABLED:
+            return super().list(request, *args, **kwargs)
+        serializer: ReadSerializer = get_read_serializer(self.get_serializer_class())
+        queryset: QuerySet = self.filter_queryset(self.get_queryset()).values(*serializer.sources)
+        page: Optional[list[Any]] = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
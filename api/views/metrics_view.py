@@ -0,0 +1,13 @@
+from django.http import HttpResponse
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from api.services.metrics_service import request_metrics
+
+
+class MetricsView(APIView):
+    """Get: Return the request histograms per route in the Prometheus format, for the process serving the request."""
+
+    def get(self, request: Request) -> HttpResponse:
+        """Return the request histograms."""
+        return HttpResponse(request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,12 +1,22 @@
 from typing import Any
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
 
 from api.models.product import Product
 from api.serializers.product_serializer import ProductSerializer
+from api.services.cache_service import get_cached_instance
+from api.services.product_availability_service import get_product_availability
+from api.views.cache_mixin import CacheMixin
+from api.views.conditional_mixin import ConditionalMixin
+from api.views.fast_list_mixin import FastListMixin
+from api.views.replica_mixin import ReplicaMixin
 
 
-class ProductView(viewsets.ModelViewSet):
+class ProductView(ReplicaMixin, ConditionalMixin, CacheMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Create: Create a new product instance.
 
@@ -17,7 +27,20 @@ class ProductView(viewsets.ModelViewSet):
     Destroy: Delete the existing product.
 
     List: Return a list of all the existing products.
+
+    Availability: Return the active vending machines which have the existing product in stock.
     """
 
     queryset: Any = Product.objects.all()
     serializer_class = ProductSerializer
+
+    @action(detail=True, methods=["get"])
+    def availability(self, request: Request, pk: Any = None) -> Response:
+        """Return the ids of the active vending machines with the product in stock, from the bitmaps or the index."""
+        if not str(pk).isdigit():
+            raise NotFound
+        try:
+            product: Product = get_cached_instance(Product, int(pk))
+        except Product.DoesNotExist:
+            raise NotFound
+        return Response({"product": product.id, "vending_machines": get_product_availability(product.id)})
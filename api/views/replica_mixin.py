@@ -0,0 +1,20 @@
+from typing import Optional
+
+from django.http import HttpResponseBase
+from rest_framework.request import Request
+
+from api.routers.replica_router import read_from_replica
+
+
+class ReplicaMixin:
+    """Viewset mixin which reads the list and retrieve actions from a replica, when one is configured."""
+
+    replica_actions: tuple[str, ...] = ("list", "retrieve")
+
+    def dispatch(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        """Handle the request, inside `read_from_replica` for the replica actions."""
+        action: Optional[str] = getattr(self, "action_map", {}).get(request.method.lower())
+        if action not in self.replica_actions:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
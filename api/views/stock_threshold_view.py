@@ -0,0 +1,24 @@
+from typing import Any
+
+from rest_framework import viewsets
+
+from api.models.stock_threshold import StockThreshold
+from api.serializers.stock_threshold_serializer import StockThresholdSerializer
+from api.views.fast_list_mixin import FastListMixin
+
+
+class StockThresholdView(FastListMixin, viewsets.ModelViewSet):
+    """
+    Create: Create a new stock threshold instance, for a product in one vending machine or in all of them.
+
+    Retrieve: Return the existing stock threshold.
+
+    Update: Update the existing stock threshold.
+
+    Destroy: Delete the existing stock threshold.
+
+    List: Return a list of all the existing stock thresholds.
+    """
+
+    queryset: Any = StockThreshold.objects.all()
+    serializer_class = StockThresholdSerializer
@@ -1,12 +1,43 @@
-from typing import Any
+from typing import Any, Optional
 
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from api.models.stock_timeline import StockTimeline
+from api.pagination.stock_timeline_pagination import StockTimelinePagination
+from api.renderers.event_stream_renderer import EventStreamRenderer
+from api.serializers.stock_consumption_serializer import (
+    StockConsumptionFilterSerializer,
+    StockConsumptionSerializer,
+)
+from api.serializers.stock_feed_filter_serializer import StockFeedFilterSerializer
 from api.serializers.stock_timeline_serializer import StockTimelineSerializer
+from api.serializers.stock_timeline_series_serializer import (
+    StockTimelineSeriesFilterSerializer,
+    StockTimelineSeriesSerializer,
+)
+from api.services.stock_consumption_service import get_stock_consumptions
+from api.services.stock_feed_service import stream_stock_changes
+from api.services.stock_timeline_series_service import get_stock_timeline_series
+from api.services.stock_timeline_service import (
+    CSV,
+    EXPORT_FORMATS,
+    NDJSON,
+    export_stock_timelines,
+    filter_stock_timelines,
+)
+from api.views.conditional_mixin import ConditionalMixin
+from api.views.fast_list_mixin import FastListMixin
+from api.views.replica_mixin import ReplicaMixin
 
 
-class StockTimelineView(viewsets.ModelViewSet):
+class StockTimelineView(ReplicaMixin, ConditionalMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Create: Create a new stock timeline instance.
 
@@ -16,8 +47,76 @@ class StockTimelineView(viewsets.ModelViewSet):
 
     Destroy: Delete the existing stock timeline.
 
-    List: Return a list of all the existing stock timelines.
+    List: Return a page of the existing stock timelines ordered by timestamp, filtered by vending_machine,
+    product, since and until.
+
+    Export: Stream all the existing stock timelines as NDJSON or CSV, with the same filters as list.
+
+    Series: Return the existing stock timelines aggregated per hour or day, with the same filters as list.
+
+    Consumption: Return the units sold and restocked and the sell-through rate per stock or per product, filtered by
+    vending_machine, product, since and until.
+
+    Feed: Stream the new stock timelines as server-sent events as they are saved, filtered by vending_machine.
     """
 
     queryset: Any = StockTimeline.objects.all()
     serializer_class = StockTimelineSerializer
+    pagination_class = StockTimelinePagination
+    content_types: dict[str, str] = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+    def get_queryset(self) -> QuerySet:
+        """Return the stock timelines, filtered by the query parameters when listing or exporting."""
+        queryset: QuerySet = super().get_queryset()
+        if self.action not in ("list", "export"):
+            return queryset
+        return filter_stock_timelines(queryset, self.request.query_params)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """Stream the stock timelines as NDJSON or CSV, chosen by the `output` query parameter."""
+        export_format: str = request.query_params.get("output", NDJSON)
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({"output": [f'"{export_format}" is not a valid choice.']})
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            export_stock_timelines(self.get_queryset(), export_format), content_type=self.content_types[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="stock-timeline.{export_format}"'
+        return response
+
+    @action(detail=False, methods=["get"])
+    def series(self, request: Request) -> Response:
+        """Return the last, min and max quantity and the number of changes per `interval` bucket."""
+        serializer: StockTimelineSeriesFilterSerializer = StockTimelineSeriesFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        series: list[dict[str, Any]] = get_stock_timeline_series(serializer.validated_data)
+        return Response(StockTimelineSeriesSerializer(series, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def consumption(self, request: Request) -> Response:
+        """Return the top sellers or slow movers per stock or per product, chosen by `group` and `ordering`."""
+        serializer: StockConsumptionFilterSerializer = StockConsumptionFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        consumptions: list[dict[str, Any]] = get_stock_consumptions(serializer.validated_data)
+        return Response(StockConsumptionSerializer(consumptions, many=True).data)
+
+    @action(
+        detail=False, methods=["get"], renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
+    )
+    def feed(self, request: Request) -> StreamingHttpResponse:
+        """Stream the stock changes after `last_id` or the `Last-Event-ID` header, then the new ones as they commit."""
+        query_params: Any = request.query_params.copy()
+        if "last_id" not in query_params and "HTTP_LAST_EVENT_ID" in request.META:
+            query_params["last_id"] = request.META["HTTP_LAST_EVENT_ID"]
+        serializer: StockFeedFilterSerializer = StockFeedFilterSerializer(data=query_params)
+        serializer.is_valid(raise_exception=True)
+        vending_machines: Optional[list[int]] = serializer.validated_data.get("vending_machine")
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            stream_stock_changes(
+                set(vending_machines) if vending_machines else None, serializer.validated_data.get("last_id")
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
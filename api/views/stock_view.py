@@ -1,12 +1,33 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
-from rest_framework import viewsets
+from django.db.models import F, Model, QuerySet
+from django.http import HttpResponseBase
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
 
 from api.models.stock import Stock
+from api.models.stock_timeline import StockTimeline
+from api.serializers.as_of_serializer import StockAsOfSerializer
+from api.serializers.low_stock_serializer import LowStockFilterSerializer, LowStockSerializer
+from api.serializers.read_serializer import ReadSerializer, get_read_serializer
+from api.serializers.replenishment_filter_serializer import ReplenishmentFilterSerializer
+from api.serializers.stock_adjust_serializer import StockAdjustSerializer
+from api.serializers.stock_forecast_serializer import StockForecastFilterSerializer, StockForecastSerializer
 from api.serializers.stock_serializer import StockSerializer
+from api.services.replenishment_service import get_pick_lists
+from api.services.stock_forecast_service import get_stock_forecasts
+from api.services.stock_history_service import get_as_of, get_stocks_as_of
+from api.services.stock_service import ERROR, adjust_stocks, bulk_adjust_stocks, bulk_upsert_stocks
+from api.views.conditional_mixin import ConditionalMixin
+from api.views.fast_list_mixin import FastListMixin
+from api.views.replica_mixin import ReplicaMixin
 
 
-class StockView(viewsets.ModelViewSet):
+class StockView(ReplicaMixin, ConditionalMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Create: Create a new stock instance.
 
@@ -16,8 +37,119 @@ class StockView(viewsets.ModelViewSet):
 
     Destroy: Delete the existing stock.
 
-    List: Return a list of all the existing stocks.
+    List: Return a list of all the existing stocks, or of the quantities as of a time.
+
+    Bulk: Create or update a list of stocks in one transaction and return a result per item.
+
+    Vend: Decrease the quantity of the existing stock, failing if fewer items are left.
+
+    Restock: Increase the quantity of the existing stock.
+
+    Adjust: Apply a list of signed quantity changes in one transaction and return a result per item.
+
+    Low: Return the existing stocks below their reorder level, filtered by vending_machine and product.
+
+    Forecast: Return the existing stocks being consumed, the soonest empty first, filtered by vending_machine,
+    product and within_days.
+
+    Replenishment: Return the pick list of every location of active vending machines, the units of every product
+    needed to fill the stocks up to target, filtered by location.
     """
 
     queryset: Any = Stock.objects.all()
     serializer_class = StockSerializer
+
+    def get_version_models(self) -> tuple[type[Model], ...]:
+        """Return the stock and stock timeline models, since the `as_of` list is read from the stock timelines."""
+        return (Stock, StockTimeline)
+
+    def get_queryset(self) -> QuerySet:
+        """Return the stocks, joined with their vending machine and product when they are validated on update."""
+        queryset: QuerySet = super().get_queryset()
+        if self.action in ("update", "partial_update"):
+            return queryset.select_related("vending_machine", "product")
+        return queryset
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        """Return the stocks, or the quantity of every product in every vending machine `as_of` a time."""
+        as_of: Optional[datetime] = get_as_of(request)
+        if as_of is None:
+            return super().list(request, *args, **kwargs)
+        return self.get_conditional_response(request, lambda: self.list_as_of(as_of))
+
+    def list_as_of(self, as_of: datetime) -> Response:
+        """Return the quantity of every product in every vending machine at the given time."""
+        stocks: list[dict[str, int]] = [
+            {"vending_machine": vending_machine_id, "product": product_id, "quantity": quantity}
+            for (vending_machine_id, product_id), quantity in sorted(get_stocks_as_of(as_of).items())
+        ]
+        return Response(StockAsOfSerializer(stocks, many=True).data)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request: Request) -> Response:
+        """Create or update a list of stocks in one transaction."""
+        if not isinstance(request.data, list):
+            return Response({"non_field_errors": ["Expected a list of items."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(bulk_upsert_stocks(request.data), status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"])
+    def vend(self, request: Request, pk: Any = None) -> Response:
+        """Decrease the quantity of the stock by the given quantity."""
+        return self.adjust_stock(request, pk, -1)
+
+    @action(detail=True, methods=["post"])
+    def restock(self, request: Request, pk: Any = None) -> Response:
+        """Increase the quantity of the stock by the given quantity."""
+        return self.adjust_stock(request, pk, 1)
+
+    @action(detail=False, methods=["post"])
+    def adjust(self, request: Request) -> Response:
+        """Apply a list of signed quantity changes in one transaction."""
+        if not isinstance(request.data, list):
+            return Response({"non_field_errors": ["Expected a list of items."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(bulk_adjust_stocks(request.data), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def low(self, request: Request) -> Response:
+        """Return the stocks below their reorder level, read from the partial index of low stocks."""
+        serializer: LowStockFilterSerializer = LowStockFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        stocks: QuerySet = Stock.objects.filter(quantity__lt=F("reorder_level"))
+        if "vending_machine" in serializer.validated_data:
+            stocks = stocks.filter(vending_machine_id=serializer.validated_data["vending_machine"])
+        if "product" in serializer.validated_data:
+            stocks = stocks.filter(product_id=serializer.validated_data["product"])
+        read_serializer: ReadSerializer = get_read_serializer(LowStockSerializer)
+        return Response(
+            read_serializer.serialize(
+                stocks.order_by("vending_machine_id", "product_id").values(*read_serializer.sources)
+            )
+        )
+
+    @action(detail=False, methods=["get"])
+    def forecast(self, request: Request) -> Response:
+        """Return the consumption rate, days until empty and empty time of the stocks from their forecasts."""
+        serializer: StockForecastFilterSerializer = StockForecastFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        forecasts: list[dict[str, Any]] = get_stock_forecasts(serializer.validated_data)
+        return Response(StockForecastSerializer(forecasts, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def replenishment(self, request: Request) -> Response:
+        """Return the pick lists per location and product to fill the stocks up to the `target` quantity."""
+        serializer: ReplenishmentFilterSerializer = ReplenishmentFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(get_pick_lists(serializer.validated_data["target"], serializer.validated_data.get("location")))
+
+    def adjust_stock(self, request: Request, pk: Any, sign: int) -> Response:
+        """Add the signed quantity of the request to the stock, without reading it first."""
+        serializer: StockAdjustSerializer = StockAdjustSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not str(pk).isdigit():
+            raise NotFound
+        result: dict[str, Any] = adjust_stocks([(int(pk), sign * serializer.validated_data["quantity"])])[0]
+        if result["status"] != ERROR:
+            return Response({key: value for key, value in result.items() if key != "status"})
+        if "id" in result["errors"]:
+            raise NotFound
+        return Response(result["errors"], status=status.HTTP_409_CONFLICT)
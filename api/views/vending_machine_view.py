@@ -1,12 +1,31 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from api.models.stock import Stock
 from api.models.vending_machine import VendingMachine
+from api.serializers.inventory_serializer import InventorySerializer, InventorySummarySerializer
+from api.serializers.nearby_serializer import NearbyFilterSerializer, NearbySerializer
 from api.serializers.vending_machine_serializer import VendingMachineSerializer
+from api.services.inventory_service import (
+    get_inventories,
+    get_inventories_as_of,
+    get_inventory,
+    get_inventory_summaries,
+)
+from api.services.nearby_service import get_nearby_vending_machines
+from api.services.stock_history_service import get_as_of
+from api.views.cache_mixin import CacheMixin
+from api.views.conditional_mixin import ConditionalMixin
+from api.views.fast_list_mixin import FastListMixin
+from api.views.replica_mixin import ReplicaMixin
 
 
-class VendingMachineView(viewsets.ModelViewSet):
+class VendingMachineView(ReplicaMixin, ConditionalMixin, CacheMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Create: Create a new vending machine instance.
 
@@ -17,7 +36,50 @@ class VendingMachineView(viewsets.ModelViewSet):
     Destroy: Delete the existing vending machine.
 
     List: Return a list of all the existing vending machine.
+
+    Inventory: Return the stocked products of the existing vending machine, or of all of them, now or as of a time.
+
+    Inventory Summary: Return the stock totals of all the existing vending machines.
+
+    Nearby: Return the nearest active vending machines to lat and lon, with product in stock if given.
     """
 
     queryset: Any = VendingMachine.objects.all()
     serializer_class = VendingMachineSerializer
+
+    @action(detail=True, methods=["get"], url_path="inventory", url_name="inventory")
+    def inventory(self, request: Request, pk: Any = None) -> Response:
+        """Return the stocked products of the vending machine with their quantity and value, now or `as_of`."""
+        as_of: Optional[datetime] = get_as_of(request)
+        return Response(InventorySerializer(get_inventory(self.get_object(), as_of)).data)
+
+    @action(detail=False, methods=["get"], url_path="inventory", url_name="fleet-inventory")
+    def fleet_inventory(self, request: Request) -> Response:
+        """
+        Return the stocked products of every vending machine with their quantity and value, now or `as_of`.
+
+        Unpaginated, and vending machines without stock are left out, unlike in the inventory summary.
+        """
+        as_of: Optional[datetime] = get_as_of(request)
+        inventories: list[dict[str, Any]] = (
+            get_inventories(Stock.objects.all()) if as_of is None else get_inventories_as_of(as_of)
+        )
+        return Response(InventorySerializer(inventories, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="inventory-summary", url_name="inventory-summary")
+    def inventory_summary(self, request: Request) -> Response:
+        """Return the stock totals of every vending machine."""
+        return Response(InventorySummarySerializer(get_inventory_summaries(), many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def nearby(self, request: Request) -> Response:
+        """Return the `limit` nearest active vending machines with their distance, read from the geohash index."""
+        serializer: NearbyFilterSerializer = NearbyFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        vending_machines: list[dict[str, Any]] = get_nearby_vending_machines(
+            serializer.validated_data["lat"],
+            serializer.validated_data["lon"],
+            serializer.validated_data["limit"],
+            serializer.validated_data.get("product"),
+        )
+        return Response(NearbySerializer(vending_machines, many=True).data)
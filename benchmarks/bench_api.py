@@ -0,0 +1,109 @@
+"""
+Benchmark of every API endpoint with pytest-benchmark.
+
+A fleet is seeded once into a test database, sized by the BENCH_VENDING_MACHINES, BENCH_PRODUCTS,
+BENCH_STOCKS_PER_VENDING_MACHINE and BENCH_STOCK_TIMELINES environment variables. The queries of every request are
+stored in the extra info of the results.
+
+Usage:
+    pytest benchmarks/bench_api.py --benchmark-json=bench.json
+    pytest benchmarks/bench_api.py --benchmark-compare
+"""
+import os
+from typing import Any, Iterator
+
+import django
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from api.services.benchmark_service import get_endpoints, send_request  # noqa: E402
+from api.services.seed_service import seed  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def endpoints() -> Iterator[dict[str, dict[str, Any]]]:
+    """
+    Seed the fleet into a test database.
+
+    Returns:
+        Iterator[dict[str, dict[str, Any]]]: Requests per endpoint name.
+    """
+    setup_test_environment()
+    old_config: Any = setup_databases(verbosity=0, interactive=False)
+    seed(
+        int(os.environ.get("BENCH_VENDING_MACHINES", 100)),
+        int(os.environ.get("BENCH_PRODUCTS", 50)),
+        int(os.environ.get("BENCH_STOCKS_PER_VENDING_MACHINE", 10)),
+        int(os.environ.get("BENCH_STOCK_TIMELINES", 10000)),
+    )
+    yield {endpoint["name"]: endpoint for endpoint in get_endpoints()}
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "vendingmachine-list",
+        "vendingmachine-detail",
+        "vendingmachine-inventory",
+        "vendingmachine-inventory-as-of",
+        "vendingmachine-fleet-inventory",
+        "vendingmachine-inventory-summary",
+        "vendingmachine-nearby",
+        "product-list",
+        "product-detail",
+        "product-availability",
+        "stock-list",
+        "stock-list-as-of",
+        "stock-detail",
+        "stock-bulk",
+        "stock-restock",
+        "stock-vend",
+        "stock-adjust",
+        "stock-low",
+        "stock-forecast",
+        "stock-replenishment",
+        "stockthreshold-list",
+        "stockthreshold-detail",
+        "stocktimeline-list",
+        "stocktimeline-list-vending-machine",
+        "stocktimeline-detail",
+        "stocktimeline-export",
+        "stocktimeline-series",
+        "stocktimeline-consumption",
+        "cache-stats",
+        "metrics",
+        "async-stock-list",
+        "async-stocktimeline-list",
+        "async-vendingmachine-inventory",
+        "async-vendingmachine-fleet-inventory",
+    ],
+)
+def test_endpoint(benchmark: Any, endpoints: dict[str, dict[str, Any]], name: str) -> None:
+    """
+    Benchmark the endpoint of the given name.
+
+    Params:
+        benchmark (Any): Fixture of pytest-benchmark
+        endpoints (dict[str, dict[str, Any]]): Requests per endpoint name
+        name (str): Name of the endpoint
+    """
+    client: Client = Client()
+    with CaptureQueriesContext(connection) as context:
+        send_request(client, endpoints[name])
+    benchmark.extra_info["queries"] = len(context.captured_queries)
+    benchmark(send_request, client, endpoints[name])
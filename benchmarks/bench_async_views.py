@@ -0,0 +1,202 @@
+"""
+Benchmark of the asynchronous read views under ASGI against the API views under WSGI, at a given concurrency.
+
+Both handlers run in this process on a seeded test database, a file on SQLite. The WSGI handler serves the clients
+from a pool of `--threads` threads, like a threaded WSGI worker, and the ASGI handler from a single event loop, like
+an ASGI worker. Reports requests per second and latency percentiles in milliseconds.
+
+Usage:
+    python -m benchmarks.bench_async_views --concurrency 100 --requests 2000
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+
+from api.models.vending_machine import VendingMachine  # noqa: E402
+from api.services.benchmark_service import summarize  # noqa: E402
+from api.services.seed_service import seed  # noqa: E402
+
+
+def call_wsgi(application: Callable, path: str) -> float:
+    """
+    Send a GET request to the given WSGI application.
+
+    Params:
+        application (Callable): WSGI application
+        path (str): Path and query string of the request
+    Returns:
+        float: Latency in milliseconds.
+    """
+    path_info, _, query_string = path.partition("?")
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path_info,
+        "QUERY_STRING": query_string,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "localhost",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    statuses: list[str] = []
+    start: float = time.perf_counter()
+    result: Any = application(environ, lambda status, headers: statuses.append(status))
+    b"".join(result)
+    result.close()
+    assert statuses[0].startswith("200"), statuses[0]
+    return (time.perf_counter() - start) * 1000
+
+
+async def call_asgi(application: Callable, path: str) -> float:
+    """
+    Send a GET request to the given ASGI application.
+
+    Params:
+        application (Callable): ASGI application
+        path (str): Path and query string of the request
+    Returns:
+        float: Latency in milliseconds.
+    """
+    path_info, _, query_string = path.partition("?")
+    scope: dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path_info,
+        "raw_path": path_info.encode(),
+        "query_string": query_string.encode(),
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    messages: list[dict[str, Any]] = []
+    requests: list[dict[str, Any]] = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> dict[str, Any]:
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    start: float = time.perf_counter()
+    await application(scope, receive, send)
+    assert messages[0]["status"] == 200, messages[0]["status"]
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_wsgi(path: str, requests: int, concurrency: int, threads: int) -> tuple[float, list[float]]:
+    """
+    Send the given requests to the WSGI handler, `concurrency` at a time, served by a pool of threads.
+
+    Params:
+        path (str): Path and query string of the requests
+        requests (int): Number of requests
+        concurrency (int): Number of requests in flight
+        threads (int): Number of threads of the worker
+    Returns:
+        tuple[float, list[float]]: Requests per second, and the latency of every request including its wait.
+    """
+    application: Callable = get_wsgi_application()
+    latencies: list[float] = []
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start: float = time.perf_counter()
+        for offset in range(0, requests, concurrency):
+            sent: float = time.perf_counter()
+            futures: list[Any] = [
+                executor.submit(call_wsgi, application, path) for _ in range(min(concurrency, requests - offset))
+            ]
+            for future in futures:
+                future.result()
+                latencies.append((time.perf_counter() - sent) * 1000)
+        elapsed: float = time.perf_counter() - start
+    return requests / elapsed, latencies
+
+
+def bench_asgi(path: str, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    """
+    Send the given requests to the ASGI handler, `concurrency` at a time, served by one event loop.
+
+    Params:
+        path (str): Path and query string of the requests
+        requests (int): Number of requests
+        concurrency (int): Number of requests in flight
+    Returns:
+        tuple[float, list[float]]: Requests per second, and the latency of every request.
+    """
+    application: Callable = get_asgi_application()
+
+    async def run() -> list[float]:
+        latencies: list[float] = []
+        for offset in range(0, requests, concurrency):
+            latencies += await asyncio.gather(
+                *(call_asgi(application, path) for _ in range(min(concurrency, requests - offset)))
+            )
+        return latencies
+
+    start: float = time.perf_counter()
+    latencies: list[float] = asyncio.run(run())
+    return requests / (time.perf_counter() - start), latencies
+
+
+def main() -> None:
+    """Print the throughput and latencies of both handlers for every read endpoint."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--vending-machines", type=int, default=100, dest="vending_machines")
+    args: argparse.Namespace = parser.parse_args()
+
+    if connection.vendor == "sqlite" and not connection.settings_dict["TEST"]["NAME"]:
+        # A shared in-memory database fails instead of waiting when another thread holds a lock.
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    old_config: Any = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed(args.vending_machines, 50, 10, args.vending_machines * 100)
+        vending_machine_id: int = VendingMachine.objects.order_by("id").values_list("id", flat=True).first()
+        paths: list[str] = [
+            f"/vending-machine/{vending_machine_id}/inventory/",
+            "/vending-machine/inventory/",
+            "/stock/",
+            f"/stock-timeline/?vending_machine={vending_machine_id}",
+        ]
+        print(f"{'endpoint':<44}{'handler':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for path in paths:
+            for handler, (throughput, latencies) in (
+                ("wsgi", bench_wsgi(path, args.requests, args.concurrency, args.threads)),
+                ("asgi", bench_asgi(f"/async{path}", args.requests, args.concurrency)),
+            ):
+                summary: dict[str, float] = summarize(latencies)
+                print(f"{path:<44}{handler:>8}{throughput:>10,.0f}{summary['p50']:>10.2f}{summary['p95']:>10.2f}")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of request latency with a new database connection per request against persistent connections.
+
+Requests go through the WSGI handler in this process, which closes or keeps the connection at the end of every request
+like a WSGI worker, on a seeded test database, a file on SQLite. Reports latency percentiles in milliseconds and the
+number of connections opened.
+
+Usage:
+    python -m benchmarks.bench_connections --requests 2000
+"""
+import argparse
+import os
+import tempfile
+from typing import Any, Callable, Optional
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+
+from api.models.vending_machine import VendingMachine  # noqa: E402
+from api.services.benchmark_service import summarize  # noqa: E402
+from api.services.seed_service import seed  # noqa: E402
+from benchmarks.bench_async_views import call_wsgi  # noqa: E402
+
+MODES: dict[str, tuple[Optional[int], bool]] = {
+    "per-request": (0, False),
+    "persistent": (60, False),
+    "persistent+checks": (60, True),
+}
+
+
+def bench(application: Callable, path: str, requests: int, conn_max_age: Optional[int], health_checks: bool) -> Any:
+    """
+    Send the given requests one at a time with the given connection settings.
+
+    Params:
+        application (Callable): WSGI application
+        path (str): Path and query string of the requests
+        requests (int): Number of requests
+        conn_max_age (Optional[int]): Lifetime of connections in seconds
+        health_checks (bool): Whether connections are checked before being reused
+    Returns:
+        Any: Latency of every request, and number of connections opened.
+    """
+    connection.close()
+    connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+    connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+    opened: list[Any] = []
+
+    def count(**kwargs: Any) -> None:
+        opened.append(kwargs["connection"])
+
+    connection_created.connect(count)
+    try:
+        latencies: list[float] = [call_wsgi(application, path) for _ in range(requests)]
+    finally:
+        connection_created.disconnect(count)
+    return latencies, len(opened)
+
+
+def main() -> None:
+    """Print the latencies of every connection mode for a few read endpoints."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--vending-machines", type=int, default=100, dest="vending_machines")
+    args: argparse.Namespace = parser.parse_args()
+
+    if connection.vendor == "sqlite" and not connection.settings_dict["TEST"]["NAME"]:
+        # An in-memory database would be lost with its connection.
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    old_config: Any = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed(args.vending_machines, 50, 10, args.vending_machines * 10)
+        vending_machine_id: int = VendingMachine.objects.order_by("id").values_list("id", flat=True).first()
+        application: Callable = get_wsgi_application()
+        print(f"{connection.vendor}, {args.requests} requests per run")
+        print(f"{'endpoint':<36}{'connections':>20}{'opened':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for path in (f"/vending-machine/{vending_machine_id}/", f"/vending-machine/{vending_machine_id}/inventory/"):
+            for mode, (conn_max_age, health_checks) in MODES.items():
+                latencies, opened = bench(application, path, args.requests, conn_max_age, health_checks)
+                summary: dict[str, float] = summarize(latencies)
+                print(
+                    f"{path:<36}{mode:>20}{opened:>8}"
+                    f"{summary['mean']:>10.3f}{summary['p50']:>10.3f}{summary['p95']:>10.3f}"
+                )
+    finally:
+        connection.close()
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
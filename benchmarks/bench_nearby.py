@@ -0,0 +1,123 @@
+"""
+Benchmark of the nearest vending machines of a large fleet.
+
+Seeds the fleet in a test database and places the vending machines at random in a box, then reports the latency of
+nearest vending machine searches through the geohash index and through a scan of the whole fleet, with and without
+a product in stock.
+
+Usage:
+    python -m benchmarks.bench_nearby --vending-machines 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from typing import Any, Optional
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from api.models.product import Product  # noqa: E402
+from api.models.vending_machine import VendingMachine  # noqa: E402
+from api.services import nearby_service  # noqa: E402
+from api.services.geohash_service import encode  # noqa: E402
+from api.services.seed_service import seed  # noqa: E402
+
+BOX: tuple[float, float, float, float] = (36.0, 60.0, -10.0, 30.0)
+
+
+def place_vending_machines(generator: random.Random, batch_size: int = 10000) -> None:
+    """
+    Place every vending machine at random coordinates in the box, with their geohash.
+
+    Params:
+        generator (random.Random): Generator of the coordinates
+        batch_size (int): Number of rows per update
+    """
+    table: str = connection.ops.quote_name(VendingMachine._meta.db_table)
+    ids: list[int] = list(VendingMachine.objects.order_by("id").values_list("id", flat=True))
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(ids), batch_size):
+            rows: list[tuple[float, float, str, int]] = []
+            for vending_machine_id in ids[start : start + batch_size]:
+                latitude: float = generator.uniform(BOX[0], BOX[1])
+                longitude: float = generator.uniform(BOX[2], BOX[3])
+                rows.append((latitude, longitude, encode(latitude, longitude), vending_machine_id))
+            cursor.executemany(f"UPDATE {table} SET latitude = %s, longitude = %s, geohash = %s WHERE id = %s", rows)
+
+
+def measure(points: list[tuple[float, float]], limit: int, product_id: Optional[int], precision: int) -> list[float]:
+    """
+    Search the nearest vending machines of every given point, starting from geohash cells of the given precision.
+
+    Params:
+        points (list[tuple[float, float]]): Latitude and longitude of every search
+        limit (int): Number of vending machines per search
+        product_id (Optional[int]): Id of a product the vending machines must have in stock, or None
+        precision (int): Number of characters of the first geohash cells, 0 to scan the whole fleet
+    Returns:
+        list[float]: Latencies in milliseconds.
+    """
+    nearby_service.NEARBY_PRECISION, default = precision, nearby_service.NEARBY_PRECISION
+    latencies: list[float] = []
+    try:
+        for latitude, longitude in points:
+            start: float = time.perf_counter()
+            nearby_service.get_nearby_vending_machines(latitude, longitude, limit, product_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        nearby_service.NEARBY_PRECISION = default
+    return latencies
+
+
+def main() -> None:
+    """Print the p50 and p95 latency of the nearest vending machine searches, indexed and scanned."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vending-machines", type=int, default=100000, dest="vending_machines")
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--stocks-per-vending-machine", type=int, default=5, dest="stocks_per_vending_machine")
+    parser.add_argument("--searches", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    args: argparse.Namespace = parser.parse_args()
+
+    setup_test_environment()
+    old_config: Any = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed(
+            vending_machines=args.vending_machines,
+            products=args.products,
+            stocks_per_vending_machine=args.stocks_per_vending_machine,
+            stock_timelines=0,
+        )
+        generator: random.Random = random.Random(0)
+        place_vending_machines(generator)
+        points: list[tuple[float, float]] = [
+            (generator.uniform(BOX[0], BOX[1]), generator.uniform(BOX[2], BOX[3])) for _ in range(args.searches)
+        ]
+        product_id: int = Product.objects.order_by("id").values_list("id", flat=True).first()
+        print(f"{'search':<10}{'product':<9}{'p50 ms':>10}{'p95 ms':>10}")
+        for product in (None, product_id):
+            for name, precision in (("geohash", nearby_service.NEARBY_PRECISION), ("scan", 0)):
+                latencies: list[float] = measure(points, args.limit, product, precision)
+                print(
+                    f"{name:<10}{'yes' if product else 'no':<9}{statistics.median(latencies):>10.2f}"
+                    f"{statistics.quantiles(latencies, n=20)[-1]:>10.2f}"
+                )
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the pick lists of a large fleet.
+
+Seeds the fleet in a test database, then reports the time taken to plan the pick lists of every location at once and
+of one location, with the number of stocks to restock.
+
+Usage:
+    python -m benchmarks.bench_replenishment --vending-machines 50000
+"""
+import argparse
+import os
+import time
+from typing import Any, Optional
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from api.services.replenishment_service import get_pick_lists  # noqa: E402
+from api.services.seed_service import seed  # noqa: E402
+
+
+def measure(target: int, location: Optional[str] = None) -> tuple[float, int, int]:
+    """
+    Plan the pick lists of the given location.
+
+    Params:
+        target (int): Quantity every stock is filled up to
+        location (Optional[str]): Location of the only pick list, all of them by default
+    Returns:
+        tuple[float, int, int]: Time taken in milliseconds, number of pick lists and of stocks to restock.
+    """
+    start: float = time.perf_counter()
+    pick_lists: list[dict[str, Any]] = get_pick_lists(target, location)
+    latency: float = (time.perf_counter() - start) * 1000
+    lines: int = sum(len(product["vending_machines"]) for pick_list in pick_lists for product in pick_list["products"])
+    return latency, len(pick_lists), lines
+
+
+def main() -> None:
+    """Print the time taken to plan the pick lists of the whole fleet and of one location."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vending-machines", type=int, default=50000, dest="vending_machines")
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--stocks-per-vending-machine", type=int, default=10, dest="stocks_per_vending_machine")
+    parser.add_argument("--target", type=int, default=50)
+    args: argparse.Namespace = parser.parse_args()
+
+    setup_test_environment()
+    old_config: Any = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed(
+            vending_machines=args.vending_machines,
+            products=args.products,
+            stocks_per_vending_machine=args.stocks_per_vending_machine,
+            stock_timelines=0,
+        )
+        print(f"{'scope':<10}{'ms':>10}{'locations':>11}{'stocks':>10}")
+        for scope, location in (("fleet", None), ("location", "seed location 0")):
+            latency, locations, lines = measure(args.target, location)
+            print(f"{scope:<10}{latency:>10.1f}{locations:>11,}{lines:>10,}")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of the list serializers, in rows per second.
+
+Compares the model serializers rendered by the JSON renderer with the read serializers rendered by the orjson renderer.
+No database is needed: rows are built in memory, so only serialization and rendering are measured.
+
+Usage:
+    python -m benchmarks.bench_serializers --rows 10000
+"""
+import argparse
+import os
+import time
+from decimal import Decimal
+from typing import Any, Callable
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.models.product import Product  # noqa: E402
+from api.models.stock import Stock  # noqa: E402
+from api.models.stock_timeline import StockTimeline  # noqa: E402
+from api.models.vending_machine import VendingMachine  # noqa: E402
+from api.renderers.orjson_renderer import ORJSONRenderer  # noqa: E402
+from api.serializers.product_serializer import ProductSerializer  # noqa: E402
+from api.serializers.read_serializer import get_read_serializer  # noqa: E402
+from api.serializers.stock_serializer import StockSerializer  # noqa: E402
+from api.serializers.stock_timeline_serializer import StockTimelineSerializer  # noqa: E402
+from api.serializers.vending_machine_serializer import VendingMachineSerializer  # noqa: E402
+
+
+def build_rows(count: int) -> dict[Any, tuple[list[Any], list[dict[str, Any]]]]:
+    """
+    Build the instances and the `.values()` rows of every model.
+
+    Params:
+        count (int): Number of rows per model
+    Returns:
+        dict[Any, tuple[list[Any], list[dict[str, Any]]]]: Instances and rows per model serializer.
+    """
+    now: Any = timezone.now()
+    values: dict[Any, list[dict[str, Any]]] = {
+        VendingMachineSerializer: [
+            {
+                "id": i,
+                "name": f"machine {i}",
+                "location": f"floor {i % 10}",
+                "is_active": i % 2 == 0,
+                "latitude": 48 + i % 1000 / 1000 if i % 4 else None,
+                "longitude": 2 + i % 1000 / 1000 if i % 4 else None,
+            }
+            for i in range(count)
+        ],
+        ProductSerializer: [{"id": i, "name": f"product {i}", "cost": Decimal(i % 1000) / 100} for i in range(count)],
+        StockSerializer: [
+            {"id": i, "vending_machine": i % 100, "product": i, "quantity": i % 50} for i in range(count)
+        ],
+        StockTimelineSerializer: [
+            {"id": i, "vending_machine": i % 100, "product": i, "quantity": i % 50, "timestamp": now}
+            for i in range(count)
+        ],
+    }
+    instances: dict[Any, list[Any]] = {
+        VendingMachineSerializer: [VendingMachine(**row) for row in values[VendingMachineSerializer]],
+        ProductSerializer: [Product(**row) for row in values[ProductSerializer]],
+        StockSerializer: [
+            Stock(id=row["id"], vending_machine_id=row["vending_machine"], product_id=row["product"], quantity=1)
+            for row in values[StockSerializer]
+        ],
+        StockTimelineSerializer: [
+            StockTimeline(
+                id=row["id"],
+                vending_machine_id=row["vending_machine"],
+                product_id=row["product"],
+                quantity=row["quantity"],
+                timestamp=row["timestamp"],
+            )
+            for row in values[StockTimelineSerializer]
+        ],
+    }
+    return {serializer_class: (instances[serializer_class], values[serializer_class]) for serializer_class in values}
+
+
+def measure(function: Callable[[], bytes], count: int, repeat: int) -> float:
+    """
+    Return the best throughput of the given function.
+
+    Params:
+        function (Callable[[], bytes]): Function serializing and rendering the rows
+        count (int): Number of rows per call
+        repeat (int): Number of calls
+    Returns:
+        float: Rows per second.
+    """
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    """Print the rows per second of every list serializer before and after."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args: argparse.Namespace = parser.parse_args()
+
+    print(f"{'serializer':<28}{'before rows/s':>16}{'after rows/s':>16}{'speedup':>10}")
+    for serializer_class, (instances, rows) in build_rows(args.rows).items():
+        before: float = measure(
+            lambda: JSONRenderer().render(serializer_class(instances, many=True).data), args.rows, args.repeat
+        )
+        after: float = measure(
+            lambda: ORJSONRenderer().render(get_read_serializer(serializer_class).serialize(rows)),
+            args.rows,
+            args.repeat,
+        )
+        print(f"{serializer_class.__name__:<28}{before:>16,.0f}{after:>16,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
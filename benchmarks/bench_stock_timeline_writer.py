@@ -0,0 +1,106 @@
+"""
+Benchmark of stock saves with the synchronous and the asynchronous stock timeline writers.
+
+Saves existing stocks one by one in a test database, a file on SQLite, and reports the mean save latency. Then writes
+a stock timeline per stock, and reports the stock timelines written per second, including the final flush.
+
+Usage:
+    python -m benchmarks.bench_stock_timeline_writer --saves 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vending_machine_tracking_application.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from api.models.stock import Stock  # noqa: E402
+from api.models.stock_timeline import StockTimeline  # noqa: E402
+from api.services.seed_service import seed  # noqa: E402
+from api.services.stock_timeline_writer import (  # noqa: E402
+    ASYNC,
+    SYNC,
+    stock_timeline_writer,
+    write_stock_timeline,
+)
+
+
+def measure_saves(stocks: list[Stock], mode: str) -> float:
+    """
+    Save every given stock with the given writer.
+
+    Params:
+        stocks (list[Stock]): Stocks to be saved
+        mode (str): Stock timeline writer
+    Returns:
+        float: Mean save latency in milliseconds, without the final flush.
+    """
+    with override_settings(STOCK_TIMELINE_WRITER=mode):
+        start: float = time.perf_counter()
+        for stock in stocks:
+            stock.quantity += 1
+            stock.save()
+        latency: float = (time.perf_counter() - start) * 1000 / len(stocks)
+        stock_timeline_writer.close()
+    return latency
+
+
+def measure_writes(stocks: list[Stock], mode: str) -> float:
+    """
+    Write the stock timeline of every given stock with the given writer.
+
+    Params:
+        stocks (list[Stock]): Stocks whose stock timeline is written
+        mode (str): Stock timeline writer
+    Returns:
+        float: Stock timelines written per second, including the final flush.
+    """
+    count: int = StockTimeline.objects.count()
+    with override_settings(STOCK_TIMELINE_WRITER=mode):
+        start: float = time.perf_counter()
+        for stock in stocks:
+            write_stock_timeline(stock.vending_machine_id, stock.product_id, stock.quantity)
+        stock_timeline_writer.close()
+        throughput: float = len(stocks) / (time.perf_counter() - start)
+    assert StockTimeline.objects.count() == count + len(stocks)
+    return throughput
+
+
+def main() -> None:
+    """Print the save latency and stock timeline throughput of both writers."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--saves", type=int, default=5000)
+    args: argparse.Namespace = parser.parse_args()
+
+    if connection.vendor == "sqlite" and not connection.settings_dict["TEST"]["NAME"]:
+        # A shared in-memory database fails instead of waiting when the writer thread holds a lock.
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    setup_test_environment()
+    old_config: Any = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed(vending_machines=args.saves // 10 + 1, products=10, stocks_per_vending_machine=10, stock_timelines=0)
+        stocks: list[Stock] = list(Stock.objects.order_by("id")[: args.saves])
+        print(f"{'writer':<8}{'save ms':>10}{'timelines/s':>14}")
+        for mode in (SYNC, ASYNC):
+            latency: float = measure_saves(stocks, mode)
+            print(f"{mode:<8}{latency:>10.3f}{measure_writes(stocks, mode):>14,.0f}")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/4.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,6 +40,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.metrics_middleware.MetricsMiddleware",
+    "api.middleware.replica_middleware.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -70,17 +73,108 @@ WSGI_APPLICATION = "vending_machine_tracking_application.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
+# Connections are kept open for DATABASE_CONN_MAX_AGE seconds (0 closes them after every request, "none" never does)
+# and checked before being reused. Set DATABASE_POOL=pgbouncer when connecting through PgBouncer in transaction pooling
+# mode, which cannot hold server-side cursors between transactions. Set DATABASE_REPLICA_HOSTS to a comma-separated
+# list of hosts, with the same name and credentials, to read the list and retrieve actions, and the models of
+# DATABASE_REPLICA_MODELS, from replicas lagging at most DATABASE_REPLICA_MAX_LAG seconds. After a write, reads go to
+# default for the rest of the request, and for DATABASE_REPLICA_STICKY_SECONDS for the same client.
+
+DATABASE_CONN_MAX_AGE = os.environ.get("DATABASE_CONN_MAX_AGE", "60")
+DATABASE_POOL = os.environ.get("DATABASE_POOL", "")
+DATABASE_REPLICA_HOSTS = [host for host in os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",") if host]
+DATABASE_REPLICA_MODELS = [
+    label for label in os.environ.get("DATABASE_REPLICA_MODELS", "api.StockTimeline").split(",") if label
+]
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get("DATABASE_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", "10"))
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = 1.0
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
-        "NAME": "mydatabase",
-        "USER": "mydatabaseuser",
-        "PASSWORD": "mypassword",
-        "HOST": "127.0.0.1",
-        "PORT": "5432",
+        "NAME": os.environ.get("DATABASE_NAME", "mydatabase"),
+        "USER": os.environ.get("DATABASE_USER", "mydatabaseuser"),
+        "PASSWORD": os.environ.get("DATABASE_PASSWORD", "mypassword"),
+        "HOST": os.environ.get("DATABASE_HOST", "127.0.0.1"),
+        "PORT": os.environ.get("DATABASE_PORT", "5432"),
+        "CONN_MAX_AGE": None if DATABASE_CONN_MAX_AGE.lower() == "none" else int(DATABASE_CONN_MAX_AGE),
+        "CONN_HEALTH_CHECKS": os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "true").lower() == "true",
+        "DISABLE_SERVER_SIDE_CURSORS": DATABASE_POOL == "pgbouncer",
     }
 }
+DATABASE_REPLICAS = [f"replica_{index}" for index in range(len(DATABASE_REPLICA_HOSTS))]
+for alias, host in zip(DATABASE_REPLICAS, DATABASE_REPLICA_HOSTS):
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+
+DATABASE_ROUTERS = ["api.routers.replica_router.ReplicaRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Set REDIS_URL (e.g. redis://127.0.0.1:6379/0) to share the cache between workers, which needs the redis package.
+
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": os.environ["REDIS_URL"]}
+        if os.environ.get("REDIS_URL")
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+# Cache of product and vending machine responses and lookups, invalidated when every write commits. Only enabled with
+# a cache shared between workers, since the others would keep serving what a worker invalidated.
+
+API_CACHE_ENABLED = os.environ.get("API_CACHE_ENABLED", str(bool(os.environ.get("REDIS_URL")))).lower() == "true"
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = 300
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.orjson_renderer.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# List endpoints serialize `.values()` rows through read serializers instead of their model serializers.
+
+API_FAST_LIST_ENABLED = True
+
+# Metrics
+# Record the queries and timings of a sample of requests for /metrics, and return them in a header when debugging.
+
+API_METRICS_ENABLED = True
+API_METRICS_SAMPLE_RATE = float(os.environ.get("API_METRICS_SAMPLE_RATE", 1))
+API_METRICS_HEADER_ENABLED = DEBUG
+
+# Stock timeline writer
+# "sync" saves the stock timeline of every stock save with it, "async" queues it and writes the queue in batches.
+# Past STOCK_TIMELINE_QUEUE_SIZE queued stock timelines, stock saves write their stock timeline themselves.
+# Stock timeline ids may commit out of order. The stock feed and the refreshes of rollups and consumptions read those
+# of the last STOCK_TIMELINE_COMMIT_GRACE seconds again, and stock checkpoints are taken that long ago, which must
+# exceed the longest stock write transaction and the async writer flush interval.
+
+STOCK_TIMELINE_WRITER = os.environ.get("STOCK_TIMELINE_WRITER", "sync")
+STOCK_TIMELINE_BATCH_SIZE = 500
+STOCK_TIMELINE_FLUSH_INTERVAL = 1.0
+STOCK_TIMELINE_QUEUE_SIZE = 10000
+STOCK_TIMELINE_COMMIT_GRACE = 30.0
+
+# Stock timeline compaction
+# compact_timeline archives the stock timelines it deletes as gzip NDJSON files in STOCK_TIMELINE_ARCHIVE_DIR.
+
+STOCK_TIMELINE_ARCHIVE_DIR = os.environ.get("STOCK_TIMELINE_ARCHIVE_DIR", str(BASE_DIR / "archive"))
+
+# Stock feed
+# The local backend only pushes the stock changes of its own process. With several workers on PostgreSQL, set
+# STOCK_FEED_BACKEND to "api.services.stock_feed_service.PostgresStockFeedBackend" to share them with LISTEN/NOTIFY.
+
+STOCK_FEED_BACKEND = os.environ.get("STOCK_FEED_BACKEND", "api.services.stock_feed_service.LocalStockFeedBackend")
+STOCK_FEED_HEARTBEAT = 15.0
+STOCK_FEED_TIMEOUT = 300.0
+STOCK_FEED_QUEUE_SIZE = 1000
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -120,3 +214,16 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Inventory
+# Keep the denormalized inventory summary of each vending machine up to date on stock and product writes.
+
+INVENTORY_SUMMARY_ENABLED = False
+
+# Product availability
+# Answer /product/<id>/availability/ from in-memory bitmaps of this process, updated from the stock feed and reloaded
+# from the database every PRODUCT_AVAILABILITY_BITMAP_TIMEOUT seconds, which bounds how long vending machine writes and
+# stock deletes, not in the stock feed, take to show.
+
+PRODUCT_AVAILABILITY_BITMAP_ENABLED = False
+PRODUCT_AVAILABILITY_BITMAP_TIMEOUT = 60.0